@@ -79,6 +79,11 @@ def create_app():
     app.register_blueprint(jsharp_bp, url_prefix='/api')
     app.register_blueprint(public_service_report_bp, url_prefix='/api/public/service-reports')
 
+    # 네트워크 공유 업로드 스풀: 재시작 전에 남은 대기 항목부터 업로드
+    if os.getenv('UPLOAD_SPOOL_WORKER', '1') != '0':
+        from app.utils.upload_spool import start_uploader
+        start_uploader()
+
     # JWT 에러 핸들러 추가
     from flask_jwt_extended.exceptions import JWTExtendedException
     
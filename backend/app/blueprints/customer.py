@@ -1,31 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from app.utils.auth import permission_required
 from app.models.customer import Customer
 from app.models.resource import Resource
-import pandas as pd
+from app.utils.etag import conditional_get
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils import business_card_thumbnails
 import os
 import re
 import base64
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from PIL import Image
-
-# OCR 라이브러리 - Tesseract 또는 easyocr 사용
-OCR_METHOD = 'easyocr'  # 'tesseract' 또는 'easyocr'
-
-if OCR_METHOD == 'tesseract':
-    import pytesseract
-elif OCR_METHOD == 'easyocr':
-    try:
-        import easyocr
-        # EasyOCR reader 초기화 (한글, 영어)
-        reader = easyocr.Reader(['ko', 'en'], gpu=False)
-    except ImportError:
-        OCR_METHOD = 'manual'
-        reader = None
 
 customer_bp = Blueprint('customer', __name__)
 
+# 고객 디렉토리 키셋 페이지 크기
+DIRECTORY_PAGE_SIZE = 50
+PICKER_PAGE_SIZE = 20
+DIRECTORY_MAX_PAGE_SIZE = 500
+
 # 명함 이미지 저장 디렉토리
 BUSINESS_CARD_UPLOAD_FOLDER = os.path.join('static', 'business_cards')
 os.makedirs(BUSINESS_CARD_UPLOAD_FOLDER, exist_ok=True)
@@ -33,42 +25,90 @@ os.makedirs(BUSINESS_CARD_UPLOAD_FOLDER, exist_ok=True)
 @customer_bp.route('/', methods=['GET'])
 # @permission_required('customer')  # 임시로 주석 처리
 def get_customers():
-    """고객정보 목록 조회"""
+    """
+    고객정보 목록 조회
+    - cursor/limit: 회사명순 키셋 페이지 (다음 페이지는 응답의 next_cursor 전달)
+    - page/per_page: 기존 OFFSET 방식, per_page가 없으면 전체 (하위 호환)
+    - keyword: 현재/과거 상호, 담당자, 이메일, 전화, 주소 검색 (customers_fts)
+    """
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', None, type=int)  # None으로 변경하여 제한 없음을 기본값으로
         keyword = request.args.get('keyword')
         include_resources = request.args.get('include_resources', 'false').lower() == 'true'
-        
-        if keyword:
+        cursor = request.args.get('cursor', '').strip()
+        limit = request.args.get('limit', None, type=int)
+
+        next_cursor = None
+        if cursor or limit:
+            after = None
+            if cursor:
+                after = decode_cursor(cursor, 2)
+                if after is None:
+                    return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+            per_page = min(max(limit or DIRECTORY_PAGE_SIZE, 1), DIRECTORY_MAX_PAGE_SIZE)
+            customers, next_after = Customer.get_directory_page(keyword=keyword, after=after, limit=per_page)
+            total = Customer.count_directory(keyword)
+            if next_after:
+                next_cursor = encode_cursor(*next_after)
+        elif keyword:
             customers, total = Customer.search(keyword=keyword, page=page, per_page=per_page)
         else:
             customers, total = Customer.get_all(page=page, per_page=per_page)
         
-        # 리소스 정보 포함 요청시 추가
+        # 리소스 정보 포함 요청시 추가 (전체 고객의 리소스/관리 이력을 한 번에 조회)
+        resources_by_customer = {}
+        if include_resources:
+            resources_by_customer = Resource.get_by_customer_ids(
+                [customer.id for customer in customers],
+                history_limit=request.args.get('history_limit', None, type=int)
+            )
         customer_list = []
         for customer in customers:
-            try:
-                customer_dict = customer.to_dict()
-                if include_resources:
-                    resources = Resource.get_by_customer_id(customer.id)
-                    customer_dict['resources'] = [resource.to_dict() for resource in resources]
-                customer_list.append(customer_dict)
-            except Exception as e:
-                raise e
+            customer_dict = customer.to_dict()
+            if include_resources:
+                customer_dict['resources'] = [resource.to_dict() for resource in resources_by_customer[customer.id]]
+            customer_list.append(customer_dict)
         
         return jsonify({
             'customers': customer_list,
             'total': total,
             'page': page,
             'per_page': per_page,
-            'total_pages': 1 if per_page is None else (total + per_page - 1) // per_page
+            'total_pages': 1 if per_page is None else (total + per_page - 1) // per_page,
+            'next_cursor': next_cursor
         }), 200
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({'error': f'고객정보 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@customer_bp.route('/picker', methods=['GET'])
+@conditional_get('customers')
+def get_customer_picker():
+    """
+    고객 선택(자동완성)용 간단 목록 - id, company_name, address, past_company_names만 반환
+    - q: 검색어 (get_customers의 keyword와 같은 조건), cursor/limit: 키셋 페이지
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        cursor = request.args.get('cursor', '').strip()
+        limit = min(max(request.args.get('limit', PICKER_PAGE_SIZE, type=int), 1), DIRECTORY_MAX_PAGE_SIZE)
+
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, 2)
+            if after is None:
+                return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+
+        items, next_after = Customer.get_directory_page(keyword=query, after=after, limit=limit, picker=True)
+        return jsonify({
+            'customers': items,
+            'next_cursor': encode_cursor(*next_after) if next_after else None
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'고객 검색 중 오류가 발생했습니다: {str(e)}'}), 500
+
 @customer_bp.route('/search', methods=['GET'])
 def search_customers():
     """고객사명 검색 - 부품 출고 시 사용처 검색용"""
@@ -259,36 +299,59 @@ def extract_business_card():
         if file_ext not in allowed_extensions:
             return jsonify({'error': '이미지 파일만 업로드 가능합니다.'}), 400
 
+        # 같은 명함 재업로드: 캐시된 OCR/파싱 결과를 바로 반환
+        from app.models.business_card_ocr_cache import BusinessCardOcrCache
+        image_bytes = file.read()
+        content_hash = BusinessCardOcrCache.content_hash(image_bytes)
+        cached = BusinessCardOcrCache.get(content_hash)
+        if cached and cached['image_path'] and os.path.exists(cached['image_path']):
+            text = cached['raw_text']
+            if cached['parser_version'] == BUSINESS_CARD_PARSER_VERSION:
+                extracted_data = cached['parsed_data']
+            else:
+                extracted_data = parse_business_card_text(text)
+                BusinessCardOcrCache.save(content_hash, text, extracted_data,
+                                          BUSINESS_CARD_PARSER_VERSION, cached['image_path'])
+            extracted_data['business_card_image'] = cached['image_path'].replace('\\', '/')
+            business_card_thumbnails.schedule(cached['image_path'])  # 썸네일이 없거나 오래된 경우만 다시 생성됨
+            return jsonify({
+                'success': True,
+                'data': extracted_data,
+                'raw_text': text,  # 디버깅용
+                'cached': True
+            }), 200
+
         # 파일 저장
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         unique_filename = f"{timestamp}_{filename}"
         filepath = os.path.join(BUSINESS_CARD_UPLOAD_FOLDER, unique_filename)
-        file.save(filepath)
+        with open(filepath, 'wb') as f:
+            f.write(image_bytes)
 
         try:
-            # OCR 수행
-            if OCR_METHOD == 'tesseract':
-                image = Image.open(filepath)
-                custom_config = r'--oem 3 --psm 6'
-                text = pytesseract.image_to_string(image, lang='kor+eng', config=custom_config)
-            elif OCR_METHOD == 'easyocr':
-                # EasyOCR 사용
-                result = reader.readtext(filepath)
-                # 결과를 텍스트로 변환
-                text = '\n'.join([detection[1] for detection in result])
-            else:
-                # OCR 라이브러리가 없는 경우
-                return jsonify({
-                    'error': 'OCR 라이브러리가 설치되지 않았습니다. easyocr 또는 tesseract를 설치해주세요.'
-                }), 500
+            # OCR 수행 (공유 OCR 워커 프로세스, 처음 호출 시 시작, 축소/보정 후 인식)
+            from app.utils.ocr_worker import OcrTimeoutError, OcrUnavailableError, extract_text
+            try:
+                text = extract_text(filepath)
+            except OcrUnavailableError as e:
+                os.remove(filepath)
+                return jsonify({'error': str(e)}), 500
+            except OcrTimeoutError as e:
+                os.remove(filepath)
+                return jsonify({'error': str(e)}), 504
 
             # 텍스트에서 정보 추출
             extracted_data = parse_business_card_text(text)
+            BusinessCardOcrCache.save(content_hash, text, extracted_data,
+                                      BUSINESS_CARD_PARSER_VERSION, filepath)
 
             # 이미지 경로 추가
             extracted_data['business_card_image'] = filepath.replace('\\', '/')
 
+            # 목록/상세 화면용 썸네일은 응답 후 백그라운드에서 생성
+            business_card_thumbnails.schedule(filepath)
+
             return jsonify({
                 'success': True,
                 'data': extracted_data,
@@ -307,6 +370,46 @@ def extract_business_card():
         return jsonify({'error': f'명함 정보 추출 중 오류가 발생했습니다: {str(e)}'}), 500
 
 
+# 파생 이미지 URL은 원본(타임스탬프가 붙은 고유 파일명)이 바뀌지 않는 한 내용이 같으므로 1년 캐시
+BUSINESS_CARD_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+@customer_bp.route('/business-card/<filename>', methods=['GET'])
+# @permission_required('customer')  # 임시로 주석 처리
+def get_business_card_image(filename):
+    """
+    명함 이미지 (썸네일/중간 크기/원본)
+    ?size=thumb(기본)|medium|original — 브라우저가 WebP를 받으면 WebP, 아니면 JPEG
+    """
+    size = request.args.get('size', 'thumb')
+    if size != 'original' and size not in business_card_thumbnails.THUMBNAIL_SIZES:
+        return jsonify({'error': '지원하지 않는 이미지 크기입니다.'}), 400
+
+    if secure_filename(filename) != filename:
+        return jsonify({'error': '잘못된 파일 이름입니다.'}), 400
+    source_path = os.path.abspath(os.path.join(BUSINESS_CARD_UPLOAD_FOLDER, filename))
+    if not os.path.isfile(source_path):
+        return jsonify({'error': '명함 이미지를 찾을 수 없습니다.'}), 404
+
+    try:
+        if size == 'original':
+            response = send_file(source_path, conditional=True)
+        else:
+            accept_webp = 'image/webp' in request.headers.get('Accept', '')
+            path, mimetype = business_card_thumbnails.get_derivative(source_path, size, accept_webp)
+            response = send_file(os.path.abspath(path), mimetype=mimetype, conditional=True)
+            response.vary.add('Accept')
+    except Exception as e:
+        return jsonify({'error': f'명함 이미지를 불러오는 중 오류가 발생했습니다: {str(e)}'}), 500
+
+    response.headers['Cache-Control'] = BUSINESS_CARD_CACHE_CONTROL
+    return response
+
+
+# parse_business_card_text 규칙을 바꾸면 올린다 (캐시된 명함은 OCR 텍스트로 다시 파싱)
+BUSINESS_CARD_PARSER_VERSION = 1
+
+
 def parse_business_card_text(text):
     """명함 텍스트에서 구조화된 정보 추출 (향상된 버전)"""
     lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -549,94 +652,24 @@ def import_customers_from_excel():
         file.save(temp_path)
         
         try:
-            # 엑셀 파일 읽기
-            df = pd.read_excel(temp_path)
-            
-            # 필요한 컬럼 확인
-            required_columns = ['company_name']  # company_name만 필수로 변경
-            optional_columns = ['contact_person', 'email', 'phone', 'address', 'postal_code', 'tel', 'fax', 'president', 'mobile', 'contact']
-            
-            # 필수 컬럼 확인
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                return jsonify({'error': f'필수 컬럼이 누락되었습니다: {", ".join(missing_columns)}'}), 400
-            
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            # 각 행 처리
-            for index, row in df.iterrows():
-                try:
-                    # 안전한 값 추출 함수
-                    def safe_get_value(value, is_required=False):
-                        """안전하게 값을 추출하고 빈 값 처리"""
-                        if pd.isna(value) or value is None:
-                            return "NONE" if is_required else "담당자 미지정"  # contact_person의 기본값
-                        return str(value).strip() if str(value).strip() else ("NONE" if is_required else "담당자 미지정")
-                    
-                    # 필수 데이터 확인 (회사명만 필수)
-                    company_name = safe_get_value(row['company_name'], True)
-                    
-                    # 회사명이 진짜 비어있는 경우에만 에러
-                    if pd.isna(row['company_name']) or str(row['company_name']).strip() == '':
-                        error_count += 1
-                        errors.append(f'행 {index + 2}: 회사명은 필수 항목입니다.')
-                        continue
-                    
-                    # 고객 데이터 준비
-                    customer_data = {
-                        'company_name': company_name
-                    }
-                    
-                    # 모든 컬럼을 선택적으로 처리 (contact_person 포함)
-                    for col in optional_columns:
-                        if col in df.columns:
-                            if col == 'contact_person':
-                                # contact_person은 특별히 기본값 설정
-                                customer_data[col] = safe_get_value(row[col])
-                            else:
-                                customer_data[col] = safe_get_value(row[col])
-                        else:
-                            customer_data[col] = "NONE"
-                    
-                    # 기존 고객 확인 (회사명으로)
-                    existing_customer = Customer.get_by_company_name(customer_data['company_name'])
-                    
-                    if existing_customer:
-                        # 기존 고객 정보 업데이트
-                        for key, value in customer_data.items():
-                            if key != 'company_name':  # 회사명은 변경하지 않음
-                                setattr(existing_customer, key, value)
-                        
-                        result = existing_customer.update()
-                        if result:
-                            success_count += 1
-                        else:
-                            error_count += 1
-                            errors.append(f'행 {index + 2}: 고객 정보 업데이트 실패')
-                    else:
-                        # 새 고객 생성
-                        new_customer = Customer(**customer_data)
-                        result = new_customer.save()
-                        if result:
-                            success_count += 1
-                        else:
-                            error_count += 1
-                            errors.append(f'행 {index + 2}: 고객 정보 저장 실패')
-                            
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f'행 {index + 2}: {str(e)}'
-                    errors.append(error_msg)
-                    import traceback
-                    traceback.print_exc()
-            
+            # 엑셀 파일 읽기 후 한 트랜잭션으로 일괄 등록/수정
+            from app.utils.customer_import import import_customers, read_customer_excel
+            df = read_customer_excel(temp_path)
+            try:
+                result = import_customers(df)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
+            errors = [f"행 {r['row']}: {r['message']}" for r in result['rows'] if r['status'] == 'error']
             return jsonify({
                 'message': f'엑셀 임포트 완료',
-                'success_count': success_count,
-                'error_count': error_count,
-                'errors': errors[:10]  # 최대 10개 에러만 반환
+                'success_count': result['created_count'] + result['updated_count'],
+                'created_count': result['created_count'],
+                'updated_count': result['updated_count'],
+                'skipped_count': result['skipped_count'],
+                'error_count': result['error_count'],
+                'errors': errors[:10],  # 최대 10개 에러만 반환
+                'rows': result['rows']
             }), 200
             
         except Exception as e:
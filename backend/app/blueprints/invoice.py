@@ -4,7 +4,12 @@ from app.models.invoice import Invoice
 from app.models.invoice_item import InvoiceItem
 from app.models.service_report import ServiceReport
 from app.models.invoice_code import InvoiceCode
+from app.models.revenue_rollup import RevenueRollup
 from app.utils.auth import admin_required
+from app.utils.etag import conditional_get
+from app.utils.revenue_analytics import (
+    ANALYTICS_TABLES, get_revenue_analytics, export_revenue_analytics_xlsx, normalize_filters
+)
 from app.utils.smb_utils import is_unc_path, unc_join, path_exists, get_for_serve
 from datetime import date, datetime
 import os
@@ -80,34 +85,11 @@ def get_invoices():
         smb_user = save_info['username']
         smb_pass = save_info['password']
 
-        # 고객 팩스번호 조회를 위한 user.db 연결
-        import sqlite3
-        user_db_path = os.path.join('app', 'database', 'user.db')
-        user_conn = sqlite3.connect(user_db_path)
-        user_conn.row_factory = sqlite3.Row
-
         result = []
         for invoice in invoices:
+            # 표시용 상호 / 팩스번호(또는 이메일)는 목록 쿼리에서 함께 조회됨
             invoice_dict = invoice.to_dict()
 
-            # 명세서 수신 방법에 따라 팩스번호 또는 이메일 조회 (customer_id 기준으로 조회하여 상호 변경 시에도 정상 동작)
-            customer = None
-            if invoice.customer_id:
-                customer = user_conn.execute(
-                    "SELECT company_name, fax, email, statement_receive_method FROM customers WHERE id = ?",
-                    (invoice.customer_id,)
-                ).fetchone()
-            if customer:
-                invoice_dict['display_customer_name'] = customer['company_name']
-                method = customer['statement_receive_method'] or '팩스'
-                if method == '이메일':
-                    invoice_dict['fax_number'] = customer['email'] if customer['email'] else None
-                else:
-                    invoice_dict['fax_number'] = customer['fax'] if customer['fax'] else None
-            else:
-                invoice_dict['display_customer_name'] = invoice.customer_name
-                invoice_dict['fax_number'] = None
-
             # 파일 존재 여부 확인 (UNC 경로 지원)
             _unc = is_unc_path(INVOICE_BASE_DIR)
             if _unc:
@@ -138,8 +120,6 @@ def get_invoices():
 
             result.append(invoice_dict)
 
-        user_conn.close()
-
         return jsonify({
             'invoices': result,
             'total': total,
@@ -229,6 +209,7 @@ def update_invoice(invoice_id):
             return jsonify({'error': '거래명세표를 찾을 수 없습니다.'}), 404
         
         data = request.get_json()
+        previous_issue_date = invoice.issue_date
         
         # 기본 정보 업데이트
         if 'customer_name' in data:
@@ -246,39 +227,14 @@ def update_invoice(invoice_id):
         
         # 금액 재계산
         if 'items' in data:
-            # 기존 항목들 삭제
-            InvoiceItem.delete_by_invoice_id(invoice_id)
-            
+            items = [InvoiceItem.from_request_data(invoice_id, item_data) for item_data in data['items']]
+
             work_subtotal = 0
             travel_subtotal = 0
             parts_subtotal = 0
-            
-            # 새 항목들 저장
-            for item_data in data['items']:
-                # is_header 값 처리: isHeader(camelCase) 또는 is_header(snake_case) 둘 다 지원
-                is_header_value = item_data.get('isHeader', item_data.get('is_header', 0))
-                
-                # 디버깅: 헤더 행 확인
-                if '서비스비용' in str(item_data.get('item_name', '')) or '부품비용' in str(item_data.get('item_name', '')):
-                    print(f"[DEBUG] 헤더 행 감지: {item_data.get('item_name')}, is_header={is_header_value}")
-                
-                item = InvoiceItem(
-                    invoice_id=invoice_id,
-                    item_type=item_data.get('item_type', 'parts'),
-                    description=item_data.get('description', ''),
-                    quantity=float(item_data.get('quantity', 0)),
-                    unit_price=float(item_data.get('unit_price', 0)),
-                    total_price=float(item_data.get('total_price', 0)),
-                    month=item_data.get('month'),
-                    day=item_data.get('day'),
-                    item_name=item_data.get('item_name'),
-                    part_number=item_data.get('part_number'),
-                    is_header=is_header_value,
-                    row_order=item_data.get('row_order', 0)
-                )
-                item.save()
-                
-                # 항목별 소계 계산
+
+            # 항목별 소계 계산
+            for item in items:
                 if item.item_type == 'work':
                     work_subtotal += item.total_price
                 elif item.item_type == 'travel':
@@ -293,8 +249,21 @@ def update_invoice(invoice_id):
             invoice.total_amount = work_subtotal + travel_subtotal + parts_subtotal
             invoice.vat_amount = invoice.total_amount * 0.1
             invoice.grand_total = invoice.total_amount + invoice.vat_amount
-        
-        invoice.save()
+
+            # 헤더 + 항목을 한 트랜잭션으로 저장 (변경된 항목만 기록)
+            invoice.save_with_items(items)
+        else:
+            invoice.save()
+
+        # 발행된 거래명세표를 수정한 경우 변경 전/후 월의 매출 집계 갱신
+        if getattr(invoice, 'bill_status', None) == 'issued':
+            from app.database.init_db import get_db_connection
+            conn = get_db_connection()
+            try:
+                RevenueRollup.refresh_for_dates(conn, previous_issue_date, invoice.issue_date)
+                conn.commit()
+            finally:
+                conn.close()
         
         return jsonify({'message': '거래명세표가 수정되었습니다.'}), 200
         
@@ -326,13 +295,9 @@ def create_invoice():
                     'exists': True
                 }), 409  # 409 Conflict
 
-        # 거래명세서 번호 자동 생성 (발행일자 기준)
-        invoice_number = Invoice._generate_invoice_number(data['issue_date'])
-
-        # 거래명세서 생성
+        # 거래명세서 생성 (번호는 save() 시 발행일자 기준으로 자동 발급)
         invoice = Invoice(
             service_report_id=service_report_id,
-            invoice_number=invoice_number,
             customer_id=data['customer_id'],
             customer_name=data['customer_name'],
             customer_address=data['customer_address'],
@@ -500,6 +465,8 @@ def issue_bill(invoice_id):
             WHERE id = ?
         ''', (datetime.now().isoformat(), current_user_id,
               current_user_id, datetime.now().isoformat(), invoice_id))
+        # 같은 트랜잭션에서 해당 월 매출 집계 갱신
+        RevenueRollup.refresh_for_invoice(conn, invoice_id)
         conn.commit()
         conn.close()
 
@@ -529,6 +496,8 @@ def cancel_bill(invoice_id):
                 bill_issued_by = NULL
             WHERE id = ?
         ''', (invoice_id,))
+        # 같은 트랜잭션에서 해당 월 매출 집계 갱신
+        RevenueRollup.refresh_for_invoice(conn, invoice_id)
         conn.commit()
         conn.close()
 
@@ -542,122 +511,52 @@ def cancel_bill(invoice_id):
 def get_ytd_summary():
     """연도별 카테고리별 월별 비용 집계 (YTD Summary) - 카테고리별 work/travel cost만 집계"""
     try:
-        from app.database.init_db import get_db_connection
-
         year = request.args.get('year', date.today().year, type=int)
 
-        conn = get_db_connection()
+        # 월별 매출 집계(revenue_rollup)에서 조회 - 계산서 발행/취소, Invoice 코드/리포트 코드 변경 시 갱신됨
+        # 시간: 네고 항목(total_price < 0) 제외 / 금액: 네고 포함
+        rollup_rows = RevenueRollup.get_by_year(year)
 
-        # NULL category 체크
-        null_category_check = conn.execute('''
-            SELECT COUNT(DISTINCT sr.id)
-            FROM service_reports sr
-            LEFT JOIN invoice_codes ic ON sr.invoice_code_id = ic.id
-            WHERE sr.invoice_code_id IS NULL OR ic.category IS NULL
-        ''').fetchone()
-
-        has_null_categories = null_category_check[0] > 0
-
-        # 카테고리별로 work/travel 시간(hours) 집계 (네고 항목 제외)
-        # 시간 계산: 네고 항목(total_price < 0)은 아예 무시
-        # 금액 계산: 네고 금액은 포함하여 차감 (Labor Total에서 처리)
-        # invoice_code_id를 invoices 테이블에서 우선 가져오고, 없으면 service_reports에서 가져옴
-        category_query = conn.execute('''
-            SELECT
-                COALESCE(ic.category, 'Unknown') as category,
-                CAST(strftime('%m', i.issue_date) AS INTEGER) as month,
-                ii.item_type,
-                SUM(CASE WHEN ii.total_price >= 0 THEN ii.quantity ELSE 0 END) as total_hours
-            FROM invoice_items ii
-            INNER JOIN invoices i ON ii.invoice_id = i.id
-            LEFT JOIN service_reports sr ON i.service_report_id = sr.id
-            LEFT JOIN invoice_codes ic ON COALESCE(i.invoice_code_id, sr.invoice_code_id) = ic.id
-            WHERE i.bill_status = 'issued'
-                AND CAST(strftime('%Y', i.issue_date) AS INTEGER) = ?
-                AND ii.is_header = 0
-                AND ii.item_type IN ('work', 'travel')
-            GROUP BY COALESCE(ic.category, 'Unknown'), CAST(strftime('%m', i.issue_date) AS INTEGER), ii.item_type
-        ''', (year,)).fetchall()
+        # 카테고리가 없는(코드 미지정 또는 코드에 카테고리 없음) 작업/출장 매출이 있는지
+        has_null_categories = any(
+            row['category'] == 'Unknown' and row['item_type'] in ('work', 'travel') for row in rollup_rows
+        )
 
         # 카테고리별로 데이터 구조화
         category_data_map = {}
 
-        print(f"🔍 YTD category_query 결과 ({len(category_query)}개 행):")
-        for row in category_query:
-            category = row[0] if row[0] else 'Unknown'
-            month = row[1]
-            item_type = row[2]
-            total_hours = row[3]
-            print(f"  Category={category}, Month={month}, Type={item_type}, Hours={total_hours}")
+        # Labor Total: work/travel 비용 총계 (네고 포함)
+        labor_monthly_total = {str(month): 0 for month in range(1, 13)}
+        # 부품비용은 카테고리 구분 없이 월별 총계 계산
+        parts_monthly_total = {str(month): 0 for month in range(1, 13)}
+
+        for row in rollup_rows:
+            month = row['month']
+            category = row['category'] or 'Unknown'
+            item_type = row['item_type']
+            if not month or month < 1 or month > 12:
+                continue
+
+            if item_type == 'parts':
+                parts_monthly_total[str(month)] += float(row['amount'] or 0)
+                continue
+            if item_type not in ('work', 'travel'):
+                continue
+
+            labor_monthly_total[str(month)] += float(row['amount'] or 0)
 
-            # 카테고리가 처음 등장하면 초기화
+            # 카테고리가 처음 등장하면 초기화 (12개월)
             if category not in category_data_map:
                 category_data_map[category] = {
                     'category': category,
                     'description': '',  # 카테고리 번호만 표시
-                    'monthly_data': {}
-                }
-                # 12개월 초기화
-                for m in range(1, 13):
-                    category_data_map[category]['monthly_data'][str(m)] = {
-                        'work': 0,
-                        'travel': 0,
-                        'parts': 0
+                    'monthly_data': {
+                        str(m): {'work': 0, 'travel': 0, 'parts': 0} for m in range(1, 13)
                     }
+                }
 
             # 데이터 합산 (시간)
-            if month and month >= 1 and month <= 12 and item_type in ['work', 'travel']:
-                category_data_map[category]['monthly_data'][str(month)][item_type] += float(total_hours) if total_hours else 0
-
-        # Labor Total: work/travel 비용 총계 (네고 포함)
-        labor_monthly_total = {}
-        for month in range(1, 13):
-            labor_monthly_total[str(month)] = 0
-
-        labor_query = conn.execute('''
-            SELECT
-                CAST(strftime('%m', i.issue_date) AS INTEGER) as month,
-                SUM(ii.total_price) as total
-            FROM invoice_items ii
-            INNER JOIN invoices i ON ii.invoice_id = i.id
-            WHERE i.bill_status = 'issued'
-                AND CAST(strftime('%Y', i.issue_date) AS INTEGER) = ?
-                AND ii.is_header = 0
-                AND ii.item_type IN ('work', 'travel')
-            GROUP BY CAST(strftime('%m', i.issue_date) AS INTEGER)
-        ''', (year,)).fetchall()
-
-        for row in labor_query:
-            month = row[0]
-            total = row[1]
-            if month >= 1 and month <= 12:
-                labor_monthly_total[str(month)] = float(total) if total else 0
-
-        # 부품비용은 카테고리 구분 없이 월별 총계 계산
-        parts_monthly_total = {}
-        for month in range(1, 13):
-            parts_monthly_total[str(month)] = 0
-
-        parts_query = conn.execute('''
-            SELECT
-                CAST(strftime('%m', i.issue_date) AS INTEGER) as month,
-                SUM(ii.total_price) as total
-            FROM invoice_items ii
-            INNER JOIN invoices i ON ii.invoice_id = i.id
-            WHERE i.bill_status = 'issued'
-                AND CAST(strftime('%Y', i.issue_date) AS INTEGER) = ?
-                AND ii.is_header = 0
-                AND ii.item_type = 'parts'
-            GROUP BY CAST(strftime('%m', i.issue_date) AS INTEGER)
-        ''', (year,)).fetchall()
-
-        for row in parts_query:
-            month = row[0]
-            total = row[1]
-            if month >= 1 and month <= 12:
-                parts_monthly_total[str(month)] = float(total) if total else 0
-
-        conn.close()
+            category_data_map[category]['monthly_data'][str(month)][item_type] += float(row['hours'] or 0)
 
         # 카테고리 데이터를 리스트로 변환 (카테고리 번호순 정렬)
         category_list = []
@@ -685,6 +584,116 @@ def get_ytd_summary():
         }), 500
 
 
+@invoice_bp.route('/invoices/analytics', methods=['GET'])
+@jwt_required()
+@conditional_get(*ANALYTICS_TABLES)
+def get_invoice_analytics():
+    """매출/작업시간 분석 (전년 대비, 고객별, 담당자별, 카테고리별 시간)"""
+    try:
+        year = request.args.get('year', date.today().year, type=int)
+        try:
+            filters = normalize_filters(request.args)
+        except ValueError:
+            return jsonify({'success': False, 'message': '필터 값이 올바르지 않습니다.'}), 400
+
+        return jsonify({
+            'success': True,
+            'data': get_revenue_analytics(year, filters)
+        }), 200
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'message': f'매출 분석 조회 실패: {str(e)}'
+        }), 500
+
+
+@invoice_bp.route('/invoices/analytics/export', methods=['GET'])
+@jwt_required()
+def export_invoice_analytics():
+    """매출/작업시간 분석 결과 엑셀 다운로드"""
+    try:
+        year = request.args.get('year', date.today().year, type=int)
+        try:
+            filters = normalize_filters(request.args)
+        except ValueError:
+            return jsonify({'success': False, 'message': '필터 값이 올바르지 않습니다.'}), 400
+
+        output = export_revenue_analytics_xlsx(year, filters)
+        return send_file(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=f'매출분석_{year}.xlsx'
+        )
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'message': f'매출 분석 엑셀 생성 실패: {str(e)}'
+        }), 500
+
+@invoice_bp.route('/admin/invoices/revenue-rollup/rebuild', methods=['POST'])
+@admin_required
+def rebuild_revenue_rollup():
+    """월별 매출 집계 전체 재생성 (관리자 전용)"""
+    try:
+        count = RevenueRollup.rebuild()
+        return jsonify({
+            'success': True,
+            'message': '매출 집계가 재생성되었습니다.',
+            'rows': count
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'매출 집계 재생성 실패: {str(e)}'
+        }), 500
+
+@invoice_bp.route('/invoices/monthly-bundle', methods=['GET'])
+@jwt_required()
+def download_monthly_bundle():
+    """월별 발행 거래명세서 PDF 묶음 다운로드 (고객사/거래명세서별 책갈피 포함)"""
+    try:
+        from app.utils.invoice_bundle import build_monthly_bundle
+
+        year = request.args.get('year', type=int)
+        month = request.args.get('month', type=int)
+        if not year or not month or not 1 <= month <= 12:
+            return jsonify({'error': 'year, month(1-12)는 필수 항목입니다.'}), 400
+        force = request.args.get('refresh', '').lower() in ('1', 'true')
+
+        save_info = _get_invoice_save_info()
+        bundle_path, info = build_monthly_bundle(
+            year, month, save_info['path'], save_info['username'], save_info['password'], force=force
+        )
+        if not bundle_path:
+            return jsonify({
+                'error': '묶을 수 있는 발행 거래명세서 PDF가 없습니다.',
+                **info
+            }), 404
+
+        response = send_file(
+            bundle_path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'거래명세서_{year}년{month:02d}월.pdf',
+            conditional=True
+        )
+        response.headers['X-Bundle-Included'] = str(info['included'])
+        response.headers['X-Bundle-Missing'] = ','.join(info['missing'])
+        return response
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'월별 PDF 묶음 생성 실패: {str(e)}'}), 500
+
 @invoice_bp.route('/invoices/bulk-download', methods=['POST'])
 @jwt_required()
 def bulk_download_invoices():
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify, make_response
 from flask_jwt_extended import jwt_required
 from app.models.invoice_code import InvoiceCode
+from app.models.revenue_rollup import RevenueRollup
 from app.utils.auth import admin_required
+from app.utils.etag import conditional_get
 import sqlite3
 
 invoice_code_bp = Blueprint('invoice_code', __name__)
@@ -174,12 +176,13 @@ def update_invoice_code(code_id):
         try:
             # 존재하는 코드인지 확인
             existing = conn.execute(
-                'SELECT id FROM invoice_codes WHERE id = ?', 
+                'SELECT id, category FROM invoice_codes WHERE id = ?', 
                 (code_id,)
             ).fetchone()
             
             if not existing:
                 return jsonify({'error': '존재하지 않는 Invoice 코드입니다.'}), 404
+            existing_category = existing['category']
             
             # 중복 검사 (자기 자신 제외)
             duplicate = conn.execute(
@@ -196,6 +199,8 @@ def update_invoice_code(code_id):
                 code = ?, description = ?, category = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             ''', (code, description, category, code_id))
+            if existing_category != category:
+                RevenueRollup.refresh_for_invoice_code(conn, code_id)
             
             conn.commit()
             
@@ -253,6 +258,8 @@ def delete_invoice_code(code_id):
             
             # 실제 삭제
             conn.execute('DELETE FROM invoice_codes WHERE id = ?', (code_id,))
+            # 거래명세표에 직접 지정된 코드였다면 해당 월은 'Unknown'으로 재집계
+            RevenueRollup.refresh_for_invoice_code(conn, code_id)
             
             conn.commit()
             
@@ -266,6 +273,7 @@ def delete_invoice_code(code_id):
 
 @invoice_code_bp.route('/invoice-codes', methods=['GET'])
 @jwt_required()
+@conditional_get('invoice_codes')
 def get_all_invoice_codes():
     """모든 Invoice 코드 목록 조회 (모든 사용자)"""
     try:
@@ -1121,7 +1121,8 @@ def serve_invoice_excel(customer_name, filename):
             serve_path,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            conditional=True
         )
         if is_tmp:
             @response.call_on_close
@@ -1160,7 +1161,7 @@ def serve_invoice_pdf(customer_name, filename):
                     except OSError:
                         pass
                 return None
-            resp = send_file(serve_path, mimetype='application/pdf')
+            resp = send_file(serve_path, mimetype='application/pdf', conditional=True)
             if is_tmp:
                 @resp.call_on_close
                 def _cleanup():
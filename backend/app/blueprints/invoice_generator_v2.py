@@ -9,7 +9,8 @@ import tempfile
 from datetime import datetime
 from openpyxl import load_workbook
 from app.database.init_db import get_db_connection
-from app.utils.smb_utils import is_unc_path, unc_join, copy_to_target
+from app.utils.smb_utils import is_unc_path, unc_join
+from app.utils import upload_spool
 
 # 상수
 INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'instance')
@@ -272,8 +273,6 @@ def generate_invoice_excel_v2(invoice_id):
         # 5. 저장 경로 및 SMB 설정 확인
         save_info  = get_invoice_save_info_from_settings()
         base_dir   = save_info['path'] or INVOICE_BASE_DIR
-        smb_user   = save_info['username']
-        smb_pass   = save_info['password']
         use_smb    = is_unc_path(base_dir)
 
         # UNC 경로인 경우 Excel/PDF 생성은 로컬 임시 폴더에서 수행
@@ -611,26 +610,26 @@ def generate_invoice_excel_v2(invoice_id):
 
         pdf_success = convert_excel_to_pdf(output_path, local_pdf_path)
 
-        # 15. UNC 경로인 경우 SMB로 복사
+        # 15. UNC 경로인 경우 업로드 스풀에 등록 (백그라운드에서 SMB로 업로드, 재시도 포함)
         if use_smb:
             try:
                 final_excel = unc_join(base_dir, invoice['customer_name'], output_filename)
-                copy_to_target(output_path, final_excel, smb_user, smb_pass)
-                print(f"✅ Excel SMB 복사 완료: {final_excel}")
+                upload_spool.enqueue(output_path, final_excel, credentials='invoice')
+                print(f"✅ Excel SMB 업로드 예약: {final_excel}")
 
                 final_pdf = None
                 if pdf_success:
                     final_pdf = unc_join(base_dir, monthly_folder_name, pdf_filename)
-                    copy_to_target(local_pdf_path, final_pdf, smb_user, smb_pass)
-                    print(f"✅ PDF SMB 복사 완료: {final_pdf}")
+                    upload_spool.enqueue(local_pdf_path, final_pdf, credentials='invoice')
+                    print(f"✅ PDF SMB 업로드 예약: {final_pdf}")
             except Exception as smb_err:
-                print(f"❌ SMB 복사 실패: {smb_err}")
+                print(f"❌ SMB 업로드 예약 실패: {smb_err}")
                 # 로컬 파일은 유지 (서빙용)
                 use_smb = False
                 final_excel = output_path
                 final_pdf   = local_pdf_path if pdf_success else None
             else:
-                # SMB 복사 성공 시 로컬 임시 파일 정리 (서빙은 SMB에서)
+                # 스풀에 복사되었으므로 로컬 임시 파일 정리 (서빙은 스풀/SMB에서)
                 try:
                     shutil.rmtree(local_base, ignore_errors=True)
                 except Exception:
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, make_response
 from flask_jwt_extended import jwt_required
 from app.models.invoice_rate import InvoiceRate
 from app.utils.auth import admin_required
+from app.utils.etag import conditional_get
 
 invoice_rate_bp = Blueprint('invoice_rate', __name__)
 
@@ -17,6 +18,7 @@ def handle_preflight():
 
 @invoice_rate_bp.route('/admin/invoice-rates', methods=['GET'])
 @admin_required
+@conditional_get('invoice_rates')
 def get_invoice_rates():
     """Invoice 요율 설정 조회 (관리자 전용)"""
     try:
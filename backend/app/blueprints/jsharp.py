@@ -8,12 +8,11 @@ from werkzeug.utils import secure_filename
 from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageFilter
 import os
 import io
-import zipfile
-import tempfile
 import pandas as pd
 import re
 from datetime import datetime
 import msoffcrypto
+from app.utils.jsharp_images import build_zip
 from app.database.jsharp_db import insert_order, get_all_orders, delete_order, clear_all_orders, update_order_status
 
 # HEIC 지원을 위한 pillow-heif 등록
@@ -29,7 +28,6 @@ jsharp_bp = Blueprint('jsharp', __name__)
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp', 'heic', 'heif'}
 ALLOWED_EXCEL_EXTENSIONS = {'xlsx', 'xls'}
-IMAGE_SIZES = [430, 640, 860, 1000]
 
 
 def apply_field_replacements(field_value, replacements):
@@ -263,66 +261,11 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def add_white_border(image, border_width=1):
-    """
-    이미지 최외각에 흰색 테두리 추가
-
-    Args:
-        image: PIL Image 객체
-        border_width: 테두리 두께 (픽셀)
-
-    Returns:
-        테두리가 추가된 PIL Image 객체
-    """
-    # 새 이미지 크기 (테두리 포함)
-    new_width = image.width + (border_width * 2)
-    new_height = image.height + (border_width * 2)
-
-    # 흰색 배경의 새 이미지 생성
-    new_image = Image.new('RGB', (new_width, new_height), 'white')
-
-    # 원본 이미지를 중앙에 붙여넣기
-    new_image.paste(image, (border_width, border_width))
-
-    return new_image
-
-
-def resize_image_with_border(image, target_width):
-    """
-    이미지를 지정된 너비로 리사이즈하고 흰색 테두리 추가
-
-    Args:
-        image: PIL Image 객체
-        target_width: 목표 너비 (픽셀)
-
-    Returns:
-        리사이즈되고 테두리가 추가된 PIL Image 객체
-    """
-    # 원본 비율 유지하면서 리사이즈
-    aspect_ratio = image.height / image.width
-    target_height = int(target_width * aspect_ratio)
-
-    # 리사이즈
-    resized_image = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-
-    # RGB 모드로 변환 (PNG 등의 경우)
-    if resized_image.mode != 'RGB':
-        resized_image = resized_image.convert('RGB')
-
-    # 포토샵 Bicubic Sharper에 준하는 언샵마스크 적용
-    resized_image = resized_image.filter(ImageFilter.UnsharpMask(radius=0.5, percent=120, threshold=3))
-
-    # 1px 흰색 테두리 추가
-    final_image = add_white_border(resized_image, border_width=1)
-
-    return final_image
-
-
 @jsharp_bp.route('/jsharp/process-images', methods=['POST'])
 @jwt_required()
 def process_images():
     """
-    이미지 처리: 4개 사이즈로 변환하고 1px 흰색 테두리 추가
+    이미지 처리: 4개 사이즈(IMAGE_SIZES)로 변환하고 1px 흰색 테두리 추가
     처리된 이미지를 ZIP 파일로 반환
     """
     try:
@@ -341,87 +284,22 @@ def process_images():
                 'message': '이미지 파일이 없습니다.'
             }), 400
 
-        # 임시 디렉토리 생성
-        temp_dir = tempfile.mkdtemp()
+        # 업로드 순서대로 (바이트, 출력 파일명 앞부분) 수집 — 변환은 프로세스 풀에서 메모리로 처리
+        images = []
+        for file in files:
+            if file and allowed_file(file.filename):
+                filename_without_ext = os.path.splitext(secure_filename(file.filename))[0]
+                images.append((file.read(), filename_without_ext))
 
-        try:
-            # 각 이미지 처리
-            for file in files:
-                if file and allowed_file(file.filename):
-                    # 원본 파일명 (확장자 제외)
-                    original_filename = secure_filename(file.filename)
-                    filename_without_ext = os.path.splitext(original_filename)[0]
-
-                    # HEIC/HEIF 파일은 임시 파일로 저장 후 처리
-                    file_ext = os.path.splitext(original_filename)[1].lower()
-                    if file_ext in ['.heic', '.heif']:
-                        # 임시 파일로 저장
-                        temp_input_path = os.path.join(temp_dir, f"temp_{original_filename}")
-                        file.save(temp_input_path)
-
-                        # PIL Image로 열고 RGB로 변환하여 복사
-                        with Image.open(temp_input_path) as img:
-                            # RGB 모드로 변환하여 새 이미지 객체 생성 (원본과 독립)
-                            image = img.convert('RGB')
-
-                        # 임시 입력 파일 삭제 (이미지가 메모리에 로드됨)
-                        try:
-                            os.remove(temp_input_path)
-                        except:
-                            pass  # 파일 삭제 실패해도 계속 진행
-                    else:
-                        # 일반 이미지는 스트림에서 바로 열기
-                        image = Image.open(file.stream)
-                        image = ImageOps.exif_transpose(image)  # EXIF 회전 정보 적용
-
-                    # 4개 사이즈로 처리
-                    for size in IMAGE_SIZES:
-                        # 리사이즈 및 테두리 추가
-                        processed_image = resize_image_with_border(image, size)
-
-                        # 파일명 생성: 원본명-사이즈.jpg
-                        output_filename = f"{filename_without_ext}-{size}.jpg"
-                        output_path = os.path.join(temp_dir, output_filename)
-
-                        # JPEG로 저장 (최상 품질)
-                        processed_image.save(output_path, 'JPEG', quality=100, subsampling=0)
-
-            # ZIP 파일 생성
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # 임시 디렉토리의 모든 파일을 ZIP에 추가
-                for filename in os.listdir(temp_dir):
-                    file_path = os.path.join(temp_dir, filename)
-                    zip_file.write(file_path, filename)
-
-            zip_buffer.seek(0)
-
-            # 임시 파일 삭제
-            for filename in os.listdir(temp_dir):
-                os.remove(os.path.join(temp_dir, filename))
-            os.rmdir(temp_dir)
-
-            # ZIP 파일 전송
-            return send_file(
-                zip_buffer,
-                mimetype='application/zip',
-                as_attachment=True,
-                download_name='processed-images.zip'
-            )
-
-        except Exception as e:
-            # 임시 디렉토리 정리
-            if os.path.exists(temp_dir):
-                for filename in os.listdir(temp_dir):
-                    try:
-                        os.remove(os.path.join(temp_dir, filename))
-                    except:
-                        pass
-                try:
-                    os.rmdir(temp_dir)
-                except:
-                    pass
-            raise e
+        zip_buffer = build_zip(images)
+
+        # ZIP 파일 전송
+        return send_file(
+            zip_buffer,
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name='processed-images.zip'
+        )
 
     except Exception as e:
         return jsonify({
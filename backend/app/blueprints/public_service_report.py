@@ -1,45 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+
 from flask import Blueprint, request, jsonify
 from app.models.service_report import ServiceReport
+from app.models.service_report_signature import ServiceReportSignature
 from app.database.init_db import get_db_connection
+from app.utils.etag import get_table_versions
+from app.utils.rate_limit import TokenBucketLimiter, rate_limited
 
 public_service_report_bp = Blueprint('public_service_report', __name__)
 
+# IP별 요청 제한: 조회는 1분 60회 수준(순간 30회), 서명 제출은 1분 1회 수준(순간 5회)
+_view_limiter = TokenBucketLimiter(capacity=30, refill_rate=1.0)
+_sign_limiter = TokenBucketLimiter(capacity=5, refill_rate=1 / 60)
+
+# 토큰별 응답 캐시: (만료 시각, 테이블 버전, 응답 dict)
+# 리포트 수정/서명 제출은 service_reports 버전을, 부품/작업시간 재저장은 각 하위 테이블 버전을 올리므로
+# 수정 도중(부품/작업시간을 다시 쓰는 중)에 읽은 응답도 다음 조회에서 자동으로 다시 읽는다.
+# 없는 토큰은 캐시하지 않는다 (토큰 대입 요청이 실제 리포트 캐시를 밀어내지 않도록).
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 512
+CACHE_TABLES = ('service_reports', 'service_report_parts', 'service_report_time_records', 'customers', 'users')
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _load_report_payload(token):
+    report = ServiceReport.get_by_public_token(token)
+    if not report:
+        return None
+
+    parts = report.get_parts()
+    time_records = report.get_time_records()
+    return {
+        'id': report.id,
+        'report_number': report.report_number,
+        'customer_name': getattr(report, 'customer_name', None),
+        'customer_address': getattr(report, 'customer_address', None),
+        'service_date': report.service_date,
+        'technician_name': getattr(report, 'technician_name', None),
+        'machine_model': report.machine_model,
+        'machine_serial': report.machine_serial,
+        'problem_description': report.problem_description,
+        'solution_description': report.solution_description,
+        'used_parts': [p.to_dict() for p in parts],
+        'time_records': [t.to_dict() for t in time_records],
+        'has_signature': report.has_signature,
+        'customer_signed_at': report.customer_signed_at,
+        'signer_name': getattr(report, 'signer_name', None),
+    }
+
+
+def _get_report_payload(token):
+    """캐시된 공개 리포트 (TTL 이내이고 테이블 버전이 같을 때만 사용)"""
+    version_key, _ = get_table_versions(CACHE_TABLES)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(token)
+        if cached and cached[0] > now and cached[1] == version_key:
+            _cache.move_to_end(token)
+            return cached[2]
+
+    payload = _load_report_payload(token)
+    if payload is None:
+        return None
+
+    with _cache_lock:
+        _cache[token] = (now + CACHE_TTL_SECONDS, version_key, payload)
+        _cache.move_to_end(token)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return payload
+
+
+def _invalidate(token):
+    with _cache_lock:
+        _cache.pop(token, None)
+
 
 @public_service_report_bp.route('/<token>', methods=['GET'])
+@rate_limited(_view_limiter)
 def get_public_service_report(token):
     """고객 공개 서비스 리포트 조회 (인증 불필요)"""
     try:
-        report = ServiceReport.get_by_public_token(token)
-        if not report:
+        payload = _get_report_payload(token)
+        if payload is None:
             return jsonify({'error': '서비스 리포트를 찾을 수 없습니다.'}), 404
-
-        parts = report.get_parts()
-        time_records = report.get_time_records()
-
-        return jsonify({
-            'report': {
-                'id': report.id,
-                'report_number': report.report_number,
-                'customer_name': getattr(report, 'customer_name', None),
-                'customer_address': getattr(report, 'customer_address', None),
-                'service_date': report.service_date,
-                'technician_name': getattr(report, 'technician_name', None),
-                'machine_model': report.machine_model,
-                'machine_serial': report.machine_serial,
-                'problem_description': report.problem_description,
-                'solution_description': report.solution_description,
-                'used_parts': [p.to_dict() for p in parts],
-                'time_records': [t.to_dict() for t in time_records],
-                'has_signature': bool(report.customer_signature),
-                'customer_signed_at': report.customer_signed_at,
-                'signer_name': getattr(report, 'signer_name', None),
-            }
-        }), 200
+        return jsonify({'report': payload}), 200
     except Exception as e:
         return jsonify({'error': f'조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
 
 @public_service_report_bp.route('/<token>/signature', methods=['POST'])
+@rate_limited(_sign_limiter)
 def submit_signature(token):
     """고객 서명 저장 (인증 불필요, 1회만 가능)"""
     try:
@@ -47,7 +101,7 @@ def submit_signature(token):
         if not report:
             return jsonify({'error': '서비스 리포트를 찾을 수 없습니다.'}), 404
 
-        if report.customer_signature:
+        if report.has_signature:
             return jsonify({'error': '이미 서명이 완료된 레포트입니다.'}), 409
 
         data = request.get_json()
@@ -58,12 +112,16 @@ def submit_signature(token):
 
         conn = get_db_connection()
         try:
-            conn.execute(
-                'UPDATE service_reports SET customer_signature=?, customer_signed_at=CURRENT_TIMESTAMP, signer_name=? WHERE public_token=?',
-                (signature_data, signer_name, token)
-            )
+            created = ServiceReportSignature.create(conn, report.id, signature_data, signer_name)
+            if not created:
+                conn.rollback()
+                return jsonify({'error': '이미 서명이 완료된 레포트입니다.'}), 409
             conn.commit()
+            _invalidate(token)
             return jsonify({'message': '서명이 저장되었습니다.'}), 200
+        except ValueError as e:
+            conn.rollback()
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             conn.rollback()
             return jsonify({'error': str(e)}), 500
@@ -8,20 +8,24 @@ resource_bp = Blueprint('resource', __name__)
 @resource_bp.route('', methods=['GET'])
 # @jwt_required()  # 임시로 주석 처리
 def get_resources():
-    """모든 리소스 조회"""
+    """
+    모든 리소스 조회
+    - history_limit: 리소스별 최신 N건의 관리 이력만 반환 (management_history_count에 전체 건수)
+    """
     try:
         customer_id = request.args.get('customer_id')
         include_customer = request.args.get('include_customer', 'false').lower() == 'true'
+        history_limit = request.args.get('history_limit', None, type=int)
         
         if customer_id:
-            resources = Resource.get_by_customer_id(int(customer_id))
+            resources = Resource.get_by_customer_id(int(customer_id), history_limit=history_limit)
             return jsonify([resource.to_dict() for resource in resources]), 200
         elif include_customer:
             # 고객 정보와 함께 조회
-            resources = Resource.get_all_with_customer_info()
+            resources = Resource.get_all_with_customer_info(history_limit=history_limit)
             return jsonify(resources), 200
         else:
-            resources = Resource.get_all()
+            resources = Resource.get_all(history_limit=history_limit)
             return jsonify([resource.to_dict() for resource in resources]), 200
     
     except Exception as e:
@@ -30,9 +34,9 @@ def get_resources():
 @resource_bp.route('/<int:resource_id>', methods=['GET'])
 # @jwt_required()  # 임시로 주석 처리
 def get_resource(resource_id):
-    """특정 리소스 조회"""
+    """특정 리소스 조회 (history_limit: 최신 N건의 관리 이력만)"""
     try:
-        resource = Resource.get_by_id(resource_id)
+        resource = Resource.get_by_id(resource_id, history_limit=request.args.get('history_limit', None, type=int))
         
         if not resource:
             return jsonify({'error': '리소스를 찾을 수 없습니다.'}), 404
@@ -1,9 +1,12 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, make_response
 from app.utils.auth import permission_required, get_current_user, service_report_update_required, admin_required
 from app.models.service_report import ServiceReport
+from app.models.service_report_signature import ServiceReportSignature
+from app.utils.service_report_pdf import (
+    build_pdf_html, get_save_info, prepare_report_dict, report_filename, save_to_configured_folder,
+    EXPORT_FORMATS, ExportAlreadyRunning, get_export_result_path, get_export_status, start_export
+)
 from app.database.init_db import get_db_connection
-import os
-import base64
 import io
 from datetime import datetime
 
@@ -22,6 +25,8 @@ def get_service_reports():
         technician_id = request.args.get('technician_id', type=int)
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        # summary 모드: 목록 화면용으로 사용부품/시간기록 제외
+        summary = request.args.get('summary', '').lower() in ('1', 'true')
         
         if keyword or customer_id or technician_id or start_date or end_date:
             reports, total = ServiceReport.search(
@@ -31,13 +36,14 @@ def get_service_reports():
                 start_date=start_date,
                 end_date=end_date,
                 page=page,
-                per_page=per_page
+                per_page=per_page,
+                with_children=not summary
             )
         else:
-            reports, total = ServiceReport.get_all(page=page, per_page=per_page)
+            reports, total = ServiceReport.get_all(page=page, per_page=per_page, with_children=not summary)
         
         return jsonify({
-            'reports': [report.to_dict() for report in reports],
+            'reports': [report.to_dict(include_children=not summary) for report in reports],
             'total': total,
             'page': page,
             'per_page': per_page,
@@ -47,6 +53,33 @@ def get_service_reports():
     except Exception as e:
         return jsonify({'error': f'서비스 리포트 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@service_report_bp.route('/utilization', methods=['GET'])
+@admin_required
+def get_technician_utilization():
+    """
+    기술자별 가동률/초과근무 리포트 (관리자만 가능)
+    쿼리: start_date, end_date (기본: 이번 달), period=week|month, technician_id
+    """
+    from app.utils.technician_utilization import get_utilization
+
+    today = datetime.now().date()
+    start_date = request.args.get('start_date') or today.replace(day=1).isoformat()
+    end_date = request.args.get('end_date') or today.isoformat()
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+        result = get_utilization(
+            start_date, end_date,
+            period=request.args.get('period', 'week'),
+            technician_id=request.args.get('technician_id', type=int)
+        )
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': f'잘못된 요청입니다: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': f'가동률 조회 중 오류가 발생했습니다: {str(e)}'}), 500
+
+
 @service_report_bp.route('/<int:report_id>', methods=['GET'])
 @permission_required('service_report')
 def get_service_report(report_id):
@@ -323,6 +356,29 @@ def unlock_service_report(report_id):
     except Exception as e:
         return jsonify({'error': f'리포트 잠금 해제 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@service_report_bp.route('/<int:report_id>/signature', methods=['GET'])
+@permission_required('service_report')
+def get_signature(report_id):
+    """고객 서명 이미지 (ETag로 캐시, 변경 없으면 304)"""
+    try:
+        row = ServiceReportSignature.get(report_id)
+        if not row:
+            return jsonify({'error': '서명이 없습니다.'}), 404
+
+        etag = ServiceReportSignature.etag(row)
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(bytes(row['image']))
+            response.mimetype = row['mime_type']
+        response.set_etag(etag)
+        # 재서명 시 내용이 바뀌므로 매번 ETag 재검증
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    except Exception as e:
+        return jsonify({'error': f'서명 조회 중 오류가 발생했습니다: {str(e)}'}), 500
+
+
 @service_report_bp.route('/<int:report_id>/signature', methods=['DELETE'])
 @admin_required
 def delete_signature(report_id):
@@ -332,15 +388,12 @@ def delete_signature(report_id):
         if not report:
             return jsonify({'error': '서비스 리포트를 찾을 수 없습니다.'}), 404
 
-        if not report.customer_signature:
+        if not report.has_signature:
             return jsonify({'error': '삭제할 서명이 없습니다.'}), 400
 
         conn = get_db_connection()
         try:
-            conn.execute(
-                'UPDATE service_reports SET customer_signature=NULL, customer_signed_at=NULL WHERE id=?',
-                (report_id,)
-            )
+            ServiceReportSignature.delete(conn, report_id)
             conn.commit()
             return jsonify({'message': '서명이 삭제되었습니다.'}), 200
         except Exception as e:
@@ -352,263 +405,6 @@ def delete_signature(report_id):
         return jsonify({'error': f'서명 삭제 중 오류가 발생했습니다: {str(e)}'}), 500
 
 
-def _build_pdf_html(report_dict: dict) -> str:
-    """서비스 리포트 데이터로 WeasyPrint용 HTML 생성"""
-    r = report_dict
-
-    # 로고 이미지 base64 로드
-    logo_tag = ''
-    logo_path = os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '..', '..', 'instance', 'LVD Logo_default.jpg'
-    ))
-    if os.path.exists(logo_path):
-        with open(logo_path, 'rb') as f:
-            logo_b64 = base64.b64encode(f.read()).decode('utf-8')
-        logo_tag = f'<img src="data:image/jpeg;base64,{logo_b64}" style="height:40px; object-fit:contain;" />'
-    else:
-        logo_tag = '<div></div>'
-
-    # 서비스 날짜 포맷
-    service_date_str = '-'
-    if r.get('service_date'):
-        try:
-            d = datetime.fromisoformat(r['service_date'].replace('Z', ''))
-            service_date_str = f"{d.year}년 {d.month}월 {d.day}일"
-        except Exception:
-            service_date_str = r['service_date']
-
-    # 출력일
-    today_str = datetime.now().strftime('%Y년 %m월 %d일')
-
-    # 동행/지원 기술자
-    support_tech_names = r.get('support_technician_names') or '없음'
-
-    # 사용부품
-    parts = r.get('used_parts') or []
-    parts_html = ''
-    if parts:
-        rows = ''.join(
-            f'''<tr>
-              <td style="border:1px solid #aaa; padding:3px 6px;">{p.get("part_name") or "-"}</td>
-              <td style="border:1px solid #aaa; padding:3px 6px;">{p.get("part_number") or "-"}</td>
-              <td style="border:1px solid #aaa; padding:3px 6px; text-align:center;">{p.get("quantity") or "-"}</td>
-              <td style="border:1px solid #aaa; padding:3px 6px; text-align:right;">{f"{int(p.get('unit_price') or 0):,}" if isinstance(p.get("unit_price"), (int, float)) else "0"}</td>
-              <td style="border:1px solid #aaa; padding:3px 6px; text-align:right; font-weight:bold;">{f"{int(p.get('total_price') or 0):,}" if isinstance(p.get("total_price"), (int, float)) else "0"}</td>
-            </tr>'''
-            for p in parts
-        )
-        parts_html = f'''
-        <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">사용부품 내역</div>
-        <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
-          <thead>
-            <tr style="background:#f0f0f0;">
-              <th style="border:1px solid #aaa; padding:3px 6px; text-align:left;">부품명</th>
-              <th style="border:1px solid #aaa; padding:3px 6px; text-align:left;">부품번호</th>
-              <th style="border:1px solid #aaa; padding:3px 6px; text-align:center; width:60px;">수량</th>
-              <th style="border:1px solid #aaa; padding:3px 6px; text-align:right; width:90px;">단가</th>
-              <th style="border:1px solid #aaa; padding:3px 6px; text-align:right; width:90px;">총액</th>
-            </tr>
-          </thead>
-          <tbody>{rows}</tbody>
-        </table>'''
-
-    # 시간 기록부
-    time_records = r.get('time_records') or []
-    if not time_records and r.get('time_record'):
-        time_records = [r['time_record']]
-    time_html = ''
-    if time_records:
-        def fmt_date(d):
-            if not d: return '-'
-            try:
-                dt = datetime.fromisoformat(str(d).replace('Z', ''))
-                return f"{dt.year}년 {dt.month}월 {dt.day}일"
-            except Exception:
-                return str(d)
-
-        def fmt_time(t):
-            if not t: return '-'
-            s = str(t).strip()
-            # HH:MM:SS → HH:MM
-            if len(s) >= 5 and ':' in s:
-                return s[:5]
-            return s
-
-        rows = ''.join(
-            f'''<tr>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_date(tr.get("date") or tr.get("work_date"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("departure_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_start_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_end_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("travel_end_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_meal_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("travel_meal_time"))}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center; font-weight:bold; color:#1a56db;">{tr.get("calculated_work_time") or "-"}</td>
-              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center; font-weight:bold; color:#1a56db;">{tr.get("calculated_travel_time") or "-"}</td>
-            </tr>'''
-            for tr in time_records
-        )
-        time_html = f'''
-        <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">작업/이동 시간 기록부</div>
-        <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:8.5pt;">
-          <thead>
-            <tr style="background:#f0f0f0;">
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">날짜</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">출발시간</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">작업시작</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">작업종료</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">이동종료</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">식사(작업)</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">식사(이동)</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center; color:#1a56db;">작업시간</th>
-              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center; color:#1a56db;">이동시간</th>
-            </tr>
-          </thead>
-          <tbody>{rows}</tbody>
-        </table>'''
-
-    # 고객 서명
-    sig_html = ''
-    if r.get('has_signature') and r.get('customer_signature'):
-        signed_at = '-'
-        if r.get('customer_signed_at'):
-            try:
-                dt = datetime.fromisoformat(str(r['customer_signed_at']).replace('Z', ''))
-                signed_at = dt.strftime('%Y년 %m월 %d일 %H:%M')
-            except Exception:
-                signed_at = str(r['customer_signed_at'])
-        sig_html = f'''
-        <div style="margin-top:6mm;">
-          <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">고객 서명</div>
-          <table style="width:100%; border-collapse:collapse; font-size:9pt;">
-            <tr>
-              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:middle;">서명자</td>
-              <td style="border:1px solid #aaa; padding:3px 6px; vertical-align:middle;">{r.get("signer_name") or "-"}</td>
-              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:middle;">서명일시</td>
-              <td style="border:1px solid #aaa; padding:3px 6px; vertical-align:middle;">{signed_at}</td>
-            </tr>
-            <tr>
-              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; vertical-align:top;">서명</td>
-              <td colspan="3" style="border:1px solid #aaa; padding:4px 6px;">
-                <img src="{r["customer_signature"]}" style="max-height:60px; max-width:300px;" />
-              </td>
-            </tr>
-          </table>
-        </div>'''
-
-    problem_desc = (r.get('problem_description') or r.get('symptom') or '-').replace('\n', '<br>')
-    solution_desc = (r.get('solution_description') or r.get('details') or '-').replace('\n', '<br>')
-
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<style>
-  @font-face {{
-    font-family: 'NanumGothic';
-    src: local('NanumGothic'), local('나눔고딕'),
-         url('/usr/share/fonts/truetype/nanum/NanumGothic.ttf') format('truetype');
-  }}
-  body {{
-    font-family: 'NanumGothic', 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif;
-    font-size: 10pt;
-    color: #000;
-    margin: 0;
-    padding: 0;
-  }}
-  @page {{
-    size: A4;
-    margin: 10mm 15mm;
-  }}
-</style>
-</head>
-<body>
-  <div>
-    <!-- 헤더 -->
-    <div style="display:flex; align-items:center; justify-content:space-between; margin-bottom:8mm;">
-      {logo_tag}
-      <div style="text-align:center; flex:1;">
-        <h2 style="margin:0; font-size:16pt; letter-spacing:4px;">서비스 리포트</h2>
-        <div style="font-size:9pt; color:#555; margin-top:2mm;">No. {r.get("report_number") or r.get("id")}</div>
-      </div>
-      <div style="width:40px;"></div>
-    </div>
-
-    <!-- 기본 정보 -->
-    <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:18%">서비스 날짜</td>
-        <td style="border:1px solid #aaa; padding:3px 6px; width:22%">{service_date_str}</td>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:15%">서비스담당</td>
-        <td style="border:1px solid #aaa; padding:3px 6px; width:18%">{r.get("technician_name") or "-"}</td>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:12%">동행/지원</td>
-        <td style="border:1px solid #aaa; padding:3px 6px;">{support_tech_names}</td>
-      </tr>
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">고객명</td>
-        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="5">{r.get("customer_name") or "-"}</td>
-      </tr>
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">고객사 주소</td>
-        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="5">{r.get("customer_address") or "-"}</td>
-      </tr>
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">Model</td>
-        <td style="border:1px solid #aaa; padding:3px 6px;">{r.get("machine_model") or "-"}</td>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">SN</td>
-        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="3">{r.get("machine_serial") or "-"}</td>
-      </tr>
-    </table>
-
-    <!-- 작업 내용 -->
-    <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">작업 내용</div>
-    <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:top;">Job Description</td>
-        <td style="border:1px solid #aaa; padding:4px 6px; min-height:20mm;">{problem_desc}</td>
-      </tr>
-      <tr>
-        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; vertical-align:top;">처리 내용</td>
-        <td style="border:1px solid #aaa; padding:4px 6px; min-height:25mm;">{solution_desc}</td>
-      </tr>
-    </table>
-
-    {parts_html}
-    {time_html}
-    {sig_html}
-
-    <div style="margin-top:8mm; border-top:1px solid #ccc; padding-top:4mm; font-size:8pt; color:#777; text-align:right;">
-      출력일: {today_str}
-    </div>
-  </div>
-</body>
-</html>'''
-    return html
-
-
-def _get_service_report_save_info():
-    """시스템 설정에서 서비스리포트 PDF 저장 경로 및 접속 정보 조회"""
-    try:
-        import sqlite3
-        db_path = os.path.join('app', 'database', 'webtranet.db')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(
-            "SELECT key, value FROM system_settings "
-            "WHERE key IN ('service_report_save_path','service_report_save_user','service_report_save_password')"
-        ).fetchall()
-        conn.close()
-        s = {r['key']: r['value'] for r in rows}
-        return {
-            'path':     s.get('service_report_save_path') or None,
-            'username': s.get('service_report_save_user') or None,
-            'password': s.get('service_report_save_password') or None,
-        }
-    except Exception as e:
-        print(f"❌ 서비스리포트 저장 경로 설정 조회 실패: {str(e)}")
-        return {'path': None, 'username': None, 'password': None}
-
-
 @service_report_bp.route('/<int:report_id>/pdf', methods=['GET'])
 @permission_required('service_report')
 def generate_pdf(report_id):
@@ -620,79 +416,17 @@ def generate_pdf(report_id):
         if not report:
             return jsonify({'error': '서비스 리포트를 찾을 수 없습니다.'}), 404
 
-        report_dict = report.to_dict()
-
-        # support_technician_names가 없으면 DB에서 조회
-        if not report_dict.get('support_technician_names'):
-            support_ids = report_dict.get('support_technician_ids') or []
-            if support_ids:
-                conn = get_db_connection()
-                names = []
-                for uid in support_ids:
-                    row = conn.execute('SELECT name FROM users WHERE id=?', (uid,)).fetchone()
-                    if row:
-                        names.append(row['name'])
-                conn.close()
-                report_dict['support_technician_names'] = ', '.join(names) if names else '없음'
-            else:
-                report_dict['support_technician_names'] = '없음'
-
-        html_content = _build_pdf_html(report_dict)
+        report_dict = prepare_report_dict(report)
+        html_content = build_pdf_html(report_dict)
         pdf_bytes = WeasyHTML(string=html_content).write_pdf()
+        filename = report_filename(report_dict)
 
-        # 파일명 생성
-        customer_name = report_dict.get('customer_name') or '고객'
-        report_number = report_dict.get('report_number') or str(report_id)
-        filename = f"서비스리포트-{customer_name}-{report_number}.pdf"
-        filename = ''.join(c for c in filename if c not in r'\/:*?"<>|')
-
-        # 설정된 경로에 저장 (설정이 있는 경우)
-        save_info = _get_service_report_save_info()
+        # 설정된 경로의 월별 폴더에 저장 (설정이 있는 경우)
+        save_info = get_save_info()
         if save_info['path']:
             try:
-                import tempfile
-                from app.utils.smb_utils import is_unc_path, copy_to_target
-
-                # 월별 하위 폴더 생성: {year}년{month:02d}월
-                service_date_str = report_dict.get('service_date') or datetime.now().strftime('%Y-%m-%d')
-                try:
-                    sdate = datetime.strptime(service_date_str[:10], '%Y-%m-%d')
-                except Exception:
-                    sdate = datetime.now()
-                month_folder = f"{sdate.year}년{sdate.month:02d}월"
-
-                base_path = save_info['path']
-                username  = save_info['username']
-                password  = save_info['password']
-
-                if is_unc_path(base_path):
-                    # UNC 경로: 임시 파일에 저장 후 smbclient로 복사
-                    tmp_fd, tmp_path = tempfile.mkstemp(suffix='.pdf', prefix='sr_')
-                    try:
-                        with os.fdopen(tmp_fd, 'wb') as f:
-                            f.write(pdf_bytes)
-
-                        # UNC 경로에서 월 폴더를 포함한 대상 경로 구성
-                        normalized = base_path.replace('\\', '/')
-                        target_path = f"{normalized.rstrip('/')}/{month_folder}/{filename}"
-                        # smb_utils.copy_to_target은 UNC 경로를 처리
-                        target_unc = base_path.rstrip('/\\') + '/' + month_folder + '/' + filename
-                        copy_to_target(tmp_path, target_unc, username=username, password=password)
-                        print(f"✅ 서비스리포트 PDF 저장 완료 (UNC): {target_unc}")
-                    finally:
-                        try:
-                            os.unlink(tmp_path)
-                        except OSError:
-                            pass
-                else:
-                    # 로컬/마운트 경로
-                    save_dir = os.path.join(base_path, month_folder)
-                    os.makedirs(save_dir, exist_ok=True)
-                    save_file_path = os.path.join(save_dir, filename)
-                    with open(save_file_path, 'wb') as f:
-                        f.write(pdf_bytes)
-                    print(f"✅ 서비스리포트 PDF 저장 완료: {save_file_path}")
-
+                saved_path = save_to_configured_folder(pdf_bytes, report_dict, save_info, filename)
+                print(f"✅ 서비스리포트 PDF 저장 완료: {saved_path}")
             except Exception as save_err:
                 # 저장 실패 시 다운로드는 계속 진행 (로그만 기록)
                 print(f"⚠️ 서비스리포트 PDF 파일 저장 실패: {str(save_err)}")
@@ -708,3 +442,62 @@ def generate_pdf(report_id):
         return jsonify({'error': 'WeasyPrint가 설치되어 있지 않습니다.'}), 500
     except Exception as e:
         return jsonify({'error': f'PDF 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+
+
+@service_report_bp.route('/batch-pdf', methods=['POST'])
+@admin_required
+def start_batch_pdf_export():
+    """
+    기간 내 서비스 리포트 PDF 일괄 생성 (관리자만 가능, 백그라운드 실행)
+    body: start_date, end_date (서비스 날짜, YYYY-MM-DD), format=zip|pdf, save_to_folders(기본 true)
+    """
+    try:
+        data = request.get_json() or {}
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        output_format = data.get('format', 'zip')
+        try:
+            datetime.strptime(start_date or '', '%Y-%m-%d')
+            datetime.strptime(end_date or '', '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'error': 'start_date, end_date는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+        if output_format not in EXPORT_FORMATS:
+            return jsonify({'error': f'format은 {", ".join(EXPORT_FORMATS)} 중 하나여야 합니다.'}), 400
+
+        try:
+            job_id = start_export(start_date, end_date, output_format, data.get('save_to_folders', True))
+        except ExportAlreadyRunning as e:
+            return jsonify({'error': '이미 진행 중인 일괄 생성 작업이 있습니다.', 'job_id': e.job_id}), 409
+        return jsonify({'job_id': job_id, 'status': get_export_status(job_id)}), 202
+    except Exception as e:
+        return jsonify({'error': f'일괄 PDF 생성 시작 중 오류가 발생했습니다: {str(e)}'}), 500
+
+
+@service_report_bp.route('/batch-pdf/<job_id>', methods=['GET'])
+@admin_required
+def get_batch_pdf_export(job_id):
+    """일괄 PDF 생성 진행 상황 (total/done/failed, state: queued|running|done|failed)"""
+    status = get_export_status(job_id)
+    if not status:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify({'status': status}), 200
+
+
+@service_report_bp.route('/batch-pdf/<job_id>/download', methods=['GET'])
+@admin_required
+def download_batch_pdf_export(job_id):
+    """완료된 일괄 PDF 결과 (ZIP 또는 병합 PDF) 다운로드"""
+    status = get_export_status(job_id)
+    path = get_export_result_path(job_id)
+    if not path:
+        return jsonify({'error': '다운로드할 결과가 없습니다.', 'status': status}), 404
+
+    is_zip = status['format'] == 'zip'
+    download_name = f"서비스리포트_{status['start_date']}_{status['end_date']}.{'zip' if is_zip else 'pdf'}"
+    return send_file(
+        path,
+        mimetype='application/zip' if is_zip else 'application/pdf',
+        as_attachment=True,
+        download_name=download_name,
+        conditional=True
+    )
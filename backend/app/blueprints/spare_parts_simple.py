@@ -1,11 +1,18 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, Response, stream_with_context
 import sqlite3
 import os
+import io
+import csv
+import json
 from datetime import datetime, date
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from app.utils.etag import conditional_get
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, prefix_range, get_cached_count, invalidate_count_cache
+)
 
 spare_parts_bp = Blueprint('spare_parts', __name__)
 
@@ -81,6 +88,7 @@ def recalculate_stock_from_date(conn, part_number, from_date=None):
     return current_stock
 
 @spare_parts_bp.route('/spare-parts', methods=['GET'])
+@conditional_get('spare_parts', 'price_history')
 def get_spare_parts():
     """스페어파트 목록 조회"""
     try:
@@ -306,6 +314,7 @@ def update_spare_part(part_number):
                 'UPDATE stock_history SET part_number = ? WHERE part_number = ?',
                 (new_part_number, part_number)
             )
+            invalidate_count_cache('transactions')
             conn.execute(
                 'UPDATE price_history SET spare_part_id = spare_part_id WHERE spare_part_id IN (SELECT id FROM spare_parts WHERE part_number = ?)',
                 (part_number,)
@@ -570,7 +579,12 @@ def search_part_by_number(part_number):
 
 @spare_parts_bp.route('/transactions', methods=['GET'])
 def get_all_transactions():
-    """모든 거래 내역 조회"""
+    """
+    모든 거래 내역 조회
+    - page/per_page: 기존 OFFSET 방식 (하위 호환)
+    - cursor: 이전 응답의 next_cursor를 전달하면 (created_at, id) 키셋 방식으로 조회
+    - part_number: 부분 일치 검색, part_number_prefix: 인덱스를 사용하는 접두어 검색
+    """
     try:
         conn = get_db_connection()
         
@@ -578,9 +592,11 @@ def get_all_transactions():
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
         offset = (page - 1) * per_page
+        cursor = request.args.get('cursor', '').strip()
         
         # 필터 파라미터
         part_number_filter = request.args.get('part_number', '')
+        part_number_prefix = request.args.get('part_number_prefix', '').strip()
         transaction_type_filter = request.args.get('transaction_type', '')
         days_filter = request.args.get('days', '')
         
@@ -592,6 +608,11 @@ def get_all_transactions():
         if part_number_filter:
             where_conditions.append("sh.part_number LIKE ?")
             params.append(f'%{part_number_filter}%')
+
+        # 파트번호 접두어 필터 (idx_stock_history_part_number 사용)
+        if part_number_prefix:
+            where_conditions.append("sh.part_number >= ? AND sh.part_number < ?")
+            params.extend(prefix_range(part_number_prefix))
         
         # 거래유형 필터
         if transaction_type_filter:
@@ -609,7 +630,7 @@ def get_all_transactions():
         
         where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
         
-        # 총 개수 조회
+        # 총 개수 조회 (필터별로 캐시, 새 거래가 추가되면 다시 계산)
         count_query = f"""
             SELECT COUNT(*) as total
             FROM stock_history sh
@@ -617,7 +638,26 @@ def get_all_transactions():
             {where_clause}
         """
         
-        total = conn.execute(count_query, params).fetchone()['total']
+        total = get_cached_count(
+            conn, ('transactions', where_clause, tuple(params)), count_query, params,
+            version_query='SELECT MAX(id) FROM stock_history'
+        )
+
+        # 키셋 조건: 이전 페이지 마지막 행보다 뒤의 행만 조회
+        page_conditions = list(where_conditions)
+        page_params = list(params)
+        if cursor:
+            cursor_values = decode_cursor(cursor, 2)
+            if cursor_values is None:
+                conn.close()
+                return jsonify({
+                    'success': False,
+                    'message': '잘못된 cursor 값입니다.'
+                }), 400
+            page_conditions.append("(sh.created_at, sh.id) < (?, ?)")
+            page_params.extend(cursor_values)
+
+        page_where_clause = "WHERE " + " AND ".join(page_conditions) if page_conditions else ""
         
         # 데이터 조회
         data_query = f"""
@@ -636,13 +676,16 @@ def get_all_transactions():
                 sp.price as unit_price
             FROM stock_history sh
             JOIN spare_parts sp ON sh.part_number = sp.part_number
-            {where_clause}
-            ORDER BY sh.created_at DESC
-            LIMIT ? OFFSET ?
+            {page_where_clause}
+            ORDER BY sh.created_at DESC, sh.id DESC
+            LIMIT ?
         """
         
-        params.extend([per_page, offset])
-        transactions_raw = conn.execute(data_query, params).fetchall()
+        page_params.append(per_page)
+        if not cursor:
+            data_query += " OFFSET ?"
+            page_params.append(offset)
+        transactions_raw = conn.execute(data_query, page_params).fetchall()
         conn.close()
         
         # 결과 포맷팅
@@ -671,6 +714,12 @@ def get_all_transactions():
             })
         
         pages = (total + per_page - 1) // per_page
+
+        # 다음 페이지 커서 (마지막 행 기준)
+        next_cursor = None
+        if len(transactions_raw) == per_page:
+            last = transactions_raw[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
         
         return jsonify({
             'success': True,
@@ -679,7 +728,8 @@ def get_all_transactions():
                 'page': page,
                 'pages': pages,
                 'per_page': per_page,
-                'total': total
+                'total': total,
+                'next_cursor': next_cursor
             }
         })
         
@@ -743,6 +793,147 @@ def get_spare_parts_history():
             'error': str(e)
         }), 500
 
+# 입출고 내역 내보내기 컬럼 (NDJSON 키 / CSV 헤더 순서)
+HISTORY_EXPORT_COLUMNS = [
+    'id', 'part_number', 'part_name', 'transaction_type', 'quantity',
+    'previous_stock', 'new_stock', 'transaction_date', 'created_at',
+    'created_by', 'reference_number', 'customer_name'
+]
+
+# 한 번에 DB에서 가져와 응답으로 내보내는 행 수
+HISTORY_EXPORT_BATCH_SIZE = 1000
+
+@spare_parts_bp.route('/spare-parts/history/export', methods=['GET'])
+@jwt_required()
+def export_spare_parts_history():
+    """
+    스페어파트 입출고 내역 스트리밍 내보내기
+    전체 결과를 메모리에 올리지 않고 커서에서 배치 단위로 읽어 바로 전송한다.
+
+    Query Parameters:
+        format: ndjson (기본값) 또는 csv
+        start_date, end_date: 거래일 범위 (YYYY-MM-DD, 양 끝 포함)
+        part_number: 파트번호 (정확히 일치)
+        part_number_prefix: 파트번호 접두어
+        transaction_type: IN 또는 OUT
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            return jsonify({
+                'success': False,
+                'error': 'format은 ndjson 또는 csv만 지원합니다.'
+            }), 400
+
+        start_date = request.args.get('start_date', '').strip()
+        end_date = request.args.get('end_date', '').strip()
+        part_number = request.args.get('part_number', '').strip()
+        part_number_prefix = request.args.get('part_number_prefix', '').strip()
+        transaction_type = request.args.get('transaction_type', '').strip().upper()
+
+        for value in (start_date, end_date):
+            if value:
+                try:
+                    datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    return jsonify({
+                        'success': False,
+                        'error': '날짜 형식은 YYYY-MM-DD 입니다.'
+                    }), 400
+
+        where_conditions = []
+        params = []
+
+        if start_date:
+            where_conditions.append('sh.transaction_date >= ?')
+            params.append(start_date)
+        if end_date:
+            where_conditions.append('sh.transaction_date <= ?')
+            params.append(end_date)
+        if part_number:
+            where_conditions.append('sh.part_number = ?')
+            params.append(part_number)
+        if part_number_prefix:
+            where_conditions.append('sh.part_number >= ? AND sh.part_number < ?')
+            params.extend(prefix_range(part_number_prefix))
+        if transaction_type in ('IN', 'OUT'):
+            where_conditions.append('sh.transaction_type = ?')
+            params.append(transaction_type)
+
+        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+
+        query = f'''
+            SELECT
+                sh.id,
+                sh.part_number,
+                sp.part_name,
+                sh.transaction_type,
+                sh.quantity,
+                sh.previous_stock,
+                sh.new_stock,
+                sh.transaction_date,
+                sh.created_at,
+                sh.created_by,
+                sh.reference_number,
+                sh.customer_name
+            FROM stock_history sh
+            LEFT JOIN spare_parts sp ON sh.part_number = sp.part_number
+            {where_clause}
+            ORDER BY sh.transaction_date ASC, sh.created_at ASC, sh.id ASC
+        '''
+
+        def generate():
+            # 연결은 응답을 보내기 시작할 때 열고 끝나면 닫는다
+            # (응답 객체가 만들어지고 전송되지 않는 경우에도 연결이 남지 않도록)
+            conn = get_db_connection()
+            try:
+                cursor = conn.execute(query, params)
+                if export_format == 'csv':
+                    # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+                    header = io.StringIO()
+                    csv.writer(header).writerow(HISTORY_EXPORT_COLUMNS)
+                    yield '\ufeff' + header.getvalue()
+
+                while True:
+                    rows = cursor.fetchmany(HISTORY_EXPORT_BATCH_SIZE)
+                    if not rows:
+                        break
+
+                    if export_format == 'csv':
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        for row in rows:
+                            writer.writerow([row[col] for col in HISTORY_EXPORT_COLUMNS])
+                        yield buffer.getvalue()
+                    else:
+                        yield ''.join(
+                            json.dumps({col: row[col] for col in HISTORY_EXPORT_COLUMNS},
+                                       ensure_ascii=False) + '\n'
+                            for row in rows
+                        )
+            finally:
+                conn.close()
+
+        period = f"{start_date or 'all'}_{end_date or 'all'}"
+        if export_format == 'csv':
+            mimetype = 'text/csv; charset=utf-8'
+            filename = f'stock_history_{period}.csv'
+        else:
+            mimetype = 'application/x-ndjson'
+            filename = f'stock_history_{period}.ndjson'
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @spare_parts_bp.route('/spare-parts/<int:part_id>/stock', methods=['POST'])
 def update_stock(part_id):
     """부품 재고 입출고 처리"""
@@ -2136,6 +2327,7 @@ def delete_stock_history(history_id):
 
             # 입출고 내역 삭제
             conn.execute('DELETE FROM stock_history WHERE id = ?', (history_id,))
+            invalidate_count_cache('transactions')
 
             # 삭제된 거래의 날짜부터 재고 재계산
             recalculate_stock_from_date(conn, part_number, transaction_date)
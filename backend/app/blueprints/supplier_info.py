@@ -3,6 +3,7 @@ import sqlite3
 import os
 from datetime import datetime
 from flask_jwt_extended import jwt_required
+from app.utils.etag import conditional_get
 
 supplier_info_bp = Blueprint('supplier_info', __name__)
 
@@ -15,6 +16,7 @@ def get_db_connection():
 
 @supplier_info_bp.route('/admin/supplier-info', methods=['GET'])
 @jwt_required()
+@conditional_get('supplier_info')
 def get_supplier_info():
     """공급자 정보 조회"""
     try:
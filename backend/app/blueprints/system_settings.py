@@ -6,6 +6,7 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.utils.timezone import get_kst_now
+from app.utils.etag import conditional_get
 import sys
 import sqlite3
 
@@ -997,16 +998,74 @@ def test_service_report_save_path():
         return jsonify({'success': False, 'logs': [f'❌ 테스트 중 오류: {str(e)}']})
 
 
+@system_settings_bp.route('/system/upload-queue', methods=['GET'])
+@jwt_required()
+def get_upload_queue():
+    """네트워크 공유 업로드 대기 현황 조회 (관리자 전용)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.get_by_id(current_user_id)
+
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'message': '관리자만 접근할 수 있습니다.'
+            }), 403
+
+        from app.utils.upload_spool import get_status
+        limit = request.args.get('limit', 100, type=int)
+        return jsonify({'success': True, **get_status(limit)}), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'업로드 대기 현황 조회 실패: {str(e)}'
+        }), 500
+
+
+@system_settings_bp.route('/system/upload-queue/retry', methods=['POST'])
+@jwt_required()
+def retry_upload_queue():
+    """실패한 업로드 재시도 (관리자 전용, id 미지정 시 전체)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.get_by_id(current_user_id)
+
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'message': '관리자만 접근할 수 있습니다.'
+            }), 403
+
+        from app.utils.upload_spool import retry_failed
+        data = request.get_json(silent=True) or {}
+        count = retry_failed(data.get('id'))
+        return jsonify({
+            'success': True,
+            'message': f'{count}건의 업로드를 다시 시도합니다.',
+            'count': count
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'업로드 재시도 실패: {str(e)}'
+        }), 500
+
+LOGO_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'LVD Logo_default.jpg')
+)
+
+
 @system_settings_bp.route('/system/logo', methods=['GET'])
 @jwt_required()
+@conditional_get(files=[LOGO_PATH])
 def get_logo():
     """회사 로고 이미지를 base64로 반환"""
     import base64
-    logo_path = os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'LVD Logo_default.jpg')
-    logo_path = os.path.abspath(logo_path)
-    if not os.path.exists(logo_path):
+    if not os.path.exists(LOGO_PATH):
         return jsonify({'success': False, 'message': '로고 파일이 없습니다.'}), 404
-    with open(logo_path, 'rb') as f:
+    with open(LOGO_PATH, 'rb') as f:
         encoded = base64.b64encode(f.read()).decode('utf-8')
     return jsonify({'success': True, 'data': f'data:image/jpeg;base64,{encoded}'})
 
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.user import User
 from app.utils.auth import admin_required, get_current_user
+from app.utils.etag import conditional_get
 
 user_mgmt_bp = Blueprint('user_management', __name__)
 
@@ -20,6 +21,7 @@ def get_all_users():
         return jsonify({'error': f'사용자 목록 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
 @user_mgmt_bp.route('/technicians', methods=['GET'])
+@conditional_get('users')
 def get_technicians():
     """기술부 직원 목록 조회"""
     try:
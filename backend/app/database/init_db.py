@@ -11,6 +11,26 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row
     return conn
 
+# IN (...) 조회 한 번에 넣는 ID 수 (SQLite 바인드 변수 개수 제한 이하)
+IN_QUERY_CHUNK_SIZE = 500
+
+def fetch_in_chunks(conn, query, ids):
+    """
+    ID 목록을 IN_QUERY_CHUNK_SIZE개씩 나누어 조회한 행을 차례로 반환합니다.
+
+    Args:
+        conn: 데이터베이스 연결
+        query: IN 조건 자리에 {placeholders}가 있는 쿼리 (예: WHERE id IN ({placeholders}))
+        ids: 조회할 ID 목록
+
+    Returns:
+        generator: sqlite3.Row (정렬은 덩어리 안에서만 보장)
+    """
+    ids = list(ids)
+    for i in range(0, len(ids), IN_QUERY_CHUNK_SIZE):
+        chunk = ids[i:i + IN_QUERY_CHUNK_SIZE]
+        yield from conn.execute(query.format(placeholders=','.join('?' * len(chunk))), chunk).fetchall()
+
 def init_database():
     """데이터베이스와 테이블을 초기화합니다."""
     conn = get_db_connection()
@@ -265,12 +285,64 @@ def init_database():
     except sqlite3.OperationalError:
         pass
 
-    # service_reports: 고객 서명 (base64 이미지)
-    try:
-        conn.execute('ALTER TABLE service_reports ADD COLUMN customer_signature TEXT')
-        print("Added customer_signature column to service_reports table")
-    except sqlite3.OperationalError:
-        pass
+    # 고객 서명 이미지 (목록 쿼리가 이미지를 읽지 않도록 service_reports와 분리)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS service_report_signatures (
+            service_report_id INTEGER PRIMARY KEY,
+            mime_type TEXT NOT NULL,
+            image BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (service_report_id) REFERENCES service_reports (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # 기존 service_reports.customer_signature(base64 data URL) → service_report_signatures 이전 후 컬럼 삭제
+    sr_columns = [row[1] for row in conn.execute('PRAGMA table_info(service_reports)').fetchall()]
+    if 'customer_signature' in sr_columns:
+        import base64 as _base64
+        rows = conn.execute('''
+            SELECT id, customer_signature, customer_signed_at FROM service_reports
+            WHERE customer_signature IS NOT NULL AND customer_signature != ''
+        ''').fetchall()
+        failed_ids = []
+        for row in rows:
+            header, sep, payload = row['customer_signature'].partition(',')
+            if not sep or not header.startswith('data:') or not header.endswith(';base64'):
+                failed_ids.append(row['id'])
+                continue
+            mime_type = header[len('data:'):-len(';base64')] or 'image/png'
+            try:
+                image = _base64.b64decode(payload, validate=True)
+            except ValueError:
+                failed_ids.append(row['id'])
+                continue
+            if not image:
+                failed_ids.append(row['id'])
+                continue
+            conn.execute('''
+                INSERT OR IGNORE INTO service_report_signatures (service_report_id, mime_type, image, created_at)
+                VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (row['id'], mime_type, sqlite3.Binary(image), row['customer_signed_at']))
+            # 이미 이전된 서명(INSERT OR IGNORE)도 비어 있지 않은지 확인
+            copied = conn.execute(
+                'SELECT length(image) FROM service_report_signatures WHERE service_report_id = ?',
+                (row['id'],)
+            ).fetchone()
+            if not copied or not copied[0]:
+                failed_ids.append(row['id'])
+
+        if failed_ids:
+            # 하나라도 이전하지 못했으면 원본 컬럼을 그대로 둔다 (다음 실행 때 다시 시도)
+            print(f"[WARNING] 서비스 리포트 서명 {len(failed_ids)}건 이전 실패 (id: {failed_ids[:20]}) "
+                  f"- customer_signature 컬럼을 유지합니다")
+        else:
+            try:
+                conn.execute('ALTER TABLE service_reports DROP COLUMN customer_signature')
+            except sqlite3.OperationalError:
+                # DROP COLUMN 미지원(SQLite 3.35 미만)이면 값만 비움
+                conn.execute('UPDATE service_reports SET customer_signature = NULL')
+        conn.commit()
+        print(f"Moved {len(rows) - len(failed_ids)} customer signatures to service_report_signatures table")
 
     # service_reports: 고객 서명 일시
     try:
@@ -299,12 +371,6 @@ def init_database():
     except Exception as e:
         print(f"[WARNING] public_token backfill failed: {e}")
 
-    # invoice_codes 테이블에 category 컬럼 추가 (마이그레이션)
-    try:
-        conn.execute('ALTER TABLE invoice_codes ADD COLUMN category TEXT DEFAULT NULL')
-    except sqlite3.OperationalError:
-        pass  # 컬럼이 이미 존재함
-    
     # 거래명세표 요율 설정 테이블 생성
     conn.execute('''
         CREATE TABLE IF NOT EXISTS invoice_rates (
@@ -423,6 +489,10 @@ def init_database():
         )
     ''')
     
+    # 고객별 리소스 / 리소스별 최신 관리 이력 조회 인덱스
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resources_customer_id ON resources(customer_id, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resource_management_history_resource ON resource_management_history(resource_id, changed_at)')
+
     # Invoice 코드 테이블 생성
     conn.execute('''
         CREATE TABLE IF NOT EXISTS invoice_codes (
@@ -434,6 +504,32 @@ def init_database():
         )
     ''')
 
+    # invoice_codes 테이블에 category 컬럼 추가 (마이그레이션, 새 DB도 테이블 생성 후 추가되도록 여기서 실행)
+    try:
+        conn.execute('ALTER TABLE invoice_codes ADD COLUMN category TEXT DEFAULT NULL')
+    except sqlite3.OperationalError:
+        pass  # 컬럼이 이미 존재함
+
+    # invoices 테이블에 invoice_code_id 컬럼 추가 (마이그레이션)
+    try:
+        conn.execute('ALTER TABLE invoices ADD COLUMN invoice_code_id INTEGER REFERENCES invoice_codes(id)')
+    except sqlite3.OperationalError:
+        pass  # 컬럼이 이미 존재함
+
+    # invoices 테이블에 잠금 / 계산서 발행 상태 컬럼 추가 (add_invoice_lock_and_status.py와 동일)
+    for column_sql in ('is_locked INTEGER DEFAULT 0', 'locked_by INTEGER', 'locked_at TEXT',
+                       "bill_status TEXT DEFAULT 'pending'", 'bill_issued_at TEXT', 'bill_issued_by INTEGER'):
+        try:
+            conn.execute(f'ALTER TABLE invoices ADD COLUMN {column_sql}')
+        except sqlite3.OperationalError:
+            pass  # 컬럼이 이미 존재함
+
+    # service_reports 테이블에 support_technician_ids 컬럼 추가 (지원 기술자 ID JSON 배열)
+    try:
+        conn.execute('ALTER TABLE service_reports ADD COLUMN support_technician_ids TEXT')
+    except sqlite3.OperationalError:
+        pass  # 컬럼이 이미 존재함
+
     # 스페어파트 테이블 생성
     conn.execute('''
         CREATE TABLE IF NOT EXISTS spare_parts (
@@ -515,8 +611,327 @@ def init_database():
         )
     ''')
 
+    # 고객 상호 별칭 테이블 (현재 상호 + 과거 상호, 검색용 정규화 테이블)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS customer_aliases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            is_current BOOLEAN DEFAULT 0,
+            FOREIGN KEY (customer_id) REFERENCES customers (id) ON DELETE CASCADE,
+            UNIQUE(customer_id, name)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_customer_aliases_name ON customer_aliases(name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_customer_aliases_customer_id ON customer_aliases(customer_id)')
+
+    # 부분 일치 검색용 FTS5 trigram 인덱스 (SQLite 3.34 이상에서만 지원)
+    try:
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='customer_aliases_fts'"
+        ).fetchone()
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS customer_aliases_fts USING fts5(
+                name, content='customer_aliases', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS customer_aliases_fts_ai AFTER INSERT ON customer_aliases BEGIN
+                INSERT INTO customer_aliases_fts(rowid, name) VALUES (new.id, new.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS customer_aliases_fts_ad AFTER DELETE ON customer_aliases BEGIN
+                INSERT INTO customer_aliases_fts(customer_aliases_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS customer_aliases_fts_au AFTER UPDATE ON customer_aliases BEGIN
+                INSERT INTO customer_aliases_fts(customer_aliases_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO customer_aliases_fts(rowid, name) VALUES (new.id, new.name);
+            END
+        ''')
+        if not fts_exists:
+            conn.execute("INSERT INTO customer_aliases_fts(customer_aliases_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        print(f"[WARNING] customer_aliases_fts not available: {e}")
+
+    # 별칭이 없는 고객의 상호/과거 상호를 customer_aliases로 이관
+    import json as _json
+    rows = conn.execute('''
+        SELECT id, company_name, past_company_names FROM customers
+        WHERE id NOT IN (SELECT customer_id FROM customer_aliases)
+    ''').fetchall()
+    if rows:
+        for row in rows:
+            try:
+                past = _json.loads(row['past_company_names']) if row['past_company_names'] else []
+            except (ValueError, TypeError):
+                past = []
+            names = [(row['company_name'] or '').strip()]
+            names += [str(n).strip() for n in past if isinstance(past, list) and n]
+            for idx, name in enumerate(names):
+                if name:
+                    conn.execute(
+                        'INSERT OR IGNORE INTO customer_aliases (customer_id, name, is_current) VALUES (?, ?, ?)',
+                        (row['id'], name, 1 if idx == 0 else 0)
+                    )
+        print(f"Backfilled customer_aliases for {len(rows)} customers")
+
+    # 서비스 리포트 전문 검색 FTS5 trigram 인덱스 (rowid = service_reports.id)
+    # 고객명은 현재/과거 상호를 모두 넣어 과거 상호로도 검색되도록 한다.
+    customer_names_sql = '''COALESCE(
+        (SELECT group_concat(name, ' ') FROM customer_aliases WHERE customer_id = {ref}),
+        (SELECT company_name FROM customers WHERE id = {ref}), '')'''
+    fts_insert_sql = f'''
+        INSERT INTO service_reports_fts(rowid, report_number, machine_model, machine_serial,
+                                        problem_description, solution_description, customer_name)
+        VALUES (new.id, new.report_number, new.machine_model, new.machine_serial,
+                new.problem_description, new.solution_description,
+                {customer_names_sql.format(ref='new.customer_id')});
+    '''
+    try:
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='service_reports_fts'"
+        ).fetchone()
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS service_reports_fts USING fts5(
+                report_number, machine_model, machine_serial,
+                problem_description, solution_description, customer_name,
+                tokenize='trigram'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS service_reports_fts_ai AFTER INSERT ON service_reports BEGIN
+                {fts_insert_sql}
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS service_reports_fts_ad AFTER DELETE ON service_reports BEGIN
+                DELETE FROM service_reports_fts WHERE rowid = old.id;
+            END
+        ''')
+        # 잠금/서명 등 검색 대상이 아닌 컬럼 변경 시에는 인덱스를 건드리지 않음
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS service_reports_fts_au
+            AFTER UPDATE OF report_number, machine_model, machine_serial, problem_description,
+                            solution_description, customer_id ON service_reports BEGIN
+                DELETE FROM service_reports_fts WHERE rowid = old.id;
+                {fts_insert_sql}
+            END
+        ''')
+        # 고객 상호 변경 (Customer.save가 customer_aliases를 다시 작성)
+        for event, ref in (('INSERT', 'new'), ('DELETE', 'old')):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS service_reports_fts_alias_{event.lower()}
+                AFTER {event} ON customer_aliases BEGIN
+                    UPDATE service_reports_fts
+                    SET customer_name = {customer_names_sql.format(ref=f'{ref}.customer_id')}
+                    WHERE rowid IN (SELECT id FROM service_reports WHERE customer_id = {ref}.customer_id);
+                END
+            ''')
+        if not fts_exists:
+            conn.execute(f'''
+                INSERT INTO service_reports_fts(rowid, report_number, machine_model, machine_serial,
+                                                problem_description, solution_description, customer_name)
+                SELECT id, report_number, machine_model, machine_serial,
+                       problem_description, solution_description,
+                       {customer_names_sql.format(ref='service_reports.customer_id')}
+                FROM service_reports
+            ''')
+            conn.commit()
+    except sqlite3.OperationalError as e:
+        print(f"[WARNING] service_reports_fts not available: {e}")
+
+    # 고객 디렉토리 검색 FTS5 trigram 인덱스 (rowid = customers.id)
+    # 과거 상호는 customer_aliases(is_current=0), 전화는 phone/tel/mobile을 한 컬럼에 모은다.
+    customer_past_names_sql = '''COALESCE(
+        (SELECT group_concat(name, ' ') FROM customer_aliases WHERE customer_id = {ref} AND is_current = 0), '')'''
+    customer_fts_insert_sql = f'''
+        INSERT INTO customers_fts(rowid, company_name, past_names, contact_person, email, phone, address)
+        VALUES (new.id, new.company_name, {customer_past_names_sql.format(ref='new.id')}, new.contact_person, new.email,
+                COALESCE(new.phone, '') || ' ' || COALESCE(new.tel, '') || ' ' || COALESCE(new.mobile, ''), new.address);
+    '''
+    try:
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='customers_fts'"
+        ).fetchone()
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                company_name, past_names, contact_person, email, phone, address, tokenize='trigram'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+                {customer_fts_insert_sql}
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+                DELETE FROM customers_fts WHERE rowid = old.id;
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS customers_fts_au
+            AFTER UPDATE OF company_name, contact_person, email, phone, tel, mobile, address ON customers BEGIN
+                DELETE FROM customers_fts WHERE rowid = old.id;
+                {customer_fts_insert_sql}
+            END
+        ''')
+        for event, ref in (('INSERT', 'new'), ('DELETE', 'old')):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS customers_fts_alias_{event.lower()}
+                AFTER {event} ON customer_aliases BEGIN
+                    UPDATE customers_fts
+                    SET past_names = {customer_past_names_sql.format(ref=f'{ref}.customer_id')}
+                    WHERE rowid = {ref}.customer_id;
+                END
+            ''')
+        if not fts_exists:
+            conn.execute(f'''
+                INSERT INTO customers_fts(rowid, company_name, past_names, contact_person, email, phone, address)
+                SELECT id, company_name, {customer_past_names_sql.format(ref='customers.id')}, contact_person, email,
+                       COALESCE(phone, '') || ' ' || COALESCE(tel, '') || ' ' || COALESCE(mobile, ''), address
+                FROM customers
+            ''')
+            conn.commit()
+    except sqlite3.OperationalError as e:
+        print(f"[WARNING] customers_fts not available: {e}")
+    # 고객 디렉토리 키셋 페이지네이션 (company_name, id)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_customers_company_name_id ON customers(company_name, id)')
+
+    # 문서 번호 시퀀스 테이블 (거래명세표/서비스 리포트 일련번호 발급)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS document_sequences (
+            doc_type TEXT NOT NULL,
+            prefix TEXT NOT NULL,
+            last_number INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (doc_type, prefix)
+        )
+    ''')
+
+    # 월별 매출 집계 테이블 (YTD Summary용, 계산서 발행/취소 시 갱신)
+    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='revenue_rollup'")
+    rollup_exists = cursor.fetchone() is not None
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS revenue_rollup (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            item_type TEXT NOT NULL,
+            hours REAL NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (year, month, category, item_type)
+        )
+    ''')
+    if not rollup_exists:
+        try:
+            from app.models.revenue_rollup import RevenueRollup
+            print(f"Built revenue_rollup ({RevenueRollup.rebuild(conn)} rows)")
+        except sqlite3.OperationalError as e:
+            # bill_status / invoice_code_id 마이그레이션 이전 DB: 관리자 재생성 API로 나중에 생성
+            print(f"revenue_rollup 초기 집계 생략: {e}")
+
+    # 네트워크 공유 업로드 스풀 (write-behind, app/utils/upload_spool.py)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS upload_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            spool_path TEXT NOT NULL,
+            target_path TEXT NOT NULL,
+            target_key TEXT NOT NULL,
+            credentials_key TEXT,
+            file_size INTEGER,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL,
+            claimed_at REAL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            uploaded_at TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_upload_queue_status ON upload_queue(status, next_attempt_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_upload_queue_target_key ON upload_queue(target_key)')
+    # 접속 정보는 큐에 저장하지 않고 업로드 시점에 시스템 설정에서 조회 (credentials_key)
+    try:
+        conn.execute('ALTER TABLE upload_queue ADD COLUMN credentials_key TEXT')
+        print("Added credentials_key column to upload_queue table")
+    except sqlite3.OperationalError:
+        pass
+    try:
+        cleared = conn.execute('''
+            UPDATE upload_queue SET username = NULL, password = NULL
+            WHERE username IS NOT NULL OR password IS NOT NULL
+        ''').rowcount
+        if cleared:
+            print(f"Cleared stored SMB credentials from {cleared} upload_queue rows")
+    except sqlite3.OperationalError:
+        pass  # username/password 컬럼이 없는 새 DB
+
+    # 거래명세표 / 서비스 리포트 고객 검색 조인용 인덱스
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_invoices_customer_id ON invoices(customer_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_invoices_issue_date ON invoices(issue_date)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_service_reports_customer_id ON service_reports(customer_id)')
+
+    # 서비스 리포트 목록의 사용부품/시간기록 일괄 조회(IN) 인덱스
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_service_report_parts_report_id ON service_report_parts(service_report_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_service_report_time_records_report_id ON service_report_time_records(service_report_id, work_date)')
+
+    # service_report_time_records: 계산된 작업/이동시간 (분) - 집계 시 HH:MM 문자열 파싱 없이 SUM
+    for column in ('work_minutes', 'travel_minutes'):
+        try:
+            conn.execute(f'ALTER TABLE service_report_time_records ADD COLUMN {column} INTEGER')
+            print(f"Added {column} column to service_report_time_records table")
+        except sqlite3.OperationalError:
+            pass
+    # 기존 HH:MM 값 백필 (값이 없거나 형식이 다른 행은 NULL 유지)
+    for column, source in (('work_minutes', 'calculated_work_time'), ('travel_minutes', 'calculated_travel_time')):
+        cursor = conn.execute(f'''
+            UPDATE service_report_time_records
+            SET {column} = CAST(substr({source}, 1, instr({source}, ':') - 1) AS INTEGER) * 60
+                         + CAST(substr({source}, instr({source}, ':') + 1) AS INTEGER)
+            WHERE {column} IS NULL AND {source} GLOB '*[0-9]:[0-9][0-9]'
+        ''')
+        if cursor.rowcount:
+            print(f"Backfilled {column} for {cursor.rowcount} time records")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_service_report_time_records_work_date ON service_report_time_records(work_date)')
+
+    # 명함 OCR 결과 캐시 (원본 이미지 SHA-256 기준, 같은 명함 재업로드 시 OCR 생략)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS business_card_ocr_cache (
+            content_hash TEXT PRIMARY KEY,
+            raw_text TEXT NOT NULL,
+            parsed_data TEXT NOT NULL,
+            parser_version INTEGER NOT NULL,
+            image_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # stock_history 인덱스 (거래내역 키셋 페이지네이션 / 파트번호 접두어 검색 / 거래일순 내보내기)
+    try:
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_stock_history_created_at_id
+            ON stock_history(created_at DESC, id DESC)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_stock_history_part_number
+            ON stock_history(part_number)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_stock_history_transaction_date
+            ON stock_history(transaction_date, created_at, id)
+        ''')
+    except sqlite3.OperationalError:
+        pass  # stock_history 테이블이 아직 없음
+
+    # 조건부 GET(ETag)용 테이블 버전 카운터와 트리거
+    from app.utils.etag import install_version_triggers
+    install_version_triggers(conn)
+
     conn.commit()
-    
+
     # 초기 데이터 삽입
     create_initial_data(conn)
     
@@ -0,0 +1,69 @@
+"""
+명함 OCR 결과 캐시
+원본 이미지 바이트의 SHA-256을 키로 OCR 텍스트와 파싱 결과를 보관한다.
+파싱 규칙이 바뀌면 parser_version이 달라지므로 저장된 OCR 텍스트로 다시 파싱만 한다.
+"""
+import hashlib
+import json
+
+from app.database.init_db import get_db_connection
+
+RETENTION = '-180 days'  # 이 기간 동안 다시 쓰이지 않은 항목은 저장 시 정리
+
+
+class BusinessCardOcrCache:
+    @staticmethod
+    def content_hash(image_bytes):
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    @classmethod
+    def get(cls, content_hash):
+        """
+        캐시 조회 (사용 시각 갱신)
+
+        Returns:
+            dict: raw_text, parsed_data(dict), parser_version, image_path — 없으면 None
+        """
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                UPDATE business_card_ocr_cache SET last_used_at = CURRENT_TIMESTAMP
+                WHERE content_hash = ?
+                RETURNING raw_text, parsed_data, parser_version, image_path
+            ''', (content_hash,)).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        return {
+            'raw_text': row['raw_text'],
+            'parsed_data': json.loads(row['parsed_data']),
+            'parser_version': row['parser_version'],
+            'image_path': row['image_path'],
+        }
+
+    @classmethod
+    def save(cls, content_hash, raw_text, parsed_data, parser_version, image_path):
+        """캐시 저장 (같은 해시가 있으면 덮어씀)"""
+        conn = get_db_connection()
+        try:
+            conn.execute('''
+                INSERT INTO business_card_ocr_cache
+                    (content_hash, raw_text, parsed_data, parser_version, image_path)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(content_hash) DO UPDATE SET
+                    raw_text = excluded.raw_text,
+                    parsed_data = excluded.parsed_data,
+                    parser_version = excluded.parser_version,
+                    image_path = excluded.image_path,
+                    last_used_at = CURRENT_TIMESTAMP
+            ''', (content_hash, raw_text, json.dumps(parsed_data, ensure_ascii=False),
+                  parser_version, image_path))
+            conn.execute(
+                "DELETE FROM business_card_ocr_cache WHERE last_used_at < datetime('now', ?)",
+                (RETENTION,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
@@ -1,4 +1,5 @@
 from app.database.init_db import get_db_connection
+from app.utils.business_card_thumbnails import thumbnail_url
 from datetime import datetime
 import json
 
@@ -45,31 +46,35 @@ class Customer:
             self.past_company_names = []
         self.created_at = created_at
         self.updated_at = updated_at
+        self._service_reports_count = None  # 목록 쿼리에서 함께 조회한 경우
     
     @classmethod
     def get_all(cls, page=1, per_page=None):
-        """모든 고객 정보 조회 (페이징)"""
+        """모든 고객 정보 조회 (페이징, 서비스 리포트 수 포함)"""
         conn = get_db_connection()
+        query = '''
+            SELECT c.*, (SELECT COUNT(*) FROM service_reports sr
+                         WHERE sr.customer_id = c.id) AS service_reports_count
+            FROM customers c
+            ORDER BY c.company_name ASC
+        '''
         
         if per_page is None:
             # 제한 없이 모든 데이터 반환
-            customers_data = conn.execute('''
-                SELECT * FROM customers 
-                ORDER BY company_name ASC
-            ''').fetchall()
+            customers_data = conn.execute(query).fetchall()
         else:
             # 페이징 적용
             offset = (page - 1) * per_page
-            customers_data = conn.execute('''
-                SELECT * FROM customers 
-                ORDER BY company_name ASC
-                LIMIT ? OFFSET ?
-            ''', (per_page, offset)).fetchall()
+            customers_data = conn.execute(query + ' LIMIT ? OFFSET ?', (per_page, offset)).fetchall()
         
         total = conn.execute('SELECT COUNT(*) FROM customers').fetchone()[0]
         conn.close()
         
-        customers = [cls._from_db_row(data) for data in customers_data]
+        customers = []
+        for data in customers_data:
+            customer = cls._from_db_row(data)
+            customer._service_reports_count = data['service_reports_count']
+            customers.append(customer)
         return customers, total
     
     @classmethod
@@ -100,51 +105,134 @@ class Customer:
     
     @classmethod
     def search(cls, keyword=None, page=1, per_page=None):
-        """고객 정보 검색"""
+        """고객 정보 검색 (검색 조건은 _directory_filter 참고)"""
         conn = get_db_connection()
-        
-        if keyword:
-            keyword_param = f'%{keyword}%'
-            where_clause = '''
-                company_name LIKE ? OR contact_person LIKE ?
-                OR email LIKE ? OR phone LIKE ? OR address LIKE ?
-                OR past_company_names LIKE ?
-            '''
-            if per_page is None:
-                query = f'SELECT * FROM customers WHERE {where_clause} ORDER BY company_name ASC'
-                params = [keyword_param] * 6
-                customers_data = conn.execute(query, params).fetchall()
-            else:
-                offset = (page - 1) * per_page
-                query = f'SELECT * FROM customers WHERE {where_clause} ORDER BY company_name ASC LIMIT ? OFFSET ?'
-                params = [keyword_param] * 6 + [per_page, offset]
-                customers_data = conn.execute(query, params).fetchall()
+        try:
+            from_sql, where, params = cls._directory_filter(conn, keyword)
+            where_sql = ' AND '.join(where) if where else '1=1'
+            query = f'SELECT c.* FROM {from_sql} WHERE {where_sql} ORDER BY c.company_name ASC'
+            if per_page is not None:
+                query += ' LIMIT ? OFFSET ?'
+                params = params + [per_page, (page - 1) * per_page]
+            customers_data = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
 
-            count_query = f'SELECT COUNT(*) FROM customers WHERE {where_clause}'
-            total = conn.execute(count_query, [keyword_param] * 6).fetchone()[0]
-        else:
-            if per_page is None:
-                # 제한 없이 모든 데이터 반환
-                customers_data = conn.execute('''
-                    SELECT * FROM customers 
-                    ORDER BY company_name ASC
-                ''').fetchall()
-            else:
-                # 페이징 적용
-                offset = (page - 1) * per_page
-                customers_data = conn.execute('''
-                    SELECT * FROM customers 
-                    ORDER BY company_name ASC
-                    LIMIT ? OFFSET ?
-                ''', (per_page, offset)).fetchall()
-            
-            total = conn.execute('SELECT COUNT(*) FROM customers').fetchone()[0]
-        
-        conn.close()
-        
         customers = [cls._from_db_row(data) for data in customers_data]
-        return customers, total
-    
+        return customers, cls.count_directory(keyword)
+
+    @classmethod
+    def _directory_filter(cls, conn, keyword):
+        """
+        고객 디렉토리 검색 조건: 공백으로 나눈 단어를 모두 포함 (현재/과거 상호, 담당자, 이메일, 전화, 주소)
+        3글자 이상 단어는 customers_fts(trigram) MATCH, 짧은 단어는 인덱스 행 LIKE로 거른다.
+
+        Returns:
+            tuple: (FROM 절, WHERE 조건 리스트, 파라미터 리스트)
+        """
+        terms = keyword.split() if keyword else []
+        if not terms:
+            return 'customers c', [], []
+
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='customers_fts'").fetchone():
+            where, params = [], []
+            fts_terms = [t for t in terms if len(t) >= 3]
+            if fts_terms:
+                where.append('customers_fts MATCH ?')
+                params.append(' AND '.join('"' + t.replace('"', '""') + '"' for t in fts_terms))
+            for term in terms:
+                if len(term) < 3:
+                    where.append('''(f.company_name LIKE ? OR f.past_names LIKE ? OR f.contact_person LIKE ?
+                                     OR f.email LIKE ? OR f.phone LIKE ? OR f.address LIKE ?)''')
+                    params.extend([f'%{term}%'] * 6)
+            return 'customers_fts f JOIN customers c ON c.id = f.rowid', where, params
+
+        # FTS5 trigram을 지원하지 않는 SQLite
+        where, params = [], []
+        for term in terms:
+            alias_sql, alias_params = cls.alias_match_sql(conn, term)
+            where.append(f'''(c.company_name LIKE ? OR c.contact_person LIKE ? OR c.email LIKE ?
+                             OR c.phone LIKE ? OR c.address LIKE ? OR c.id IN ({alias_sql}))''')
+            params.extend([f'%{term}%'] * 5 + alias_params)
+        return 'customers c', where, params
+
+    @classmethod
+    def get_directory_page(cls, keyword=None, after=None, limit=50, picker=False):
+        """
+        회사명순 키셋 페이지 조회
+
+        Args:
+            keyword: 검색어 (_directory_filter 참고)
+            after: 이전 페이지 마지막 행의 (company_name, id), 없으면 처음부터
+            limit: 페이지 크기
+            picker: True면 자동완성용 dict(id, company_name, address, past_company_names)만 반환
+
+        Returns:
+            tuple: (Customer 또는 dict 목록, 다음 페이지 키 (company_name, id) 또는 None)
+        """
+        conn = get_db_connection()
+        try:
+            from_sql, where, params = cls._directory_filter(conn, keyword)
+            if after:
+                where.append('(c.company_name, c.id) > (?, ?)')
+                params.extend(after)
+            where_sql = ' AND '.join(where) if where else '1=1'
+
+            if picker:
+                columns = 'c.id, c.company_name, c.address, c.past_company_names'
+            else:
+                columns = '''c.*, (SELECT COUNT(*) FROM service_reports sr
+                                   WHERE sr.customer_id = c.id) AS service_reports_count'''
+            rows = conn.execute(f'''
+                SELECT {columns} FROM {from_sql}
+                WHERE {where_sql}
+                ORDER BY c.company_name, c.id
+                LIMIT ?
+            ''', params + [limit + 1]).fetchall()
+        finally:
+            conn.close()
+
+        next_after = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after = (rows[-1]['company_name'], rows[-1]['id'])
+
+        if picker:
+            items = []
+            for row in rows:
+                customer = cls._from_db_row(row)
+                items.append({
+                    'id': customer.id,
+                    'company_name': customer.company_name,
+                    'address': customer.address,
+                    'past_company_names': customer.past_company_names,
+                })
+            return items, next_after
+
+        customers = []
+        for row in rows:
+            customer = cls._from_db_row(row)
+            customer._service_reports_count = row['service_reports_count']
+            customers.append(customer)
+        return customers, next_after
+
+    @classmethod
+    def count_directory(cls, keyword=None):
+        """검색 조건에 맞는 고객 수 (고객 테이블이 바뀌지 않으면 잠시 캐시)"""
+        from app.utils.pagination import get_cached_count
+
+        conn = get_db_connection()
+        try:
+            from_sql, where, params = cls._directory_filter(conn, keyword)
+            where_sql = ' AND '.join(where) if where else '1=1'
+            return get_cached_count(
+                conn, ('customers', ' '.join(keyword.split()) if keyword else ''),
+                f'SELECT COUNT(*) FROM {from_sql} WHERE {where_sql}', params,
+                version_query="SELECT version FROM table_versions WHERE table_name = 'customers'"
+            )
+        finally:
+            conn.close()
+
     def save(self):
         """고객 정보 저장 (생성 또는 수정)"""
         conn = get_db_connection()
@@ -190,6 +278,7 @@ class Customer:
                       past_names_json))
                 self.id = cursor.lastrowid
 
+            self._sync_aliases(conn)
             conn.commit()
             return self.id
         except Exception as e:
@@ -228,6 +317,7 @@ class Customer:
                   safe_value(self.notes), safe_value(self.statement_receive_method),
                   past_names_json, self.id))
 
+            self._sync_aliases(conn)
             conn.commit()
             return True
         except Exception as e:
@@ -258,6 +348,7 @@ class Customer:
                 if invoices > 0:
                     raise ValueError('이 고객과 연관된 거래명세표가 있어 삭제할 수 없습니다.')
 
+                conn.execute('DELETE FROM customer_aliases WHERE customer_id = ?', (self.id,))
                 conn.execute('DELETE FROM customers WHERE id = ?', (self.id,))
                 conn.commit()
                 return True
@@ -268,6 +359,42 @@ class Customer:
                 conn.close()
         return False
     
+    def _sync_aliases(self, conn):
+        """customer_aliases를 현재 상호 + 과거 상호로 동기화 (호출한 트랜잭션 안에서 실행)"""
+        current_name = str(self.company_name).strip() if self.company_name else ''
+        names = []
+        for name in [self.company_name] + list(self.past_company_names or []):
+            name = str(name).strip() if name else ''
+            if name and name not in names:
+                names.append(name)
+
+        conn.execute('DELETE FROM customer_aliases WHERE customer_id = ?', (self.id,))
+        conn.executemany(
+            'INSERT INTO customer_aliases (customer_id, name, is_current) VALUES (?, ?, ?)',
+            [(self.id, name, 1 if name == current_name else 0) for name in names]
+        )
+
+    @staticmethod
+    def alias_match_sql(conn, keyword):
+        """
+        상호(현재/과거)가 검색어를 포함하는 고객 ID를 반환하는 서브쿼리 생성
+        3글자 이상이면 FTS5 trigram 인덱스를, 그보다 짧으면 customer_aliases LIKE를 사용한다.
+
+        Returns:
+            tuple: (SQL 문자열, 파라미터 리스트) - 'customer_id IN (...)' 형태로 사용
+        """
+        if len(keyword) >= 3 and conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='customer_aliases_fts'"
+        ).fetchone():
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            return ('''
+                SELECT ca.customer_id FROM customer_aliases_fts
+                JOIN customer_aliases ca ON ca.id = customer_aliases_fts.rowid
+                WHERE customer_aliases_fts MATCH ?
+            ''', [phrase])
+
+        return ('SELECT customer_id FROM customer_aliases WHERE name LIKE ?', [f'%{keyword}%'])
+
     def get_service_reports_count(self):
         """해당 고객의 서비스 리포트 수 조회"""
         if self.id:
@@ -335,10 +462,12 @@ class Customer:
             'contact': self.contact,
             'homepage': self.homepage,
             'business_card_image': self.business_card_image,
+            'business_card_thumbnail_url': thumbnail_url(self.business_card_image),
             'statement_receive_method': self.statement_receive_method,
             'past_company_names': self.past_company_names,
             'notes': self.notes,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
-            'service_reports_count': self.get_service_reports_count() if self.id else 0
+            'service_reports_count': (self._service_reports_count if self._service_reports_count is not None
+                                      else self.get_service_reports_count() if self.id else 0)
         }
\ No newline at end of file
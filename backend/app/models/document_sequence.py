@@ -0,0 +1,56 @@
+class DocumentSequence:
+    """문서 번호 시퀀스 모델 (거래명세표/서비스 리포트 일련번호 발급)
+
+    (문서 유형, 날짜 prefix)별 마지막 번호를 document_sequences 테이블에 보관하고
+    UPDATE ... RETURNING 한 번으로 다음 번호를 원자적으로 발급한다.
+    호출한 쪽의 INSERT와 같은 트랜잭션에서 실행하면, INSERT가 실패해 롤백될 때
+    발급한 번호도 함께 반환된다.
+    """
+
+    INVOICE = 'invoice'
+    SERVICE_REPORT = 'service_report'
+
+    # 문서 유형별 기존 번호 조회 정보 (시퀀스 행이 없을 때 초기값 계산용)
+    _SOURCES = {
+        INVOICE: ('invoices', 'invoice_number'),
+        SERVICE_REPORT: ('service_reports', 'report_number'),
+    }
+
+    @classmethod
+    def allocate(cls, conn, doc_type, prefix):
+        """
+        다음 번호 발급
+
+        Args:
+            conn: 문서 INSERT에 사용하는 데이터베이스 연결 (commit은 호출한 쪽에서)
+            doc_type: 문서 유형 (DocumentSequence.INVOICE / SERVICE_REPORT)
+            prefix: 날짜 prefix (예: '251026', 'SR-20251026-')
+
+        Returns:
+            int: 발급된 번호
+        """
+        row = conn.execute('''
+            UPDATE document_sequences
+            SET last_number = last_number + 1
+            WHERE doc_type = ? AND prefix = ?
+            RETURNING last_number
+        ''', (doc_type, prefix)).fetchone()
+
+        if row:
+            return row[0]
+
+        # 해당 prefix의 첫 발급: 기존 문서의 최대 번호 다음부터 시작
+        # (동시에 다른 연결이 먼저 행을 만든 경우 ON CONFLICT로 증가만 수행)
+        table, column = cls._SOURCES[doc_type]
+        row = conn.execute(f'''
+            INSERT INTO document_sequences (doc_type, prefix, last_number)
+            VALUES (?, ?, (
+                SELECT COALESCE(MAX(CAST(SUBSTR({column}, ?) AS INTEGER)), 0) + 1
+                FROM {table}
+                WHERE {column} LIKE ?
+            ))
+            ON CONFLICT(doc_type, prefix) DO UPDATE SET last_number = last_number + 1
+            RETURNING last_number
+        ''', (doc_type, prefix, len(prefix) + 1, f'{prefix}%')).fetchone()
+
+        return row[0]
@@ -1,6 +1,54 @@
 from app.database.init_db import get_db_connection
+from app.models.document_sequence import DocumentSequence
+from app.models.revenue_rollup import RevenueRollup
+from collections import namedtuple
 from datetime import datetime
-import json
+
+
+# 목록 조회용 경량 행 타입 (Invoice 객체 생성 없이 한 번의 쿼리 결과를 그대로 사용)
+_INVOICE_LIST_COLUMNS = (
+    ('id', 'i.id'),
+    ('service_report_id', 'i.service_report_id'),
+    ('invoice_number', 'i.invoice_number'),
+    ('customer_id', 'i.customer_id'),
+    ('customer_name', 'i.customer_name'),
+    ('customer_address', 'i.customer_address'),
+    ('issue_date', 'i.issue_date'),
+    ('due_date', 'i.due_date'),
+    ('work_subtotal', 'i.work_subtotal'),
+    ('travel_subtotal', 'i.travel_subtotal'),
+    ('parts_subtotal', 'i.parts_subtotal'),
+    ('total_amount', 'i.total_amount'),
+    ('vat_amount', 'i.vat_amount'),
+    ('grand_total', 'i.grand_total'),
+    ('notes', 'i.notes'),
+    ('created_at', 'i.created_at'),
+    ('updated_at', 'i.updated_at'),
+    ('is_locked', 'COALESCE(i.is_locked, 0)'),
+    ('locked_by', 'i.locked_by'),
+    ('locked_at', 'i.locked_at'),
+    ('bill_status', "COALESCE(i.bill_status, 'pending')"),
+    ('bill_issued_at', 'i.bill_issued_at'),
+    ('bill_issued_by', 'i.bill_issued_by'),
+    ('invoice_code_id', 'i.invoice_code_id'),
+    ('invoice_code', 'ic.code'),
+    ('invoice_description', 'ic.description'),
+    # 고객 ID 기준으로 현재 상호 표시 (상호 변경 시에도 정상 동작)
+    ('display_customer_name', 'COALESCE(c.company_name, i.customer_name)'),
+    # 명세서 수신 방법에 따라 팩스번호 또는 이메일
+    ('fax_number', """CASE WHEN COALESCE(c.statement_receive_method, '팩스') = '이메일'
+        THEN NULLIF(c.email, '') ELSE NULLIF(c.fax, '') END"""),
+)
+
+
+class InvoiceListRow(namedtuple('InvoiceListRow', [name for name, _ in _INVOICE_LIST_COLUMNS])):
+    """거래명세표 목록 행"""
+    __slots__ = ()
+
+    def to_dict(self):
+        """딕셔너리로 변환"""
+        return self._asdict()
+
 
 class Invoice:
     """거래명세표 모델"""
@@ -35,7 +83,12 @@ class Invoice:
     
     @classmethod
     def get_all(cls, page=1, per_page=10, search=None):
-        """모든 거래명세표 조회 (페이징 + 검색)"""
+        """
+        모든 거래명세표 조회 (페이징 + 검색)
+
+        Returns:
+            tuple: (InvoiceListRow 목록, 전체 개수)
+        """
         conn = get_db_connection()
         offset = (page - 1) * per_page
 
@@ -44,73 +97,41 @@ class Invoice:
         params = []
 
         if search:
+            from app.models.customer import Customer
             search_pattern = f'%{search}%'
-            # 과거 상호 포함: 검색어에 매칭되는 고객의 현재/과거 모든 상호를 수집
-            customer_rows = conn.execute(
-                'SELECT company_name, past_company_names FROM customers WHERE company_name LIKE ? OR past_company_names LIKE ?',
-                [search_pattern, search_pattern]
-            ).fetchall()
-            expanded_names = set()
-            for row in customer_rows:
-                expanded_names.add(row['company_name'])
-                if row['past_company_names']:
-                    try:
-                        past = json.loads(row['past_company_names'])
-                        if isinstance(past, list):
-                            expanded_names.update(past)
-                    except (json.JSONDecodeError, ValueError):
-                        pass
-
-            if expanded_names:
-                name_placeholders = ','.join(['?' for _ in expanded_names])
-                where_clause = f"""
-                    WHERE (
-                        i.invoice_number LIKE ? OR
-                        i.customer_name LIKE ? OR
-                        i.issue_date LIKE ? OR
-                        i.customer_name IN ({name_placeholders})
-                    )
-                """
-                params = [search_pattern, search_pattern, search_pattern] + list(expanded_names)
-            else:
-                where_clause = """
-                    WHERE (
-                        i.invoice_number LIKE ? OR
-                        i.customer_name LIKE ? OR
-                        i.issue_date LIKE ?
-                    )
-                """
-                params = [search_pattern, search_pattern, search_pattern]
-
-        # 데이터 조회
+            # 과거 상호 포함: customer_aliases에서 검색어에 매칭되는 고객 ID로 조인
+            alias_sql, alias_params = Customer.alias_match_sql(conn, search)
+            where_clause = f"""
+                WHERE (
+                    i.invoice_number LIKE ? OR
+                    i.customer_name LIKE ? OR
+                    i.issue_date LIKE ? OR
+                    i.customer_id IN ({alias_sql})
+                )
+            """
+            params = [search_pattern, search_pattern, search_pattern] + alias_params
+
+        # 데이터 조회 (고객 팩스/이메일은 LEFT JOIN으로 함께 조회)
+        select_columns = ',\n                '.join(f'{expr} AS {name}' for name, expr in _INVOICE_LIST_COLUMNS)
         query = f'''
-            SELECT i.*, ic.code AS invoice_code, ic.description AS invoice_description
+            SELECT {select_columns}
             FROM invoices i
             LEFT JOIN invoice_codes ic ON i.invoice_code_id = ic.id
+            LEFT JOIN customers c ON i.customer_id = c.id
             {where_clause}
             ORDER BY i.created_at DESC
             LIMIT ? OFFSET ?
         '''
-        params.extend([per_page, offset])
-        invoices_data = conn.execute(query, params).fetchall()
+        cursor = conn.cursor()
+        cursor.row_factory = lambda _cursor, row: InvoiceListRow._make(row)
+        invoices = cursor.execute(query, params + [per_page, offset]).fetchall()
 
         # 총 개수 조회
         count_query = f'SELECT COUNT(*) FROM invoices i {where_clause}'
-        if search:
-            total = conn.execute(count_query, params[:-2]).fetchone()[0]
-        else:
-            total = conn.execute(count_query).fetchone()[0]
+        total = conn.execute(count_query, params).fetchone()[0]
 
         conn.close()
 
-        invoices = []
-        for data in invoices_data:
-            invoice = cls._from_db_row(data)
-            # invoice_code와 invoice_description 추가
-            invoice.invoice_code = data['invoice_code'] if 'invoice_code' in data.keys() else None
-            invoice.invoice_description = data['invoice_description'] if 'invoice_description' in data.keys() else None
-            invoices.append(invoice)
-
         return invoices, total
     
     @classmethod
@@ -159,8 +180,10 @@ class Invoice:
         
         if time_records:
             for time_record in time_records:
-                work_hours = cls._time_string_to_hours(time_record.calculated_work_time) if time_record.calculated_work_time else 0
-                travel_hours = cls._time_string_to_hours(time_record.calculated_travel_time) if time_record.calculated_travel_time else 0
+                work_hours = (time_record.work_minutes / 60.0 if time_record.work_minutes is not None
+                              else cls._time_string_to_hours(time_record.calculated_work_time))
+                travel_hours = (time_record.travel_minutes / 60.0 if time_record.travel_minutes is not None
+                                else cls._time_string_to_hours(time_record.calculated_travel_time))
                 
                 work_subtotal += work_hours * work_rate
                 travel_subtotal += travel_hours * travel_rate
@@ -176,14 +199,12 @@ class Invoice:
         vat_amount = total_amount * 0.1  # 10% 부가세
         grand_total = total_amount + vat_amount
         
-        # 거래명세표 번호 생성 (오늘 날짜 기준)
+        # 발행일자 (거래명세표 번호는 save() 시 이 날짜 기준으로 발급)
         issue_date = datetime.now().strftime('%Y-%m-%d')
-        invoice_number = cls._generate_invoice_number(issue_date)
 
         # 거래명세표 객체 생성
         invoice = cls(
             service_report_id=service_report.id,
-            invoice_number=invoice_number,
             customer_id=service_report.customer_id,
             customer_name=getattr(service_report, 'customer_name', ''),
             customer_address=getattr(service_report, 'customer_address', ''),
@@ -199,48 +220,29 @@ class Invoice:
         return invoice
     
     @classmethod
-    def _generate_invoice_number(cls, issue_date=None):
-        """거래명세표 번호 자동 생성 (yymmdd## 형식)
+    def _invoice_number_prefix(cls, issue_date=None):
+        """거래명세표 번호 prefix (발행일자의 yymmdd)
 
         Args:
             issue_date: 발행일자 (문자열 'YYYY-MM-DD' 형식 또는 datetime 객체). 없으면 오늘 날짜 사용
-
-        Returns:
-            str: 생성된 거래명세표 번호 (예: 25102601)
         """
-        # 발행일자 처리
         if issue_date:
             if isinstance(issue_date, str):
-                target_date = datetime.strptime(issue_date, '%Y-%m-%d')
+                target_date = datetime.strptime(issue_date[:10], '%Y-%m-%d')
             else:
                 target_date = issue_date
         else:
             target_date = datetime.now()
 
-        # yymmdd 형식으로 prefix 생성
-        prefix = target_date.strftime('%y%m%d')
+        return target_date.strftime('%y%m%d')
 
-        conn = get_db_connection()
-        try:
-            # 같은 날짜로 시작하는 마지막 번호 조회
-            last_invoice = conn.execute('''
-                SELECT invoice_number FROM invoices
-                WHERE invoice_number LIKE ?
-                ORDER BY invoice_number DESC LIMIT 1
-            ''', (f'{prefix}%',)).fetchone()
-
-            if last_invoice:
-                # 마지막 2자리(인덱스) 추출 후 +1
-                last_number = int(last_invoice['invoice_number'][-2:])
-                new_number = last_number + 1
-            else:
-                # 해당 날짜의 첫 번째 명세서
-                new_number = 1
+    @classmethod
+    def _allocate_invoice_number(cls, conn, issue_date=None):
+        """conn의 트랜잭션 안에서 거래명세표 번호 발급 (yymmdd## 형식)"""
+        prefix = cls._invoice_number_prefix(issue_date)
+        number = DocumentSequence.allocate(conn, DocumentSequence.INVOICE, prefix)
+        return f'{prefix}{number:02d}'
 
-            return f'{prefix}{new_number:02d}'
-        finally:
-            conn.close()
-    
     @classmethod
     def _time_string_to_hours(cls, time_str):
         """HH:MM 형식의 시간 문자열을 시간 단위 숫자로 변환"""
@@ -258,9 +260,15 @@ class Invoice:
         except (ValueError, AttributeError):
             return 0
     
-    def save(self):
-        """거래명세표 저장"""
-        conn = get_db_connection()
+    def save(self, conn=None):
+        """거래명세표 저장
+
+        Args:
+            conn: 외부 트랜잭션에 참여할 연결 (지정하면 commit/close는 호출한 쪽에서)
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = get_db_connection()
         try:
             if self.id:
                 # 수정
@@ -277,7 +285,10 @@ class Invoice:
                      self.total_amount, self.vat_amount, self.grand_total,
                      self.notes, self.invoice_code_id, self.id))
             else:
-                # 신규 생성
+                # 신규 생성 (번호가 없으면 같은 트랜잭션에서 발급)
+                if not self.invoice_number:
+                    self.invoice_number = self._allocate_invoice_number(conn, self.issue_date)
+
                 cursor = conn.execute('''
                     INSERT INTO invoices (service_report_id, invoice_number,
                     customer_id, customer_name, customer_address, issue_date,
@@ -291,8 +302,34 @@ class Invoice:
                      self.grand_total, self.notes, self.invoice_code_id))
                 self.id = cursor.lastrowid
 
-            conn.commit()
+            if own_conn:
+                conn.commit()
             return self.id
+        except Exception as e:
+            if own_conn:
+                conn.rollback()
+            raise e
+        finally:
+            if own_conn:
+                conn.close()
+
+    def save_with_items(self, items):
+        """거래명세표 헤더와 항목 전체를 하나의 트랜잭션으로 저장
+
+        Args:
+            items: InvoiceItem 목록 (이 순서대로 기존 항목을 교체)
+
+        Returns:
+            dict: 항목 변경 건수 (InvoiceItem.replace_for_invoice 참고)
+        """
+        from app.models.invoice_item import InvoiceItem
+
+        conn = get_db_connection()
+        try:
+            self.save(conn)
+            stats = InvoiceItem.replace_for_invoice(conn, self.id, items)
+            conn.commit()
+            return stats
         except Exception as e:
             conn.rollback()
             raise e
@@ -304,8 +341,12 @@ class Invoice:
         """거래명세표 삭제"""
         conn = get_db_connection()
         try:
+            row = conn.execute('SELECT * FROM invoices WHERE id = ?', (invoice_id,)).fetchone()
             conn.execute('DELETE FROM invoice_items WHERE invoice_id = ?', (invoice_id,))
             conn.execute('DELETE FROM invoices WHERE id = ?', (invoice_id,))
+            # 발행된 거래명세표였다면 해당 월 매출 집계 갱신
+            if row and 'bill_status' in row.keys() and row['bill_status'] == 'issued':
+                RevenueRollup.refresh_for_dates(conn, row['issue_date'])
             conn.commit()
             return True
         except Exception as e:
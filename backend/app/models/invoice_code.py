@@ -1,4 +1,5 @@
 from app.database.init_db import get_db_connection
+from app.models.revenue_rollup import RevenueRollup
 from datetime import datetime
 
 class InvoiceCode:
@@ -91,11 +92,14 @@ class InvoiceCode:
         try:
             if self.id:
                 # 수정
+                previous = conn.execute('SELECT category FROM invoice_codes WHERE id=?', (self.id,)).fetchone()
                 conn.execute('''
                     UPDATE invoice_codes SET 
                     code=?, description=?, category=?, updated_at=CURRENT_TIMESTAMP
                     WHERE id=?
                 ''', (self.code, self.description, self.category, self.id))
+                if previous and previous['category'] != self.category:
+                    RevenueRollup.refresh_for_invoice_code(conn, self.id)
             else:
                 # 신규 생성
                 cursor = conn.execute('''
@@ -128,6 +132,7 @@ class InvoiceCode:
             
             # 실제 삭제
             conn.execute('DELETE FROM invoice_codes WHERE id=?', (invoice_code_id,))
+            RevenueRollup.refresh_for_invoice_code(conn, invoice_code_id)
             conn.commit()
             return True
         except Exception as e:
@@ -3,6 +3,10 @@ from app.database.init_db import get_db_connection
 class InvoiceItem:
     """거래명세표 항목 모델"""
 
+    # 일괄 저장 시 비교/기록하는 컬럼 (invoice_id, id 제외)
+    FIELDS = ('item_type', 'description', 'quantity', 'unit_price', 'total_price',
+              'month', 'day', 'item_name', 'part_number', 'is_header', 'row_order')
+
     def __init__(self, id=None, invoice_id=None, item_type=None,
                  description=None, quantity=None, unit_price=None,
                  total_price=None, month=None, day=None, item_name=None,
@@ -42,6 +46,97 @@ class InvoiceItem:
 
         return items
     
+    @classmethod
+    def from_request_data(cls, invoice_id, item_data):
+        """요청 JSON의 항목 데이터로 객체 생성"""
+        # is_header 값 처리: isHeader(camelCase) 또는 is_header(snake_case) 둘 다 지원
+        is_header_value = item_data.get('isHeader', item_data.get('is_header', 0))
+
+        return cls(
+            invoice_id=invoice_id,
+            item_type=item_data.get('item_type', 'parts'),
+            description=item_data.get('description', ''),
+            quantity=float(item_data.get('quantity', 0)),
+            unit_price=float(item_data.get('unit_price', 0)),
+            total_price=float(item_data.get('total_price', 0)),
+            month=item_data.get('month'),
+            day=item_data.get('day'),
+            item_name=item_data.get('item_name'),
+            part_number=item_data.get('part_number'),
+            is_header=is_header_value,
+            row_order=item_data.get('row_order', 0)
+        )
+
+    @classmethod
+    def replace_for_invoice(cls, conn, invoice_id, items):
+        """
+        거래명세표의 항목 전체를 items로 교체 (conn의 트랜잭션 안에서 실행, commit은 호출한 쪽에서)
+        기존 행과 순서대로 비교하여 내용이 같은 행은 건드리지 않고,
+        바뀐 행만 UPDATE, 늘어난 행은 INSERT, 남는 행은 DELETE를 각각 executemany로 처리한다.
+
+        Returns:
+            dict: unchanged / updated / inserted / deleted 건수
+        """
+        columns = ', '.join(cls.FIELDS)
+        existing = conn.execute(f'''
+            SELECT id, {columns} FROM invoice_items
+            WHERE invoice_id = ?
+            ORDER BY row_order, id
+        ''', (invoice_id,)).fetchall()
+
+        updates = []
+        inserts = []
+        unchanged = 0
+        for idx, item in enumerate(items):
+            item.invoice_id = invoice_id
+            values = item._values()
+            if idx < len(existing):
+                row = existing[idx]
+                item.id = row['id']
+                if [cls._normalize(row[f]) for f in cls.FIELDS] == [cls._normalize(v) for v in values]:
+                    unchanged += 1
+                else:
+                    updates.append(values + (item.id,))
+            else:
+                inserts.append((invoice_id,) + values)
+
+        stale_ids = [(row['id'],) for row in existing[len(items):]]
+
+        if updates:
+            assignments = ', '.join(f'{f}=?' for f in cls.FIELDS)
+            conn.executemany(
+                f'UPDATE invoice_items SET {assignments}, updated_at=CURRENT_TIMESTAMP WHERE id=?',
+                updates
+            )
+        if inserts:
+            placeholders = ', '.join('?' * (len(cls.FIELDS) + 1))
+            conn.executemany(
+                f'INSERT INTO invoice_items (invoice_id, {columns}) VALUES ({placeholders})',
+                inserts
+            )
+        if stale_ids:
+            conn.executemany('DELETE FROM invoice_items WHERE id = ?', stale_ids)
+
+        return {
+            'unchanged': unchanged,
+            'updated': len(updates),
+            'inserted': len(inserts),
+            'deleted': len(stale_ids)
+        }
+
+    def _values(self):
+        """FIELDS 순서의 값 튜플"""
+        return tuple(getattr(self, f) for f in self.FIELDS)
+
+    @staticmethod
+    def _normalize(value):
+        """DB 값과 요청 값 비교용 정규화 (3 / 3.0 / '3' 을 같은 값으로 취급)"""
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
     @classmethod
     def create_from_service_report(cls, invoice_id, service_report):
         """서비스 리포트를 기반으로 거래명세표 항목들 생성"""
@@ -72,8 +167,10 @@ class InvoiceItem:
             total_travel_hours = 0
 
             for time_record in time_records:
-                work_hours = cls._time_string_to_hours(time_record.calculated_work_time) if time_record.calculated_work_time else 0
-                travel_hours = cls._time_string_to_hours(time_record.calculated_travel_time) if time_record.calculated_travel_time else 0
+                work_hours = (time_record.work_minutes / 60.0 if time_record.work_minutes is not None
+                              else cls._time_string_to_hours(time_record.calculated_work_time))
+                travel_hours = (time_record.travel_minutes / 60.0 if time_record.travel_minutes is not None
+                                else cls._time_string_to_hours(time_record.calculated_travel_time))
 
                 total_work_hours += work_hours
                 total_travel_hours += travel_hours
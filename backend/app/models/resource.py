@@ -1,8 +1,9 @@
-import sqlite3
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 
+from app.database.init_db import get_db_connection
+
 class Resource:
     def __init__(self, id=None, customer_id=None, category=None, serial_number=None, 
                  product_name=None, note=None, created_at=None, updated_at=None, management_history=None):
@@ -15,10 +16,12 @@ class Resource:
         self.created_at = created_at or datetime.now()
         self.updated_at = updated_at or datetime.now()
         self.management_history = management_history or []
+        # history_limit로 일부만 조회한 경우 전체 이력 수 (PUT은 이력 전체를 다시 저장하므로 편집 화면은 전체 조회)
+        self.management_history_count = len(self.management_history)
 
     def save(self):
         """리소스 저장"""
-        conn = sqlite3.connect('app/database/user.db')
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         try:
@@ -45,11 +48,12 @@ class Resource:
             
             # 관리 이력 저장
             if self.management_history:
-                for history in self.management_history:
-                    cursor.execute('''
-                    INSERT INTO resource_management_history (resource_id, action, new_data, changed_at)
-                    VALUES (?, ?, ?, ?)
-                    ''', (self.id, 'update', history.get('content', ''), history.get('date', datetime.now().isoformat())))
+                cursor.executemany('''
+                INSERT INTO resource_management_history (resource_id, action, new_data, changed_at)
+                VALUES (?, ?, ?, ?)
+                ''', [(self.id, 'update', history.get('content', ''), history.get('date', datetime.now().isoformat()))
+                      for history in self.management_history])
+                self.management_history_count = len(self.management_history)
             
             conn.commit()
         except Exception as e:
@@ -60,142 +64,131 @@ class Resource:
         
         return self
 
-    @classmethod
-    def get_by_id(cls, resource_id: int) -> Optional['Resource']:
-        """ID로 리소스 조회"""
-        conn = sqlite3.connect('app/database/user.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM resources WHERE id = ?', (resource_id,))
-        row = cursor.fetchone()
-        
-        if row:
-            # 관리 이력도 함께 조회
-            cursor.execute('''
-            SELECT changed_at, action, old_data, new_data FROM resource_management_history
-            WHERE resource_id = ? ORDER BY changed_at DESC
-            ''', (resource_id,))
-            history_rows = cursor.fetchall()
+    @staticmethod
+    def _load_history(conn, resource_ids, history_limit: Optional[int] = None) -> Tuple[Dict[int, List[Dict]], Dict[int, int]]:
+        """
+        여러 리소스의 관리 이력을 한 번에 조회 (최신순)
 
-            management_history = []
-            for hist_row in history_rows:
-                management_history.append({
-                    'date': hist_row[0],
-                    'content': f"{hist_row[1]}: {hist_row[3] or ''}"
-                })
-            
-            # 데이터베이스 스키마에 맞는 순서로 Resource 객체 생성
-            resource = cls(
-                id=row[0],
-                customer_id=row[1], 
-                category=row[2],
-                serial_number=row[3],
-                product_name=row[4],
-                note=row[5],
-                created_at=row[6],
-                updated_at=row[7],
-                management_history=management_history
+        Args:
+            history_limit: 리소스별 최신 N건만 (None이면 전체)
+
+        Returns:
+            tuple: (resource_id -> [{'date', 'content'}], resource_id -> 전체 이력 수)
+        """
+        history = {resource_id: [] for resource_id in resource_ids}
+        counts = dict.fromkeys(history, 0)
+        if not history:
+            return history, counts
+
+        limit_sql = 'WHERE rn <= ?' if history_limit is not None else ''
+        params = [json.dumps(list(history))] + ([history_limit] if history_limit is not None else [])
+        rows = conn.execute(f'''
+            SELECT resource_id, changed_at, action, new_data, total FROM (
+                SELECT resource_id, changed_at, action, new_data, id,
+                       ROW_NUMBER() OVER (PARTITION BY resource_id ORDER BY changed_at DESC, id DESC) AS rn,
+                       COUNT(*) OVER (PARTITION BY resource_id) AS total
+                FROM resource_management_history
+                WHERE resource_id IN (SELECT value FROM json_each(?))
             )
+            {limit_sql}
+            ORDER BY resource_id, changed_at DESC, id DESC
+        ''', params).fetchall()
+
+        for row in rows:
+            history[row['resource_id']].append({
+                'date': row['changed_at'],
+                'content': f"{row['action']}: {row['new_data'] or ''}"
+            })
+            counts[row['resource_id']] = row['total']
+        return history, counts
+
+    @classmethod
+    def _from_db_row(cls, row, management_history=None, management_history_count=None) -> 'Resource':
+        resource = cls(
+            id=row['id'],
+            customer_id=row['customer_id'],
+            category=row['category'],
+            serial_number=row['serial_number'],
+            product_name=row['product_name'],
+            note=row['note'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            management_history=management_history
+        )
+        if management_history_count is not None:
+            resource.management_history_count = management_history_count
+        return resource
+
+    @classmethod
+    def _query(cls, where_sql: str = '', params=(), history_limit: Optional[int] = None) -> List['Resource']:
+        """리소스 목록 + 관리 이력 (쿼리 2번)"""
+        conn = get_db_connection()
+        try:
+            rows = conn.execute(
+                f'SELECT * FROM resources {where_sql} ORDER BY created_at DESC', params
+            ).fetchall()
+            history, counts = cls._load_history(conn, [row['id'] for row in rows], history_limit)
+        finally:
             conn.close()
-            return resource
-        
-        conn.close()
-        return None
+        return [cls._from_db_row(row, history[row['id']], counts[row['id']]) for row in rows]
 
     @classmethod
-    def get_by_customer_id(cls, customer_id: int) -> List['Resource']:
+    def get_by_id(cls, resource_id: int, history_limit: Optional[int] = None) -> Optional['Resource']:
+        """ID로 리소스 조회"""
+        resources = cls._query('WHERE id = ?', (resource_id,), history_limit)
+        return resources[0] if resources else None
+
+    @classmethod
+    def get_by_customer_id(cls, customer_id: int, history_limit: Optional[int] = None) -> List['Resource']:
         """고객 ID로 리소스 목록 조회"""
-        conn = sqlite3.connect('app/database/user.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM resources WHERE customer_id = ? ORDER BY created_at DESC', (customer_id,))
-        rows = cursor.fetchall()
-        
-        resources = []
-        for row in rows:
-            # 관리 이력도 함께 조회
-            cursor.execute('''
-            SELECT changed_at, action, old_data, new_data FROM resource_management_history
-            WHERE resource_id = ? ORDER BY changed_at DESC
-            ''', (row[0],))  # row[0]은 resource id
-            history_rows = cursor.fetchall()
+        return cls._query('WHERE customer_id = ?', (customer_id,), history_limit)
 
-            management_history = []
-            for hist_row in history_rows:
-                management_history.append({
-                    'date': hist_row[0],
-                    'content': f"{hist_row[1]}: {hist_row[3] or ''}"
-                })
-            
-            # 데이터베이스 스키마에 맞는 순서로 Resource 객체 생성
-            # (id, customer_id, category, serial_number, product_name, note, created_at, updated_at)
-            resource = cls(
-                id=row[0],
-                customer_id=row[1], 
-                category=row[2],
-                serial_number=row[3],
-                product_name=row[4],
-                note=row[5],
-                created_at=row[6],
-                updated_at=row[7],
-                management_history=management_history
-            )
-            resources.append(resource)
-        
-        conn.close()
-        return resources
+    @classmethod
+    def get_by_customer_ids(cls, customer_ids, history_limit: Optional[int] = None) -> Dict[int, List['Resource']]:
+        """여러 고객의 리소스를 한 번에 조회 (customer_id -> 리소스 목록)"""
+        resources = cls._query(
+            'WHERE customer_id IN (SELECT value FROM json_each(?))', (json.dumps(list(customer_ids)),), history_limit
+        )
+        by_customer = {customer_id: [] for customer_id in customer_ids}
+        for resource in resources:
+            by_customer.setdefault(resource.customer_id, []).append(resource)
+        return by_customer
 
     @classmethod
-    def get_all_with_customer_info(cls) -> List[Dict]:
+    def get_all(cls, history_limit: Optional[int] = None) -> List['Resource']:
+        """모든 리소스 조회"""
+        return cls._query(history_limit=history_limit)
+
+    @classmethod
+    def get_all_with_customer_info(cls, history_limit: Optional[int] = None) -> List[Dict]:
         """고객 정보와 함께 모든 리소스 조회"""
-        conn = sqlite3.connect('app/database/user.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT 
-            r.id, r.customer_id, r.category, r.serial_number, 
-            r.product_name, r.note, r.created_at,
-            c.company_name as customer_name
-        FROM resources r
-        LEFT JOIN customers c ON r.customer_id = c.id
-        ORDER BY r.created_at DESC
-        ''')
-        
-        rows = cursor.fetchall()
-        
-        resources = []
-        for row in rows:
-            resource_id = row[0]
-            
-            # 해당 리소스의 관리 이력 조회
-            cursor.execute('''
-            SELECT changed_at, action, old_data, new_data FROM resource_management_history
-            WHERE resource_id = ? ORDER BY changed_at DESC
-            ''', (resource_id,))
-            history_rows = cursor.fetchall()
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('''
+            SELECT
+                r.id, r.customer_id, r.category, r.serial_number,
+                r.product_name, r.note, r.created_at,
+                c.company_name as customer_name
+            FROM resources r
+            LEFT JOIN customers c ON r.customer_id = c.id
+            ORDER BY r.created_at DESC
+            ''').fetchall()
+            history, counts = cls._load_history(conn, [row['id'] for row in rows], history_limit)
+        finally:
+            conn.close()
 
-            management_history = []
-            for hist_row in history_rows:
-                management_history.append({
-                    'date': hist_row[0],
-                    'content': f"{hist_row[1]}: {hist_row[3] or ''}"
-                })
-            
-            resource_dict = {
-                'id': row[0],
-                'customer_id': row[1],
-                'category': row[2],
-                'serial_number': row[3],
-                'product_name': row[4],
-                'note': row[5],
-                'created_at': row[6],
-                'customer_name': row[7] if row[7] else '알 수 없음',
-                'management_history': management_history
-            }
-            resources.append(resource_dict)
-        
-        conn.close()
-        return resources
+        return [{
+            'id': row['id'],
+            'customer_id': row['customer_id'],
+            'category': row['category'],
+            'serial_number': row['serial_number'],
+            'product_name': row['product_name'],
+            'note': row['note'],
+            'created_at': row['created_at'],
+            'customer_name': row['customer_name'] if row['customer_name'] else '알 수 없음',
+            'management_history': history[row['id']],
+            'management_history_count': counts[row['id']]
+        } for row in rows]
 
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
@@ -212,6 +205,7 @@ class Resource:
                 'product_name': self.product_name,
                 'note': self.note,
                 'management_history': self.management_history,
+                'management_history_count': self.management_history_count,
                 'created_at': created_at_str
             }
         except Exception as e:
@@ -229,7 +223,7 @@ class Resource:
 
     def delete(self):
         """리소스 삭제"""
-        conn = sqlite3.connect('app/database/user.db')
+        conn = get_db_connection()
         cursor = conn.cursor()
 
         try:
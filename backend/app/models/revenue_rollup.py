@@ -0,0 +1,154 @@
+import sqlite3
+
+from app.database.init_db import get_db_connection
+
+
+class RevenueRollup:
+    """월별 매출 집계 모델 (YTD Summary용)
+
+    계산서 발행(bill_status='issued')된 거래명세표 항목을
+    (연, 월, 카테고리, 항목 유형) 단위로 미리 합산해 revenue_rollup 테이블에 보관한다.
+    발행/발행취소/삭제, Invoice 코드 카테고리 변경, 서비스 리포트 코드 변경 시
+    해당 월만 원본에서 다시 계산하므로 여러 번 호출해도 결과가 같다.
+    """
+
+    # 집계 원본 쿼리 (시간: 네고 항목(total_price < 0) 제외, 금액: 네고 포함)
+    # invoice_code_id는 invoices 테이블을 우선하고, 없으면 service_reports에서 가져옴
+    _AGGREGATE_SQL = '''
+        SELECT
+            CAST(strftime('%Y', i.issue_date) AS INTEGER) as year,
+            CAST(strftime('%m', i.issue_date) AS INTEGER) as month,
+            COALESCE(ic.category, 'Unknown') as category,
+            ii.item_type,
+            SUM(CASE WHEN ii.total_price >= 0 THEN ii.quantity ELSE 0 END) as hours,
+            SUM(ii.total_price) as amount
+        FROM invoice_items ii
+        INNER JOIN invoices i ON ii.invoice_id = i.id
+        LEFT JOIN service_reports sr ON i.service_report_id = sr.id
+        LEFT JOIN invoice_codes ic ON COALESCE(i.invoice_code_id, sr.invoice_code_id) = ic.id
+        WHERE i.bill_status = 'issued'
+            AND ii.is_header = 0
+            AND ii.item_type IS NOT NULL
+            AND i.issue_date IS NOT NULL
+            {where}
+        GROUP BY 1, 2, 3, 4
+    '''
+
+    _INSERT_SQL = '''
+        INSERT INTO revenue_rollup (year, month, category, item_type, hours, amount)
+        SELECT year, month, category, item_type, hours, amount FROM ({select})
+        WHERE year IS NOT NULL AND month IS NOT NULL
+    '''
+
+    @staticmethod
+    def _month_range(year, month):
+        """해당 월의 issue_date 범위 ('YYYY-MM-01' 이상, 다음 달 1일 미만)"""
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return f'{year:04d}-{month:02d}-01', f'{next_year:04d}-{next_month:02d}-01'
+
+    @classmethod
+    def refresh_month(cls, conn, year, month):
+        """
+        한 달 집계 재계산 (commit은 호출한 쪽에서)
+
+        Args:
+            conn: 데이터베이스 연결
+            year: 연도
+            month: 월 (1-12)
+        """
+        start, end = cls._month_range(year, month)
+        conn.execute('DELETE FROM revenue_rollup WHERE year = ? AND month = ?', (year, month))
+        select = cls._AGGREGATE_SQL.format(where='AND i.issue_date >= ? AND i.issue_date < ?')
+        conn.execute(cls._INSERT_SQL.format(select=select), (start, end))
+
+    @classmethod
+    def refresh_for_dates(cls, conn, *issue_dates):
+        """발행일자('YYYY-MM-DD...')가 속한 월들의 집계 재계산"""
+        months = set()
+        for issue_date in issue_dates:
+            if not issue_date:
+                continue
+            try:
+                months.add((int(str(issue_date)[:4]), int(str(issue_date)[5:7])))
+            except ValueError:
+                continue
+        for year, month in sorted(months):
+            cls.refresh_month(conn, year, month)
+
+    @classmethod
+    def refresh_for_invoice(cls, conn, invoice_id):
+        """거래명세표가 속한 월의 집계 재계산 (발행/발행취소 직후 같은 트랜잭션에서 호출)"""
+        row = conn.execute('SELECT issue_date FROM invoices WHERE id = ?', (invoice_id,)).fetchone()
+        if row:
+            cls.refresh_for_dates(conn, row[0])
+
+    @classmethod
+    def _refresh_months_of(cls, conn, where, params):
+        """조건에 맞는 발행 거래명세표가 있는 월들의 집계 재계산"""
+        try:
+            rows = conn.execute(f'''
+                SELECT DISTINCT substr(i.issue_date, 1, 7)
+                FROM invoices i
+                LEFT JOIN service_reports sr ON i.service_report_id = sr.id
+                WHERE i.bill_status = 'issued' AND i.issue_date IS NOT NULL AND {where}
+            ''', params).fetchall()
+        except sqlite3.OperationalError as e:
+            # bill_status 마이그레이션 이전 DB: 집계 없음 (관리자 재생성 API로 나중에 생성)
+            print(f"revenue_rollup 갱신 생략: {e}")
+            return
+        cls.refresh_for_dates(conn, *(row[0] for row in rows))
+
+    @classmethod
+    def refresh_for_invoice_code(cls, conn, invoice_code_id):
+        """Invoice 코드의 카테고리 변경/삭제 후 그 코드로 집계되는 월 재계산 (commit은 호출한 쪽에서)"""
+        cls._refresh_months_of(conn, 'COALESCE(i.invoice_code_id, sr.invoice_code_id) = ?', (invoice_code_id,))
+
+    @classmethod
+    def refresh_for_service_report(cls, conn, service_report_id):
+        """서비스 리포트의 Invoice 코드 변경 후 연결된 거래명세표의 월 재계산 (commit은 호출한 쪽에서)"""
+        cls._refresh_months_of(conn, 'i.service_report_id = ? AND i.invoice_code_id IS NULL',
+                               (service_report_id,))
+
+    @classmethod
+    def rebuild(cls, conn=None):
+        """
+        전체 집계 재생성
+
+        Args:
+            conn: 데이터베이스 연결 (없으면 새로 열고 commit까지 수행)
+
+        Returns:
+            int: 생성된 집계 행 수
+        """
+        own_conn = conn is None
+        if own_conn:
+            conn = get_db_connection()
+        try:
+            conn.execute('DELETE FROM revenue_rollup')
+            select = cls._AGGREGATE_SQL.format(where='')
+            conn.execute(cls._INSERT_SQL.format(select=select))
+            count = conn.execute('SELECT COUNT(*) FROM revenue_rollup').fetchone()[0]
+            if own_conn:
+                conn.commit()
+            return count
+        except Exception as e:
+            if own_conn:
+                conn.rollback()
+            raise e
+        finally:
+            if own_conn:
+                conn.close()
+
+    @staticmethod
+    def get_by_year(year):
+        """연도별 집계 행 조회"""
+        conn = get_db_connection()
+        try:
+            return conn.execute('''
+                SELECT month, category, item_type, hours, amount
+                FROM revenue_rollup
+                WHERE year = ?
+                ORDER BY month, category, item_type
+            ''', (year,)).fetchall()
+        finally:
+            conn.close()
@@ -1,8 +1,11 @@
 from app.database.init_db import get_db_connection
+from app.models.revenue_rollup import RevenueRollup
 from datetime import datetime
 from app.models.service_report_part import ServiceReportPart
 from app.models.service_report_time_record import ServiceReportTimeRecord
+from app.models.document_sequence import DocumentSequence
 import uuid as _uuid_module
+import html
 
 class ServiceReport:
     def __init__(self, id=None, report_number=None, customer_id=None,
@@ -11,7 +14,7 @@ class ServiceReport:
                  solution_description=None, parts_used=None, work_hours=None,
                  status='completed', invoice_code_id=None, support_technician_ids=None,
                  is_locked=False, locked_by=None, locked_at=None,
-                 public_token=None, customer_signature=None, customer_signed_at=None,
+                 public_token=None, has_signature=False, customer_signed_at=None,
                  signer_name=None, created_at=None, updated_at=None):
         self.id = id
         self.report_number = report_number
@@ -31,22 +34,28 @@ class ServiceReport:
         self.locked_by = locked_by
         self.locked_at = locked_at
         self.public_token = public_token
-        self.customer_signature = customer_signature
+        self.has_signature = has_signature  # 서명 이미지는 service_report_signatures에 보관
         self.customer_signed_at = customer_signed_at
         self.signer_name = signer_name
         self.created_at = created_at
         self.updated_at = updated_at
     
     @classmethod
-    def get_all(cls, page=1, per_page=10):
-        """모든 서비스 리포트 조회 (페이징)"""
+    def get_all(cls, page=1, per_page=10, with_children=True):
+        """
+        모든 서비스 리포트 조회 (페이징)
+
+        Args:
+            with_children: True면 사용부품/시간기록을 함께 조회 (False: 목록용 요약)
+        """
         conn = get_db_connection()
         offset = (page - 1) * per_page
         
         reports_data = conn.execute('''
             SELECT sr.*, c.company_name, c.address as customer_address, u.name as technician_name,
                    ic.code as invoice_code, ic.description as invoice_description,
-                   i.id as invoice_id
+                   i.id as invoice_id,
+                   EXISTS(SELECT 1 FROM service_report_signatures sig WHERE sig.service_report_id = sr.id) as has_signature
             FROM service_reports sr
             LEFT JOIN customers c ON sr.customer_id = c.id
             LEFT JOIN users u ON sr.technician_id = u.id
@@ -57,7 +66,6 @@ class ServiceReport:
         ''', (per_page, offset)).fetchall()
         
         total = conn.execute('SELECT COUNT(*) FROM service_reports').fetchone()[0]
-        conn.close()
         
         reports = []
         for data in reports_data:
@@ -70,6 +78,10 @@ class ServiceReport:
             report.invoice_description = data['invoice_description']
             report.invoice_id = data['invoice_id'] if 'invoice_id' in data.keys() else None
             reports.append(report)
+
+        if with_children:
+            cls._attach_children(conn, reports)
+        conn.close()
         
         return reports, total
     
@@ -80,7 +92,8 @@ class ServiceReport:
         data = conn.execute('''
             SELECT sr.*, c.company_name, c.address as customer_address, u.name as technician_name,
                    ic.code as invoice_code, ic.description as invoice_description,
-                   i.id as invoice_id
+                   i.id as invoice_id,
+                   EXISTS(SELECT 1 FROM service_report_signatures sig WHERE sig.service_report_id = sr.id) as has_signature
             FROM service_reports sr
             LEFT JOIN customers c ON sr.customer_id = c.id
             LEFT JOIN users u ON sr.technician_id = u.id
@@ -101,6 +114,35 @@ class ServiceReport:
             return report
         return None
 
+    @classmethod
+    def get_by_service_date(cls, start_date, end_date):
+        """서비스 날짜 범위의 리포트 전체 (일괄 PDF용, 사용부품/시간기록 포함, 날짜/번호순)"""
+        conn = get_db_connection()
+        try:
+            rows = conn.execute('''
+                SELECT sr.*, c.company_name, c.address as customer_address, u.name as technician_name,
+                       ic.code as invoice_code, ic.description as invoice_description,
+                       EXISTS(SELECT 1 FROM service_report_signatures sig WHERE sig.service_report_id = sr.id) as has_signature
+                FROM service_reports sr
+                LEFT JOIN customers c ON sr.customer_id = c.id
+                LEFT JOIN users u ON sr.technician_id = u.id
+                LEFT JOIN invoice_codes ic ON sr.invoice_code_id = ic.id
+                WHERE sr.service_date >= ? AND sr.service_date <= ?
+                ORDER BY sr.service_date, sr.report_number
+            ''', (start_date, end_date)).fetchall()
+
+            reports = []
+            for data in rows:
+                report = cls._from_db_row(data)
+                report.customer_name = data['company_name']
+                report.customer_address = data['customer_address']
+                report.technician_name = data['technician_name']
+                reports.append(report)
+            cls._attach_children(conn, reports)
+            return reports
+        finally:
+            conn.close()
+
     @classmethod
     def get_by_public_token(cls, token):
         """공개 토큰으로 서비스 리포트 조회 (인증 없이 접근 가능)"""
@@ -108,7 +150,8 @@ class ServiceReport:
         data = conn.execute('''
             SELECT sr.*, c.company_name, c.address as customer_address, u.name as technician_name,
                    ic.code as invoice_code, ic.description as invoice_description,
-                   i.id as invoice_id
+                   i.id as invoice_id,
+                   EXISTS(SELECT 1 FROM service_report_signatures sig WHERE sig.service_report_id = sr.id) as has_signature
             FROM service_reports sr
             LEFT JOIN customers c ON sr.customer_id = c.id
             LEFT JOIN users u ON sr.technician_id = u.id
@@ -125,67 +168,148 @@ class ServiceReport:
             return report
         return None
 
+    # FTS 검색 순위 가중치 (service_reports_fts 컬럼 순서)
+    # report_number, machine_model, machine_serial, problem_description, solution_description, customer_name
+    _FTS_WEIGHTS = (10.0, 5.0, 5.0, 1.0, 1.0, 3.0)
+    _SNIPPET_OPEN, _SNIPPET_CLOSE = '\x02', '\x03'
+
     @classmethod
-    def search(cls, keyword=None, customer_id=None, technician_id=None, 
-               start_date=None, end_date=None, page=1, per_page=10):
-        """서비스 리포트 검색"""
+    def search(cls, keyword=None, customer_id=None, technician_id=None,
+               start_date=None, end_date=None, page=1, per_page=10, with_children=True):
+        """
+        서비스 리포트 검색 (with_children: get_all 참고)
+
+        keyword는 공백으로 나눈 단어를 모두 포함하는 리포트를 찾는다.
+        3글자 이상 단어는 service_reports_fts(trigram) 인덱스로 찾아 관련도순으로 정렬하고,
+        일치 부분을 <mark>로 감싼 search_snippet을 채운다. 3글자 미만 단어만 있으면 LIKE 검색.
+        총 개수는 같은 쿼리의 COUNT(*) OVER ()로 함께 조회한다.
+        """
         conn = get_db_connection()
         offset = (page - 1) * per_page
-        
-        query = '''
-            SELECT sr.*, c.company_name, u.name as technician_name,
-                   ic.code as invoice_code, ic.description as invoice_description
-            FROM service_reports sr
-            LEFT JOIN customers c ON sr.customer_id = c.id
-            LEFT JOIN users u ON sr.technician_id = u.id
-            LEFT JOIN invoice_codes ic ON sr.invoice_code_id = ic.id
-            WHERE 1=1
-        '''
+
+        terms = keyword.split() if keyword else []
+        fts_terms = [t for t in terms if len(t) >= 3]
+        use_fts = bool(fts_terms) and conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='service_reports_fts'"
+        ).fetchone() is not None
+
+        from_sql = 'service_reports sr'
+        order_sql = 'sr.created_at DESC'
+        where = []
         params = []
-        
-        if keyword:
-            query += ''' AND (sr.report_number LIKE ? OR sr.problem_description LIKE ? 
-                           OR sr.solution_description LIKE ? OR sr.machine_model LIKE ?)'''
-            keyword_param = f'%{keyword}%'
-            params.extend([keyword_param, keyword_param, keyword_param, keyword_param])
-        
+
+        if use_fts:
+            # bm25()는 윈도 함수와 같은 SELECT에서 쓸 수 없으므로 FTS 매칭/순위는 서브쿼리에서 계산
+            fts_where = ['service_reports_fts MATCH ?']
+            fts_query = ' AND '.join('"' + t.replace('"', '""') + '"' for t in fts_terms)
+            params.append(fts_query)
+            # 짧은 단어는 인덱스 행의 컬럼에서 LIKE로 거름
+            for term in terms:
+                if len(term) < 3:
+                    fts_where.append('''(report_number LIKE ? OR machine_model LIKE ? OR machine_serial LIKE ?
+                                         OR problem_description LIKE ? OR solution_description LIKE ?
+                                         OR customer_name LIKE ?)''')
+                    params.extend([f'%{term}%'] * 6)
+            weights = ', '.join(str(w) for w in cls._FTS_WEIGHTS)
+            from_sql = f'''(
+                SELECT rowid, bm25(service_reports_fts, {weights}) as fts_rank
+                FROM service_reports_fts WHERE {' AND '.join(fts_where)}
+            ) fts JOIN service_reports sr ON sr.id = fts.rowid'''
+            order_sql = 'fts.fts_rank, sr.created_at DESC'
+        elif terms:
+            from app.models.customer import Customer
+            for term in terms:
+                alias_sql, alias_params = Customer.alias_match_sql(conn, term)
+                where.append(f'''(sr.report_number LIKE ? OR sr.problem_description LIKE ?
+                                 OR sr.solution_description LIKE ? OR sr.machine_model LIKE ?
+                                 OR sr.machine_serial LIKE ? OR sr.customer_id IN ({alias_sql}))''')
+                params.extend([f'%{term}%'] * 5 + alias_params)
+
         if customer_id:
-            query += ' AND sr.customer_id = ?'
+            where.append('sr.customer_id = ?')
             params.append(customer_id)
-        
+
         if technician_id:
-            query += ' AND sr.technician_id = ?'
+            where.append('sr.technician_id = ?')
             params.append(technician_id)
-        
+
         if start_date:
-            query += ' AND sr.service_date >= ?'
+            where.append('sr.service_date >= ?')
             params.append(start_date)
-        
+
         if end_date:
-            query += ' AND sr.service_date <= ?'
+            where.append('sr.service_date <= ?')
             params.append(end_date)
-        
-        query += ' ORDER BY sr.created_at DESC LIMIT ? OFFSET ?'
-        params.extend([per_page, offset])
-        
-        reports_data = conn.execute(query, params).fetchall()
-        
-        # 총 개수 조회
-        count_query = query.replace('SELECT sr.*, c.company_name, u.name as technician_name', 'SELECT COUNT(*)')
-        count_query = count_query.replace('ORDER BY sr.created_at DESC LIMIT ? OFFSET ?', '')
-        count_params = params[:-2]  # LIMIT, OFFSET 제외
-        total = conn.execute(count_query, count_params).fetchone()[0]
-        
-        conn.close()
-        
+
+        where_sql = ' AND '.join(where) if where else '1=1'
+        reports_data = conn.execute(f'''
+            SELECT sr.*, c.company_name, u.name as technician_name,
+                   ic.code as invoice_code, ic.description as invoice_description,
+                   EXISTS(SELECT 1 FROM service_report_signatures sig WHERE sig.service_report_id = sr.id) as has_signature,
+                   COUNT(*) OVER () as total_count
+            FROM {from_sql}
+            LEFT JOIN customers c ON sr.customer_id = c.id
+            LEFT JOIN users u ON sr.technician_id = u.id
+            LEFT JOIN invoice_codes ic ON sr.invoice_code_id = ic.id
+            WHERE {where_sql}
+            ORDER BY {order_sql}
+            LIMIT ? OFFSET ?
+        ''', params + [per_page, offset]).fetchall()
+
+        if reports_data:
+            total = reports_data[0]['total_count']
+        elif offset:
+            # 마지막 페이지를 넘긴 경우에만 개수를 따로 조회
+            total = conn.execute(f'SELECT COUNT(*) FROM {from_sql} WHERE {where_sql}', params).fetchone()[0]
+        else:
+            total = 0
+
+        snippets = cls._search_snippets(conn, fts_query, [row['id'] for row in reports_data]) if use_fts else {}
+
         reports = []
         for data in reports_data:
             report = cls._from_db_row(data)
             report.customer_name = data['company_name']
             report.technician_name = data['technician_name']
+            if use_fts:
+                report.search_snippet = snippets.get(data['id'])
             reports.append(report)
-        
+
+        if with_children:
+            cls._attach_children(conn, reports)
+        conn.close()
+
         return reports, total
+
+    @classmethod
+    def _search_snippets(cls, conn, fts_query, report_ids):
+        """
+        현재 페이지 리포트의 검색어 일치 부분 (id -> HTML)
+        일치 표시는 제어문자로 받아 본문을 HTML 이스케이프한 뒤 <mark>로 바꾼다.
+        """
+        if not report_ids:
+            return {}
+        placeholders = ','.join('?' * len(report_ids))
+        rows = conn.execute(f'''
+            SELECT rowid, snippet(service_reports_fts, -1, ?, ?, '…', 16) as snippet
+            FROM service_reports_fts
+            WHERE service_reports_fts MATCH ? AND rowid IN ({placeholders})
+        ''', [cls._SNIPPET_OPEN, cls._SNIPPET_CLOSE, fts_query] + list(report_ids)).fetchall()
+        return {
+            row['rowid']: html.escape(row['snippet'] or '')
+                .replace(cls._SNIPPET_OPEN, '<mark>').replace(cls._SNIPPET_CLOSE, '</mark>')
+            for row in rows
+        }
+
+    @classmethod
+    def _attach_children(cls, conn, reports):
+        """목록의 사용부품/시간기록을 IN 쿼리 두 번으로 조회해 각 리포트에 채움"""
+        ids = [report.id for report in reports if report.id]
+        parts = ServiceReportPart.get_by_service_report_ids(conn, ids)
+        time_records = ServiceReportTimeRecord.get_by_service_report_ids(conn, ids)
+        for report in reports:
+            report._parts = parts.get(report.id, [])
+            report._time_records = time_records.get(report.id, [])
     
     def save(self):
         """서비스 리포트 저장 (생성 또는 수정)"""
@@ -196,6 +320,9 @@ class ServiceReport:
             if self.id:
                 # 수정
                 print(f"[DEBUG] Updating existing report with id: {self.id}")
+                previous = conn.execute(
+                    'SELECT invoice_code_id FROM service_reports WHERE id=?', (self.id,)
+                ).fetchone()
                 conn.execute('''
                     UPDATE service_reports SET 
                     report_number=?, customer_id=?, technician_id=?, machine_model=?,
@@ -208,12 +335,15 @@ class ServiceReport:
                       self.problem_description, self.solution_description,
                       self.parts_used, self.work_hours, self.status, 
                       self.invoice_code_id, self.support_technician_ids, self.id))
+                # 코드가 바뀌면 연결된 발행 거래명세표의 카테고리별 집계도 갱신
+                if previous and previous['invoice_code_id'] != self.invoice_code_id:
+                    RevenueRollup.refresh_for_service_report(conn, self.id)
             else:
                 # 신규 생성
                 if not self.report_number:
-                    print("[DEBUG] Generating report number")
-                    self.report_number = self._generate_report_number()
-                    print(f"[DEBUG] Generated report number: {self.report_number}")
+                    # INSERT와 같은 트랜잭션에서 번호 발급
+                    self.report_number = self._allocate_report_number(conn)
+                    print(f"[DEBUG] Allocated report number: {self.report_number}")
 
                 if not self.public_token:
                     self.public_token = str(_uuid_module.uuid4())
@@ -252,6 +382,7 @@ class ServiceReport:
         if self.id:
             conn = get_db_connection()
             try:
+                conn.execute('DELETE FROM service_report_signatures WHERE service_report_id = ?', (self.id,))
                 conn.execute('DELETE FROM service_reports WHERE id = ?', (self.id,))
                 conn.commit()
                 return True
@@ -262,40 +393,12 @@ class ServiceReport:
                 conn.close()
         return False
     
-    def _generate_report_number(self):
-        """리포트 번호 자동 생성 (SR-YYYYMMDD-001 형식)"""
-        try:
-            conn = get_db_connection()
-            today = datetime.now().strftime('%Y%m%d')
-            prefix = f'SR-{today}-'
-            
-            print(f"[DEBUG] Generating report number with prefix: {prefix}")
-            
-            # 오늘 날짜의 마지막 리포트 번호 조회
-            last_report = conn.execute('''
-                SELECT report_number FROM service_reports 
-                WHERE report_number LIKE ? 
-                ORDER BY report_number DESC LIMIT 1
-            ''', (f'{prefix}%',)).fetchone()
-            
-            if last_report:
-                print(f"[DEBUG] Found last report: {last_report['report_number']}")
-                last_num = int(last_report['report_number'].split('-')[-1])
-                new_num = last_num + 1
-            else:
-                print("[DEBUG] No previous reports found for today")
-                new_num = 1
-            
-            conn.close()
-            new_report_number = f'{prefix}{new_num:03d}'
-            print(f"[DEBUG] Generated new report number: {new_report_number}")
-            return new_report_number
-        except Exception as e:
-            print(f"[ERROR] Error generating report number: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise e
-    
+    def _allocate_report_number(self, conn):
+        """conn의 트랜잭션 안에서 리포트 번호 발급 (SR-YYYYMMDD-001 형식)"""
+        prefix = f"SR-{datetime.now().strftime('%Y%m%d')}-"
+        number = DocumentSequence.allocate(conn, DocumentSequence.SERVICE_REPORT, prefix)
+        return f'{prefix}{number:03d}'
+
     @classmethod
     def _from_db_row(cls, row):
         """데이터베이스 행에서 객체 생성"""
@@ -318,7 +421,7 @@ class ServiceReport:
             locked_by=row['locked_by'] if 'locked_by' in row.keys() else None,
             locked_at=row['locked_at'] if 'locked_at' in row.keys() else None,
             public_token=row['public_token'] if 'public_token' in row.keys() else None,
-            customer_signature=row['customer_signature'] if 'customer_signature' in row.keys() else None,
+            has_signature=bool(row['has_signature']) if 'has_signature' in row.keys() else False,
             customer_signed_at=row['customer_signed_at'] if 'customer_signed_at' in row.keys() else None,
             signer_name=row['signer_name'] if 'signer_name' in row.keys() else None,
             created_at=row['created_at'],
@@ -360,6 +463,8 @@ class ServiceReport:
         """서비스 리포트의 사용부품 목록 조회"""
         if not self.id:
             return []
+        if getattr(self, '_parts', None) is not None:
+            return self._parts  # 목록 조회 시 미리 채워둔 값
         return ServiceReportPart.get_by_service_report_id(self.id)
 
     def save_time_records(self, time_records_data):
@@ -395,10 +500,17 @@ class ServiceReport:
         """서비스 리포트의 시간기록 목록 조회"""
         if not self.id:
             return []
+        if getattr(self, '_time_records', None) is not None:
+            return self._time_records  # 목록 조회 시 미리 채워둔 값
         return ServiceReportTimeRecord.get_by_service_report_id(self.id)
 
-    def to_dict(self):
-        """딕셔너리로 변환"""
+    def to_dict(self, include_children=True):
+        """
+        딕셔너리로 변환
+
+        Args:
+            include_children: False면 사용부품/시간기록(used_parts, time_records, time_record) 제외
+        """
         import json
 
         result = {
@@ -421,16 +533,17 @@ class ServiceReport:
             'locked_at': self.locked_at,
             'invoice_id': getattr(self, 'invoice_id', None),  # 거래명세서 ID (조인으로 가져옴)
             'public_token': self.public_token,
-            'has_signature': bool(self.customer_signature),
-            'customer_signature': self.customer_signature,
+            'has_signature': self.has_signature,
+            'signature_url': f'/api/service-reports/{self.id}/signature' if self.has_signature else None,
+            'search_snippet': getattr(self, 'search_snippet', None),  # 키워드 검색 시 일치 부분 (<mark>)
             'customer_signed_at': self.customer_signed_at,
             'signer_name': self.signer_name,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
         
-        # 새로운 부품 정보 포함
-        if self.id:
+        # 새로운 부품 정보 포함 (include_children=False면 제외)
+        if include_children and self.id:
             parts = self.get_parts()
             result['used_parts'] = [part.to_dict() for part in parts]
             
@@ -440,7 +553,7 @@ class ServiceReport:
             
             # 하위 호환성을 위한 time_record (첫 번째 시간기록)
             result['time_record'] = time_records[0].to_dict() if time_records else None
-        else:
+        elif include_children:
             result['used_parts'] = []
             result['time_records'] = []
             result['time_record'] = None
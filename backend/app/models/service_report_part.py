@@ -1,4 +1,4 @@
-from app.database.init_db import get_db_connection
+from app.database.init_db import fetch_in_chunks, get_db_connection
 from datetime import datetime
 
 class ServiceReportPart:
@@ -61,6 +61,27 @@ class ServiceReportPart:
             parts.append(part)
         return parts
 
+    @classmethod
+    def get_by_service_report_ids(cls, conn, service_report_ids):
+        """
+        여러 서비스 리포트의 사용부품을 IN 쿼리로 한꺼번에 조회
+
+        Args:
+            conn: 데이터베이스 연결 (목록 조회와 같은 연결 사용)
+            service_report_ids: 서비스 리포트 ID 목록
+
+        Returns:
+            dict: {service_report_id: [사용부품, ...]}
+        """
+        result = {}
+        for row in fetch_in_chunks(conn, '''
+            SELECT * FROM service_report_parts
+            WHERE service_report_id IN ({placeholders})
+            ORDER BY service_report_id, id
+        ''', service_report_ids):
+            result.setdefault(row['service_report_id'], []).append(cls._from_db_row(row))
+        return result
+
     @classmethod
     def delete_by_service_report_id(cls, service_report_id):
         """서비스 리포트의 모든 사용부품 삭제"""
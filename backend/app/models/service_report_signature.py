@@ -0,0 +1,113 @@
+"""
+서비스 리포트 고객 서명 이미지
+서명은 service_reports 행이 아닌 service_report_signatures 테이블에 바이너리로 보관한다.
+(목록/검색 쿼리가 base64 이미지를 읽지 않도록 분리)
+"""
+import base64
+import binascii
+import hashlib
+import sqlite3
+
+from app.database.init_db import fetch_in_chunks, get_db_connection
+
+ALLOWED_MIME_TYPES = ('image/png', 'image/jpeg', 'image/webp')
+MAX_SIGNATURE_BYTES = 2 * 1024 * 1024
+
+
+class ServiceReportSignature:
+    @staticmethod
+    def decode_data_url(data_url):
+        """
+        data:image/...;base64,... 문자열을 (mime_type, bytes)로 변환
+
+        Raises:
+            ValueError: 형식이 잘못되었거나 지원하지 않는 이미지
+        """
+        header, sep, payload = (data_url or '').partition(',')
+        if not sep or not header.startswith('data:') or not header.endswith(';base64'):
+            raise ValueError('유효하지 않은 서명 데이터입니다.')
+        mime_type = header[len('data:'):-len(';base64')].lower()
+        if mime_type not in ALLOWED_MIME_TYPES:
+            raise ValueError('지원하지 않는 서명 이미지 형식입니다.')
+        try:
+            image = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError('유효하지 않은 서명 데이터입니다.')
+        if not image or len(image) > MAX_SIGNATURE_BYTES:
+            raise ValueError('서명 이미지 크기가 올바르지 않습니다.')
+        return mime_type, image
+
+    @staticmethod
+    def to_data_url(mime_type, image):
+        return f'data:{mime_type};base64,{base64.b64encode(image).decode("ascii")}'
+
+    @staticmethod
+    def etag(row):
+        """서명 이미지 ETag (서명은 수정되지 않고 삭제 후 재서명만 가능하므로 내용 해시로 충분)"""
+        return hashlib.sha1(bytes(row['image'])).hexdigest()[:20]
+
+    @classmethod
+    def get(cls, service_report_id):
+        """서명 행 조회 (mime_type, image, created_at) — 없으면 None"""
+        conn = get_db_connection()
+        try:
+            return conn.execute('''
+                SELECT service_report_id, mime_type, image, created_at
+                FROM service_report_signatures
+                WHERE service_report_id = ?
+            ''', (service_report_id,)).fetchone()
+        finally:
+            conn.close()
+
+    @classmethod
+    def get_data_url(cls, service_report_id):
+        """PDF/인쇄용 data URL (없으면 None)"""
+        row = cls.get(service_report_id)
+        return cls.to_data_url(row['mime_type'], bytes(row['image'])) if row else None
+
+    @classmethod
+    def get_data_urls(cls, conn, service_report_ids):
+        """여러 리포트의 서명 data URL을 한 번에 조회 (id -> data URL)"""
+        result = {}
+        for row in fetch_in_chunks(conn, '''
+            SELECT service_report_id, mime_type, image FROM service_report_signatures
+            WHERE service_report_id IN ({placeholders})
+        ''', service_report_ids):
+            result[row['service_report_id']] = cls.to_data_url(row['mime_type'], bytes(row['image']))
+        return result
+
+    @classmethod
+    def create(cls, conn, service_report_id, data_url, signer_name=None):
+        """
+        서명 저장 (conn의 트랜잭션 안에서, 커밋은 호출자)
+        이미 서명이 있으면 False 반환 (1회만 서명 가능)
+
+        Raises:
+            ValueError: 서명 데이터 형식 오류
+        """
+        mime_type, image = cls.decode_data_url(data_url)
+        try:
+            conn.execute('''
+                INSERT INTO service_report_signatures (service_report_id, mime_type, image)
+                VALUES (?, ?, ?)
+            ''', (service_report_id, mime_type, sqlite3.Binary(image)))
+        except sqlite3.IntegrityError:
+            return False
+        conn.execute(
+            'UPDATE service_reports SET customer_signed_at=CURRENT_TIMESTAMP, signer_name=? WHERE id=?',
+            (signer_name, service_report_id)
+        )
+        return True
+
+    @classmethod
+    def delete(cls, conn, service_report_id):
+        """서명 삭제 (커밋은 호출자). 삭제된 서명이 없으면 False"""
+        deleted = conn.execute(
+            'DELETE FROM service_report_signatures WHERE service_report_id = ?',
+            (service_report_id,)
+        ).rowcount
+        conn.execute(
+            'UPDATE service_reports SET customer_signed_at=NULL WHERE id=?',
+            (service_report_id,)
+        )
+        return deleted > 0
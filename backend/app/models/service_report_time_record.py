@@ -1,4 +1,4 @@
-from app.database.init_db import get_db_connection
+from app.database.init_db import fetch_in_chunks, get_db_connection
 from datetime import datetime
 
 class ServiceReportTimeRecord:
@@ -6,6 +6,7 @@ class ServiceReportTimeRecord:
                  departure_time=None, work_start_time=None, work_end_time=None,
                  travel_end_time=None, work_meal_time=None, travel_meal_time=None,
                  calculated_work_time=None, calculated_travel_time=None,
+                 work_minutes=None, travel_minutes=None,
                  created_at=None, updated_at=None):
         self.id = id
         self.service_report_id = service_report_id
@@ -18,6 +19,8 @@ class ServiceReportTimeRecord:
         self.travel_meal_time = travel_meal_time
         self.calculated_work_time = calculated_work_time
         self.calculated_travel_time = calculated_travel_time
+        self.work_minutes = work_minutes  # 계산된 작업시간 (분, 집계용)
+        self.travel_minutes = travel_minutes  # 계산된 이동시간 (분, 집계용)
         self.created_at = created_at
         self.updated_at = updated_at
 
@@ -31,22 +34,26 @@ class ServiceReportTimeRecord:
                 UPDATE service_report_time_records
                 SET work_date=?, departure_time=?, work_start_time=?, work_end_time=?,
                     travel_end_time=?, work_meal_time=?, travel_meal_time=?,
-                    calculated_work_time=?, calculated_travel_time=?, updated_at=?
+                    calculated_work_time=?, calculated_travel_time=?,
+                    work_minutes=?, travel_minutes=?, updated_at=?
                 WHERE id=?
             ''', (self.work_date, self.departure_time, self.work_start_time, self.work_end_time,
                   self.travel_end_time, self.work_meal_time, self.travel_meal_time,
                   self.calculated_work_time, self.calculated_travel_time,
+                  self.work_minutes, self.travel_minutes,
                   datetime.now().isoformat(), self.id))
         else:
             # 신규 생성
             cursor = conn.execute('''
                 INSERT INTO service_report_time_records 
                 (service_report_id, work_date, departure_time, work_start_time, work_end_time,
-                 travel_end_time, work_meal_time, travel_meal_time, calculated_work_time, calculated_travel_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 travel_end_time, work_meal_time, travel_meal_time, calculated_work_time, calculated_travel_time,
+                 work_minutes, travel_minutes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (self.service_report_id, self.work_date, self.departure_time, self.work_start_time,
                   self.work_end_time, self.travel_end_time, self.work_meal_time, self.travel_meal_time,
-                  self.calculated_work_time, self.calculated_travel_time))
+                  self.calculated_work_time, self.calculated_travel_time,
+                  self.work_minutes, self.travel_minutes))
             self.id = cursor.lastrowid
         
         conn.commit()
@@ -70,6 +77,27 @@ class ServiceReportTimeRecord:
             records.append(record)
         return records
 
+    @classmethod
+    def get_by_service_report_ids(cls, conn, service_report_ids):
+        """
+        여러 서비스 리포트의 시간기록을 IN 쿼리로 한꺼번에 조회
+
+        Args:
+            conn: 데이터베이스 연결 (목록 조회와 같은 연결 사용)
+            service_report_ids: 서비스 리포트 ID 목록
+
+        Returns:
+            dict: {service_report_id: [시간기록, ...]}
+        """
+        result = {}
+        for row in fetch_in_chunks(conn, '''
+            SELECT * FROM service_report_time_records
+            WHERE service_report_id IN ({placeholders})
+            ORDER BY service_report_id, work_date, id
+        ''', service_report_ids):
+            result.setdefault(row['service_report_id'], []).append(cls._from_db_row(row))
+        return result
+
     @classmethod
     def delete_by_service_report_id(cls, service_report_id):
         """서비스 리포트의 모든 시간기록 삭제"""
@@ -92,108 +120,56 @@ class ServiceReportTimeRecord:
         return True
 
     def calculate_times(self):
-        """작업시간과 이동시간을 자동 계산"""
-        try:
-            # 작업시간 계산
-            if self.work_start_time and self.work_end_time:
-                work_time = self._calculate_time_difference(self.work_start_time, self.work_end_time)
-                if work_time:
-                    # 식사시간 차감 (HH:MM 형식에서 분 변환)
-                    work_meal_minutes = self._time_to_minutes(self.work_meal_time) if self.work_meal_time else 0
-                    work_time = self._subtract_minutes(work_time, work_meal_minutes)
-                    self.calculated_work_time = work_time
-            
-            # 이동시간 계산 (전체 시간 - 작업시간)
-            if (self.departure_time and self.travel_end_time and 
-                self.work_start_time and self.work_end_time):
-                total_time = self._calculate_time_difference(self.departure_time, self.travel_end_time)
-                work_duration = self._calculate_time_difference(self.work_start_time, self.work_end_time)
-                
-                if total_time and work_duration:
-                    travel_time = self._subtract_time_duration(total_time, work_duration)
-                    # 식사시간 차감 (HH:MM 형식에서 분 변환)
-                    travel_meal_minutes = self._time_to_minutes(self.travel_meal_time) if self.travel_meal_time else 0
-                    travel_time = self._subtract_minutes(travel_time, travel_meal_minutes)
-                    self.calculated_travel_time = travel_time
-                    
-        except Exception as e:
-            print(f"[DEBUG] 시간 계산 오류: {e}")
-            pass
-
-    def _calculate_time_difference(self, start_time, end_time):
-        """시작시간과 종료시간의 차이를 HH:MM 형식으로 계산"""
+        """
+        작업시간과 이동시간을 자동 계산
+        분 단위(work_minutes/travel_minutes)로 계산한 뒤 HH:MM 문자열을 만든다.
+        출발/도착 시각이 없으면 입력받은 calculated_* 문자열에서 분을 구한다.
+        """
+        start = self.parse_minutes(self.work_start_time)
+        end = self.parse_minutes(self.work_end_time)
+        departure = self.parse_minutes(self.departure_time)
+        arrival = self.parse_minutes(self.travel_end_time)
+
+        if start is not None and end is not None:
+            work_duration = self._duration(start, end)
+            # 식사시간 차감
+            self.work_minutes = max(work_duration - (self.parse_minutes(self.work_meal_time) or 0), 0)
+            self.calculated_work_time = self.format_minutes(self.work_minutes)
+
+            # 이동시간 = 전체 시간 - 작업시간 - 이동 중 식사시간
+            if departure is not None and arrival is not None:
+                travel = self._duration(departure, arrival) - work_duration
+                travel = max(travel, 0) - (self.parse_minutes(self.travel_meal_time) or 0)
+                self.travel_minutes = max(travel, 0)
+                self.calculated_travel_time = self.format_minutes(self.travel_minutes)
+
+        if self.work_minutes is None:
+            self.work_minutes = self.parse_minutes(self.calculated_work_time)
+        if self.travel_minutes is None:
+            self.travel_minutes = self.parse_minutes(self.calculated_travel_time)
+
+    @staticmethod
+    def parse_minutes(value):
+        """HH:MM 문자열을 분으로 변환 (비어 있거나 형식이 다르면 None)"""
+        if not value:
+            return None
+        hours, sep, minutes = str(value).strip().partition(':')
+        if not sep:
+            return None
         try:
-            from datetime import datetime, timedelta
-            
-            # "HH:MM" 형식을 datetime 객체로 변환
-            start = datetime.strptime(start_time, "%H:%M")
-            end = datetime.strptime(end_time, "%H:%M")
-            
-            # 종료시간이 시작시간보다 이른 경우 (다음날로 넘어간 경우)
-            if end < start:
-                end += timedelta(days=1)
-            
-            # 시간 차이 계산
-            diff = end - start
-            hours = diff.seconds // 3600
-            minutes = (diff.seconds % 3600) // 60
-            
-            return f"{hours:02d}:{minutes:02d}"
-        except:
+            return int(hours) * 60 + int(minutes)
+        except ValueError:
             return None
 
-    def _time_to_minutes(self, time_str):
-        """HH:MM 형식의 시간을 분으로 변환"""
-        try:
-            if not time_str:
-                return 0
-            
-            from datetime import datetime
-            time_obj = datetime.strptime(time_str, "%H:%M")
-            return time_obj.hour * 60 + time_obj.minute
-        except:
-            return 0
-
-    def _subtract_minutes(self, time_str, minutes):
-        """HH:MM 형식의 시간에서 분을 빼기"""
-        try:
-            from datetime import datetime, timedelta
-            
-            time_obj = datetime.strptime(time_str, "%H:%M")
-            result = time_obj - timedelta(minutes=minutes)
-            
-            # 음수가 되는 경우 0:00 반환
-            if result.hour < 0 or (result.hour == 0 and result.minute < 0):
-                return "00:00"
-                
-            return f"{result.hour:02d}:{result.minute:02d}"
-        except:
-            return time_str
-
-    def _subtract_time_duration(self, total_time, work_time):
-        """전체시간에서 작업시간을 빼서 이동시간 계산"""
-        try:
-            from datetime import datetime, timedelta
-            
-            total = datetime.strptime(total_time, "%H:%M")
-            work = datetime.strptime(work_time, "%H:%M")
-            
-            # 시간을 분으로 변환
-            total_minutes = total.hour * 60 + total.minute
-            work_minutes = work.hour * 60 + work.minute
-            
-            travel_minutes = total_minutes - work_minutes
-            
-            # 음수가 되는 경우 0:00 반환
-            if travel_minutes < 0:
-                return "00:00"
-            
-            hours = travel_minutes // 60
-            minutes = travel_minutes % 60
-            
-            return f"{hours:02d}:{minutes:02d}"
-        except:
-            return "00:00"
+    @staticmethod
+    def format_minutes(minutes):
+        """분을 HH:MM 문자열로 변환"""
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    @staticmethod
+    def _duration(start_minutes, end_minutes):
+        """시작~종료 시각 사이의 분 (종료가 더 이르면 다음날로 넘어간 것으로 계산)"""
+        return (end_minutes - start_minutes) % (24 * 60)
 
     @classmethod
     def _from_db_row(cls, row):
@@ -210,6 +186,8 @@ class ServiceReportTimeRecord:
             travel_meal_time=row['travel_meal_time'],
             calculated_work_time=row['calculated_work_time'],
             calculated_travel_time=row['calculated_travel_time'],
+            work_minutes=row['work_minutes'] if 'work_minutes' in row.keys() else None,
+            travel_minutes=row['travel_minutes'] if 'travel_minutes' in row.keys() else None,
             created_at=row['created_at'],
             updated_at=row['updated_at']
         )
@@ -229,6 +207,8 @@ class ServiceReportTimeRecord:
             'travel_meal_time': self.travel_meal_time,
             'calculated_work_time': self.calculated_work_time,
             'calculated_travel_time': self.calculated_travel_time,
+            'work_minutes': self.work_minutes,
+            'travel_minutes': self.travel_minutes,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+명함 이미지 썸네일 (파생 이미지) 생성
+휴대폰 원본(수 MB)을 목록/상세 화면에 그대로 내려보내지 않도록
+크기별 WebP + JPEG 파생 이미지를 static/business_cards/thumbnails에 만들어 둔다.
+
+- 업로드 시: schedule()로 웹 워커 안의 스레드 풀에서 생성 (응답을 기다리게 하지 않음)
+- 기존 파일: backfill()이 프로세스 풀로 한 번에 생성
+  (backend/ 디렉토리에서 python generate_business_card_thumbnails.py)
+- 요청 시 파생 이미지가 없거나 원본보다 오래되었으면 get_derivative()가 그 자리에서 생성
+- 파일 이름: {원본 이름}.{크기}.{webp|jpg} — 업로드 파일 이름은 타임스탬프로 고유하므로
+  같은 URL의 내용이 바뀌지 않아 오래 캐시해도 된다
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import quote
+
+SOURCE_FOLDER = os.path.join('static', 'business_cards')
+THUMBNAIL_FOLDER = os.path.join(SOURCE_FOLDER, 'thumbnails')
+
+# 긴 변 기준 픽셀 (큰 것부터 — 한 번 줄인 이미지를 다시 줄여 다음 크기를 만든다)
+THUMBNAIL_SIZES = {
+    'medium': 1024,
+    'thumb': 320,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', '2'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def derivative_path(source_path, size, fmt):
+    """원본 경로에 대한 파생 이미지 경로"""
+    return os.path.join(THUMBNAIL_FOLDER, f'{os.path.basename(source_path)}.{size}.{fmt}')
+
+
+def thumbnail_url(image_path, size='thumb'):
+    """고객 목록 등에 내려줄 파생 이미지 URL (이미지가 없으면 None)"""
+    if not image_path:
+        return None
+    return f'/api/customers/business-card/{quote(os.path.basename(image_path))}?size={size}'
+
+
+def is_stale(source_path):
+    """파생 이미지 중 하나라도 없거나 원본보다 오래되었으면 True"""
+    source_mtime = os.path.getmtime(source_path)
+    for size in THUMBNAIL_SIZES:
+        for fmt in FORMATS:
+            path = derivative_path(source_path, size, fmt)
+            if not os.path.exists(path) or os.path.getmtime(path) < source_mtime:
+                return True
+    return False
+
+
+def _save_atomic(image, path, fmt):
+    """임시 파일에 쓴 뒤 교체 (동시에 생성/전송 중이어도 반쯤 쓴 파일이 보이지 않도록)"""
+    pil_format, options = FORMATS[fmt]
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        image.save(tmp_path, pil_format, **options)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def generate_derivatives(source_path):
+    """
+    원본 1장에서 모든 크기/형식의 파생 이미지 생성
+
+    Returns:
+        list: 생성한 파생 이미지 경로
+    """
+    from PIL import Image, ImageOps
+    try:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+    except ImportError:
+        pass
+
+    os.makedirs(THUMBNAIL_FOLDER, exist_ok=True)
+    largest = max(THUMBNAIL_SIZES.values())
+    with Image.open(source_path) as image:
+        # JPEG는 디코딩 단계에서 필요한 크기 근처로 줄여 읽음
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    created = []
+    for size, max_side in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+        if max(image.size) > max_side:
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+        for fmt in FORMATS:
+            path = derivative_path(source_path, size, fmt)
+            _save_atomic(image, path, fmt)
+            created.append(path)
+    return created
+
+
+def _generate_logged(source_path):
+    try:
+        generate_derivatives(source_path)
+    except Exception as e:
+        print(f"[WARN] 명함 썸네일 생성 실패 {source_path}: {e}")
+
+
+def schedule(source_path):
+    """업로드된 명함의 파생 이미지를 백그라운드 스레드 풀에서 생성 (처음 호출 시 풀 시작)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS,
+                                               thread_name_prefix='business-card-thumbnail')
+    return _executor.submit(_generate_logged, source_path)
+
+
+def get_derivative(source_path, size, accept_webp):
+    """
+    요청에 보낼 파생 이미지 경로와 mimetype (없거나 오래되었으면 바로 생성)
+
+    Returns:
+        tuple: (경로, mimetype)
+    """
+    fmt = 'webp' if accept_webp else 'jpg'
+    if is_stale(source_path):
+        generate_derivatives(source_path)
+    return derivative_path(source_path, size, fmt), 'image/webp' if accept_webp else 'image/jpeg'
+
+
+def _backfill_one(source_path):
+    try:
+        generate_derivatives(source_path)
+        return source_path, None
+    except Exception as e:
+        return source_path, str(e)
+
+
+def backfill(folder=SOURCE_FOLDER, workers=None, progress=None):
+    """
+    파생 이미지가 없거나 오래된 기존 명함을 프로세스 풀로 일괄 생성
+
+    Returns:
+        dict: total(대상 수), done, failed([{path, error}])
+    """
+    targets = []
+    for entry in os.scandir(folder):
+        # 한글 파일명은 secure_filename에서 확장자까지 잘릴 수 있어 확장자로 거르지 않음
+        if entry.is_file() and is_stale(entry.path):
+            targets.append(entry.path)
+
+    status = {'total': len(targets), 'done': 0, 'failed': []}
+    if not targets:
+        return status
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, error in pool.map(_backfill_one, targets, chunksize=4):
+            if error:
+                status['failed'].append({'path': path, 'error': error})
+            else:
+                status['done'] += 1
+            if progress:
+                progress(status)
+    return status
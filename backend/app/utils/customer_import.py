@@ -0,0 +1,138 @@
+"""
+Customer Excel import
+엑셀 시트의 고객정보를 한 트랜잭션으로 일괄 등록/수정
+
+- 값 정리(공백 제거, 빈 값, 숫자 셀)는 DataFrame 단위 연산으로 처리
+- 기존 고객은 회사명으로 한 번에 조회해 매칭하고, 신규/수정은 각각 executemany 한 번
+- 같은 회사명이 시트에 여러 번 나오면 마지막 행을 반영하고 앞의 행은 skipped로 보고
+- 시트에 없는 컬럼과 빈 셀은 기존 고객의 값을 바꾸지 않는다 (값을 지우려고 올리는 시트는 없으므로
+  빈 셀은 "모름"으로 본다). 선택 컬럼이 하나도 없는 시트는 기존 고객의 updated_at만 갱신한다.
+- 신규 고객의 빈 담당자는 DEFAULT_CONTACT_PERSON, 나머지 빈 값은 '' (Customer.save와 동일)
+"""
+import pandas as pd
+
+from app.database.init_db import get_db_connection
+
+REQUIRED_COLUMNS = ['company_name']
+OPTIONAL_COLUMNS = ['contact_person', 'email', 'phone', 'address', 'postal_code',
+                    'tel', 'fax', 'president', 'mobile', 'contact']
+DEFAULT_CONTACT_PERSON = '담당자 미지정'
+
+
+def read_customer_excel(path):
+    """엑셀을 문자열로 읽기 (전화번호/우편번호 숫자 셀이 '12345.0'이 되지 않도록)"""
+    return pd.read_excel(path, dtype=str)
+
+
+def normalize_customer_frame(df):
+    """
+    가져올 컬럼만 남기고 값 정리
+
+    Returns:
+        DataFrame: row(엑셀 행 번호), company_name, 시트에 있는 선택 컬럼
+    """
+    columns = REQUIRED_COLUMNS + [col for col in OPTIONAL_COLUMNS if col in df.columns]
+    frame = df[columns].astype('string').apply(lambda s: s.str.strip()).fillna('')
+    # 엑셀에서 빈 셀처럼 보이는 값 정리
+    frame = frame.replace({'nan': '', 'None': '', 'NONE': ''})
+    frame.insert(0, 'row', df.index.to_numpy() + 2)  # 헤더 1행 + 0-based index
+    return frame
+
+
+def import_customers(df):
+    """
+    고객정보 일괄 등록/수정
+
+    Returns:
+        dict: created_count, updated_count, skipped_count, error_count,
+              rows([{row, company_name, status, customer_id, message}])
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f'필수 컬럼이 누락되었습니다: {", ".join(missing)}')
+
+    frame = normalize_customer_frame(df)
+    value_columns = [col for col in frame.columns if col not in ('row', 'company_name')]
+
+    report = pd.DataFrame({
+        'row': frame['row'],
+        'company_name': frame['company_name'],
+        'status': 'error',
+        'customer_id': None,
+        'message': '',
+    }, index=frame.index)
+
+    blank = frame['company_name'] == ''
+    report.loc[blank, 'message'] = '회사명은 필수 항목입니다.'
+
+    valid = frame[~blank]
+    duplicated = valid['company_name'].duplicated(keep='last')
+    last_rows = valid.groupby('company_name')['row'].transform('last')
+    report.loc[duplicated[duplicated].index, 'status'] = 'skipped'
+    report.loc[duplicated[duplicated].index, 'message'] = (
+        '행 ' + last_rows[duplicated].astype(str) + '의 같은 회사명으로 대체됨'
+    )
+    rows = valid[~duplicated]
+
+    conn = get_db_connection()
+    try:
+        # 기존 고객 매칭 (같은 회사명이 여러 개면 가장 먼저 등록된 고객)
+        existing = pd.read_sql_query(
+            'SELECT company_name, MIN(id) AS customer_id FROM customers GROUP BY company_name', conn
+        )
+        matched = rows.merge(existing, on='company_name', how='left')
+        matched.index = rows.index
+        is_update = matched['customer_id'].notna()
+        updates, inserts = matched[is_update], matched[~is_update]
+
+        if len(updates):
+            # 빈 셀은 기존 값 유지
+            set_sql = ''.join(f"{col}=COALESCE(NULLIF(?, ''), {col}), " for col in value_columns)
+            conn.executemany(
+                f'UPDATE customers SET {set_sql}updated_at=CURRENT_TIMESTAMP WHERE id=?',
+                list(updates[value_columns].assign(customer_id=updates['customer_id'].astype(int))
+                     .itertuples(index=False, name=None))
+            )
+            report.loc[updates.index, 'customer_id'] = updates['customer_id'].astype(int)
+            report.loc[updates.index, 'status'] = 'updated'
+
+        if len(inserts):
+            # 시트에 없는 컬럼은 빈 값, 빈 담당자는 DEFAULT_CONTACT_PERSON (Customer.save와 동일)
+            insert_columns = ['company_name'] + OPTIONAL_COLUMNS
+            values = inserts.reindex(columns=insert_columns, fill_value='')
+            values['contact_person'] = values['contact_person'].mask(values['contact_person'] == '',
+                                                                     DEFAULT_CONTACT_PERSON)
+            placeholders = ', '.join('?' * len(insert_columns))
+            conn.executemany(
+                f'INSERT INTO customers ({", ".join(insert_columns)}) VALUES ({placeholders})',
+                list(values.itertuples(index=False, name=None))
+            )
+            # 방금 넣은 고객 ID 조회 후 현재 상호 alias 등록 (Customer._sync_aliases와 동일)
+            new_ids = dict(conn.execute('''
+                SELECT company_name, MAX(id) FROM customers
+                WHERE company_name IN (SELECT value FROM json_each(?))
+                GROUP BY company_name
+            ''', (inserts['company_name'].to_json(orient='values', force_ascii=False),)).fetchall())
+            conn.executemany(
+                'INSERT OR IGNORE INTO customer_aliases (customer_id, name, is_current) VALUES (?, ?, 1)',
+                [(new_ids[name], name) for name in inserts['company_name']]
+            )
+            report.loc[inserts.index, 'customer_id'] = inserts['company_name'].map(new_ids)
+            report.loc[inserts.index, 'status'] = 'created'
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    counts = report['status'].value_counts()
+    report['customer_id'] = report['customer_id'].astype(object).where(report['customer_id'].notna(), None)
+    return {
+        'created_count': int(counts.get('created', 0)),
+        'updated_count': int(counts.get('updated', 0)),
+        'skipped_count': int(counts.get('skipped', 0)),
+        'error_count': int(counts.get('error', 0)),
+        'rows': report.to_dict(orient='records'),
+    }
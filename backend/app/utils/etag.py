@@ -0,0 +1,171 @@
+"""
+Conditional GET utilities
+테이블 버전(generation counter) 기반 ETag / Last-Modified 처리
+
+각 테이블에 INSERT/UPDATE/DELETE 트리거를 걸어 table_versions의 버전을 올린다.
+조회 엔드포인트는 본 쿼리 전에 버전만 확인하여, 클라이언트가 가진 ETag와 같으면
+쿼리와 직렬화 없이 304 Not Modified를 반환한다.
+"""
+import hashlib
+import os
+import sqlite3
+from email.utils import formatdate
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response
+from app.database.init_db import get_db_connection
+
+# 버전을 관리하는 테이블 목록
+VERSIONED_TABLES = [
+    'spare_parts',
+    'price_history',
+    'invoice_codes',
+    'invoice_rates',
+    'supplier_info',
+    'users',
+    'customers',
+    'invoices',
+    'invoice_items',
+    'service_reports',
+    'service_report_parts',
+    'service_report_time_records',
+]
+
+
+def install_version_triggers(conn):
+    """
+    table_versions 테이블과 버전 증가 트리거 생성 (init_database에서 호출)
+    Args:
+        conn: 데이터베이스 연결
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    for table in VERSIONED_TABLES:
+        conn.execute(
+            'INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)',
+            (table,)
+        )
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions
+                    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE table_name = '{table}';
+                END
+            ''')
+
+
+def get_table_versions(tables):
+    """
+    테이블 버전 조회
+    Args:
+        tables: 테이블 이름 목록
+    Returns:
+        tuple: (버전 문자열, 마지막 변경 시각 datetime 또는 None)
+    """
+    conn = get_db_connection()
+    try:
+        placeholders = ','.join('?' * len(tables))
+        rows = conn.execute(
+            f'SELECT table_name, version, updated_at FROM table_versions WHERE table_name IN ({placeholders})',
+            list(tables)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    versions = {row['table_name']: row['version'] for row in rows}
+    version_key = ','.join(f'{t}:{versions.get(t, 0)}' for t in tables)
+
+    last_modified = None
+    for row in rows:
+        if not row['updated_at']:
+            continue
+        try:
+            ts = datetime.strptime(row['updated_at'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if last_modified is None or ts > last_modified:
+            last_modified = ts
+
+    return version_key, last_modified
+
+
+def _file_version(path):
+    """파일 버전 문자열 (mtime/size) 및 변경 시각"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f'{path}:missing', None
+    modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+    return f'{path}:{stat.st_mtime_ns}:{stat.st_size}', modified
+
+
+def _not_modified(etag, last_modified):
+    """요청의 조건부 헤더가 현재 버전과 일치하는지 확인"""
+    if_none_match = request.if_none_match
+    if if_none_match:
+        return if_none_match.contains_weak(etag)
+
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+
+    return False
+
+
+def conditional_get(*tables, files=()):
+    """
+    조건부 GET 데코레이터
+    지정한 테이블/파일 버전으로 ETag를 만들고, If-None-Match / If-Modified-Since가
+    일치하면 뷰 함수를 호출하지 않고 304를 반환한다.
+    인증 데코레이터(jwt_required 등) 아래에 두어 인증 후에 동작하도록 한다.
+
+    Args:
+        *tables: 응답 내용에 영향을 주는 테이블 이름들
+        files: 응답 내용에 영향을 주는 파일 경로들
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+
+            try:
+                version_key, last_modified = get_table_versions(tables) if tables else ('', None)
+            except sqlite3.OperationalError:
+                # table_versions가 아직 없으면 (init_database 이전) 조건부 처리 없이 응답
+                return f(*args, **kwargs)
+            for path in files:
+                file_key, file_modified = _file_version(path)
+                version_key += '|' + file_key
+                if file_modified and (last_modified is None or file_modified > last_modified):
+                    last_modified = file_modified
+
+            # 같은 엔드포인트라도 쿼리 파라미터(검색어 등)가 다르면 다른 ETag
+            digest = hashlib.sha1(
+                f'{request.path}?{request.query_string.decode("utf-8", "replace")}#{version_key}'.encode('utf-8')
+            ).hexdigest()[:20]
+            etag = f'{f.__name__}-{digest}'
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.headers['Last-Modified'] = formatdate(last_modified.timestamp(), usegmt=True)
+            # 사용자 인증이 필요한 응답이므로 공유 캐시 금지, 매번 재검증
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
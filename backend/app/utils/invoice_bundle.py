@@ -0,0 +1,316 @@
+"""
+월별 거래명세서 PDF 묶음
+계산서 발행된 한 달치 거래명세서 PDF(YYYY년MM월 폴더)를 하나로 합치고
+고객사 / 거래명세서 번호별 책갈피를 추가한다.
+
+- 원본 PDF는 한 파일씩 열어 페이지와 페이지가 참조하는 객체만 복사해 결과 파일에 바로 쓴다
+  (SMB 파일은 smb_cache 경유). 메모리에는 원본 한 파일과 객체 위치/책갈피 목록만 남으므로
+  한 달치 분량과 무관하게 사용량이 일정하다 (pypdf PdfWriter는 모든 페이지를 write 때까지 보관)
+- 결과는 instance/invoice_bundles에 보관하며, 해당 월 발행 거래명세서 목록/수정시각의
+  지문(fingerprint)이 같고 누락 파일이 없으면 다시 만들지 않는다
+"""
+import copy
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NullObject, NumberObject,
+    create_string_object
+)
+
+from app.database.init_db import get_db_connection
+from app.utils.smb_utils import is_unc_path, unc_join, get_for_serve
+
+BUNDLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'instance', 'invoice_bundles'
+)
+
+
+def _issued_invoices(year, month):
+    """해당 월 계산서 발행된 거래명세표 (고객사, 번호순)"""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    conn = get_db_connection()
+    try:
+        return conn.execute('''
+            SELECT id, invoice_number, customer_name, issue_date, updated_at, bill_issued_at
+            FROM invoices
+            WHERE bill_status = 'issued'
+                AND issue_date >= ? AND issue_date < ?
+            ORDER BY customer_name, invoice_number
+        ''', (f'{year:04d}-{month:02d}-01', f'{next_year:04d}-{next_month:02d}-01')).fetchall()
+    finally:
+        conn.close()
+
+
+def _fingerprint(rows):
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(repr(tuple(row)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _bundle_paths(year, month, fingerprint):
+    name = f'{year:04d}-{month:02d}-{fingerprint}'
+    return os.path.join(BUNDLE_DIR, name + '.pdf'), os.path.join(BUNDLE_DIR, name + '.json')
+
+
+def _invoice_pdf_path(base_dir, year, month, row):
+    monthly_folder_name = f'{year}년{month:02d}월'
+    pdf_filename = f"거래명세서({row['customer_name']})-{row['invoice_number']}.pdf"
+    if is_unc_path(base_dir):
+        return unc_join(base_dir, monthly_folder_name, pdf_filename)
+    return os.path.join(base_dir, monthly_folder_name, pdf_filename)
+
+
+class _PdfAppender:
+    """
+    PDF를 한 파일씩 결과 파일 끝에 이어 쓰는 병합기
+
+    객체 번호 1(페이지 트리), 2(카탈로그), 3(책갈피 루트)은 미리 잡아 두고 close에서 쓴다.
+    원본의 페이지 트리/카탈로그는 복사하지 않으므로 페이지의 /Parent는 새 페이지 트리로 바꾼다.
+    """
+
+    PAGES_ID, CATALOG_ID, OUTLINES_ID = 1, 2, 3
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.offsets = {}
+        self.next_id = self.OUTLINES_ID + 1
+        self.page_ids = []
+        self.outline = []  # [(고객사, 첫 페이지 객체 번호, [(거래명세서 번호, 첫 페이지 객체 번호)])]
+        stream.write(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n')
+
+    def append(self, path):
+        """
+        PDF 한 파일의 페이지를 이어 쓰기 (파일을 다 읽은 뒤에 쓰므로 실패하면 아무것도 쓰지 않음)
+
+        Returns:
+            int: 첫 페이지 객체 번호 (페이지가 없으면 None)
+        """
+        reader = PdfReader(path)
+        base = self.next_id
+        local_ids = {}
+        queue = []
+
+        def ref_id(ref):
+            key = (ref.idnum, ref.generation)
+            if key not in local_ids:
+                local_ids[key] = base + len(local_ids)
+                queue.append(ref)
+            return local_ids[key]
+
+        def remap(obj):
+            if isinstance(obj, IndirectObject):
+                return IndirectObject(ref_id(obj), 0, None)
+            if isinstance(obj, DictionaryObject):
+                # 스트림도 DictionaryObject — 원본 데이터는 그대로 두고 참조만 바꾼 사본
+                new = copy.copy(obj)
+                for key, value in dict.items(obj):
+                    new[key] = remap(value)
+                return new
+            if isinstance(obj, ArrayObject):
+                return ArrayObject(remap(value) for value in list.__iter__(obj))
+            return obj
+
+        # 상속 속성(/Resources, /MediaBox 등)은 reader.pages가 각 페이지에 채워 둔다
+        page_ids = [ref_id(page.indirect_reference) for page in reader.pages]
+        page_set = set(page_ids)
+        objects = []
+        while queue:
+            ref = queue.pop()
+            obj_id = local_ids[(ref.idnum, ref.generation)]
+            obj = reader.get_object(ref)
+            if obj is None:
+                obj = NullObject()
+            elif obj_id in page_set:
+                obj = copy.copy(obj)
+                obj.pop(NameObject('/Parent'), None)
+            obj = remap(obj)
+            if obj_id in page_set:
+                obj[NameObject('/Parent')] = IndirectObject(self.PAGES_ID, 0, None)
+            objects.append((obj_id, obj))
+
+        for obj_id, obj in sorted(objects, key=lambda item: item[0]):
+            self._write_object(obj_id, obj)
+        self.next_id = base + len(local_ids)
+        self.page_ids.extend(page_ids)
+        return page_ids[0] if page_ids else None
+
+    def add_outline(self, customer_name, invoice_number, page_id):
+        if not self.outline or self.outline[-1][0] != customer_name:
+            self.outline.append((customer_name, page_id, []))
+        self.outline[-1][2].append((invoice_number, page_id))
+
+    def _new_id(self):
+        obj_id = self.next_id
+        self.next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id, obj):
+        self.offsets[obj_id] = self.stream.tell()
+        self.stream.write(f'{obj_id} 0 obj\n'.encode('ascii'))
+        obj.write_to_stream(self.stream)
+        self.stream.write(b'\nendobj\n')
+
+    @staticmethod
+    def _ref(obj_id):
+        return IndirectObject(obj_id, 0, None)
+
+    def _outline_item(self, title, parent_id, page_id):
+        return DictionaryObject({
+            NameObject('/Title'): create_string_object(title),
+            NameObject('/Parent'): self._ref(parent_id),
+            NameObject('/Dest'): ArrayObject([self._ref(page_id), NameObject('/Fit')]),
+        })
+
+    @staticmethod
+    def _link_siblings(items):
+        """[(객체 번호, 항목 dict)]에 /Prev, /Next 연결"""
+        for i, (_, item) in enumerate(items):
+            if i > 0:
+                item[NameObject('/Prev')] = _PdfAppender._ref(items[i - 1][0])
+            if i < len(items) - 1:
+                item[NameObject('/Next')] = _PdfAppender._ref(items[i + 1][0])
+
+    def _write_outline(self):
+        customers = []
+        count = 0
+        for customer_name, page_id, invoices in self.outline:
+            customer_id = self._new_id()
+            customer = self._outline_item(customer_name, self.OUTLINES_ID, page_id)
+            children = [(self._new_id(), self._outline_item(number, customer_id, invoice_page_id))
+                        for number, invoice_page_id in invoices]
+            self._link_siblings(children)
+            customer[NameObject('/First')] = self._ref(children[0][0])
+            customer[NameObject('/Last')] = self._ref(children[-1][0])
+            customer[NameObject('/Count')] = NumberObject(len(children))
+            for child_id, child in children:
+                self._write_object(child_id, child)
+            customers.append((customer_id, customer))
+            count += 1 + len(children)
+
+        self._link_siblings(customers)
+        for customer_id, customer in customers:
+            self._write_object(customer_id, customer)
+
+        root = DictionaryObject({NameObject('/Type'): NameObject('/Outlines'),
+                                 NameObject('/Count'): NumberObject(count)})
+        if customers:
+            root[NameObject('/First')] = self._ref(customers[0][0])
+            root[NameObject('/Last')] = self._ref(customers[-1][0])
+        self._write_object(self.OUTLINES_ID, root)
+
+    def close(self):
+        """페이지 트리, 책갈피, 카탈로그, xref를 써서 파일 마무리"""
+        self._write_object(self.PAGES_ID, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(self._ref(page_id) for page_id in self.page_ids),
+            NameObject('/Count'): NumberObject(len(self.page_ids)),
+        }))
+        self._write_outline()
+        self._write_object(self.CATALOG_ID, DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): self._ref(self.PAGES_ID),
+            NameObject('/Outlines'): self._ref(self.OUTLINES_ID),
+            NameObject('/PageMode'): NameObject('/UseOutlines'),
+        }))
+
+        xref_offset = self.stream.tell()
+        size = self.next_id
+        lines = [f'xref\n0 {size}\n', '0000000000 65535 f \n']
+        lines.extend(f'{self.offsets[obj_id]:010d} 00000 n \n' for obj_id in range(1, size))
+        lines.append(f'trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\n'
+                     f'startxref\n{xref_offset}\n%%EOF\n')
+        self.stream.write(''.join(lines).encode('ascii'))
+
+
+def build_monthly_bundle(year, month, base_dir, username=None, password=None, force=False):
+    """
+    월별 PDF 묶음 생성 (캐시 사용)
+
+    Args:
+        year, month: 대상 연월
+        base_dir: 거래명세서 저장 경로 (로컬 또는 UNC)
+        username, password: UNC 접속 정보
+        force: True면 캐시를 무시하고 다시 생성
+
+    Returns:
+        tuple: (묶음 PDF 경로 또는 None, 정보 dict)
+               정보: invoice_count, included, missing(거래명세서 번호 목록), cached
+    """
+    rows = _issued_invoices(year, month)
+    info = {'invoice_count': len(rows), 'included': 0, 'missing': [], 'cached': False}
+    if not rows:
+        return None, info
+
+    fingerprint = _fingerprint(rows)
+    bundle_path, meta_path = _bundle_paths(year, month, fingerprint)
+
+    if not force and os.path.exists(bundle_path) and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        # 누락 파일이 있던 묶음은 파일이 생겼을 수 있으므로 다시 생성
+        if not meta.get('missing'):
+            meta['cached'] = True
+            return bundle_path, meta
+
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=BUNDLE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            appender = _PdfAppender(f)
+            for row in rows:
+                pdf_path = _invoice_pdf_path(base_dir, year, month, row)
+                serve_path, is_tmp = None, False
+                try:
+                    serve_path, is_tmp = get_for_serve(pdf_path, username, password)
+                    if not os.path.exists(serve_path):
+                        raise FileNotFoundError(pdf_path)
+                    first_page_id = appender.append(serve_path)
+                    if first_page_id is None:
+                        raise ValueError('페이지가 없는 PDF')
+                except Exception as e:
+                    print(f"월별 묶음: PDF 누락 ({row['invoice_number']}): {e}")
+                    info['missing'].append(row['invoice_number'])
+                    continue
+                finally:
+                    if is_tmp and serve_path:
+                        try:
+                            os.unlink(serve_path)
+                        except OSError:
+                            pass
+
+                appender.add_outline(row['customer_name'], row['invoice_number'], first_page_id)
+                info['included'] += 1
+
+            if info['included']:
+                appender.close()
+
+        if info['included'] == 0:
+            os.unlink(tmp_path)
+            return None, info
+        os.replace(tmp_path, bundle_path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False)
+
+    # 같은 월의 이전 묶음 정리
+    for old_path in glob.glob(os.path.join(BUNDLE_DIR, f'{year:04d}-{month:02d}-*')):
+        if old_path not in (bundle_path, meta_path):
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass
+
+    return bundle_path, info
@@ -0,0 +1,165 @@
+"""
+J#(제이샵) 상품 이미지 일괄 변환
+업로드한 사진마다 IMAGE_SIZES 너비의 JPEG(언샵마스크 + 1px 흰색 테두리)를 만들어 ZIP 하나로 묶는다.
+
+- 이미지 단위로 프로세스 풀에 나눠 처리 (풀은 처음 요청 때 만들고 다음 요청에서도 재사용)
+- JPEG는 draft 모드로 가장 큰 출력 크기 근처까지 줄여서 디코딩 (12MP 전체를 풀지 않음)
+- 큰 크기부터 차례로 줄여 다음 크기를 만든다 (매번 원본 해상도에서 줄이지 않음)
+- 임시 폴더 없이 메모리에서 인코딩해 바로 ZIP에 기록 (JPEG는 이미 압축되어 있어 ZIP_STORED)
+"""
+import io
+import math
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+IMAGE_SIZES = [430, 640, 860, 1000]
+JPEG_OPTIONS = {'quality': 100, 'subsampling': 0}  # 오픈마켓 상세페이지용 최상 품질
+IMAGE_WORKERS = int(os.getenv('JSHARP_IMAGE_WORKERS', '0')) or min(4, os.cpu_count() or 1)
+
+# EXIF Orientation 중 가로/세로가 바뀌는 값
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _register_heif():
+    try:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+    except ImportError:
+        pass
+
+
+def add_white_border(image, border_width=1):
+    """
+    이미지 최외각에 흰색 테두리 추가
+
+    Args:
+        image: PIL Image 객체
+        border_width: 테두리 두께 (픽셀)
+
+    Returns:
+        테두리가 추가된 PIL Image 객체
+    """
+    from PIL import Image
+    new_image = Image.new('RGB', (image.width + border_width * 2, image.height + border_width * 2), 'white')
+    new_image.paste(image, (border_width, border_width))
+    return new_image
+
+
+def _open_for_sizes(data, max_width):
+    """
+    업로드 바이트를 RGB 이미지로 디코딩 (EXIF 회전 적용)
+
+    Returns:
+        tuple: (PIL Image, 원본 가로/세로 비율)
+    """
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(data))
+    width, height = image.size
+    rotated = image.getexif().get(0x0112) in _ROTATED_ORIENTATIONS
+    if rotated:
+        width, height = height, width
+    aspect_ratio = height / width
+
+    # 회전 후 너비가 max_width 이상 남도록 저장된 방향 기준으로 요청 (작은 이미지는 그대로)
+    scale = max_width / width
+    if scale < 1:
+        stored_w, stored_h = image.size
+        image.draft('RGB', (math.ceil(stored_w * scale), math.ceil(stored_h * scale)))
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image, aspect_ratio
+
+
+def process_image(data, name):
+    """
+    사진 1장을 IMAGE_SIZES 크기로 변환
+
+    Args:
+        data: 업로드한 이미지 바이트
+        name: 출력 파일명 앞부분 (원본 파일명에서 확장자 제외)
+
+    Returns:
+        list: [(파일명 '이름-사이즈.jpg', JPEG 바이트)] (IMAGE_SIZES 순서)
+    """
+    from PIL import Image, ImageFilter
+
+    sizes = sorted(IMAGE_SIZES, reverse=True)
+    image, aspect_ratio = _open_for_sizes(data, sizes[0])
+
+    outputs = {}
+    for size in sizes:
+        image = image.resize((size, int(size * aspect_ratio)), Image.Resampling.LANCZOS)
+        # 포토샵 Bicubic Sharper에 준하는 언샵마스크 후 1px 흰색 테두리
+        sharpened = image.filter(ImageFilter.UnsharpMask(radius=0.5, percent=120, threshold=3))
+        buffer = io.BytesIO()
+        add_white_border(sharpened, border_width=1).save(buffer, 'JPEG', **JPEG_OPTIONS)
+        outputs[size] = buffer.getvalue()
+    return [(f'{name}-{size}.jpg', outputs[size]) for size in IMAGE_SIZES]
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # fork 시 부모의 스레드/DB 연결 상태가 복제되지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_register_heif)
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _process_all(images):
+    """(바이트, 이름) 목록을 처리해 업로드 순서대로 결과 목록 반환"""
+    if len(images) <= 1 or IMAGE_WORKERS == 1:
+        _register_heif()
+        return [process_image(data, name) for data, name in images]
+
+    pool = _get_pool()
+    try:
+        futures = [pool.submit(process_image, data, name) for data, name in images]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # 워커가 죽었으면(메모리 부족 등) 다음 요청에서 새 풀을 만든다
+        _reset_pool(pool)
+        raise
+
+
+def build_zip(images):
+    """
+    상품 사진들을 변환해 ZIP 바이트 버퍼로 반환
+
+    Args:
+        images: [(이미지 바이트, 출력 파일명 앞부분)] — 같은 이름이면 나중 것이 남는다
+
+    Returns:
+        io.BytesIO: 처음 위치로 되감은 ZIP
+    """
+    entries = {}
+    for outputs in _process_all(images):
+        for filename, jpeg in outputs:
+            entries[filename] = jpeg
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        for filename, jpeg in entries.items():
+            zip_file.writestr(filename, jpeg)
+    zip_buffer.seek(0)
+    return zip_buffer
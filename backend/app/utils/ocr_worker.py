@@ -0,0 +1,256 @@
+"""
+명함 OCR 워커 (별도 프로세스 1개를 모든 웹 워커가 공유)
+
+easyocr 모델은 수백 MB라서 gunicorn 워커마다 import 시점에 올리지 않고,
+처음 명함을 인식할 때 127.0.0.1의 OCR 워커 프로세스를 띄워 요청을 보낸다.
+
+- 포트 바인딩이 곧 단일 실행 보장: 여러 웹 워커가 동시에 띄워도 하나만 살아남는다
+- 워커 안에서는 요청을 큐에 쌓아 한 번에 하나씩 인식 (모델 1개, CPU 과점유 방지)
+- 인식 전에 EXIF 회전 적용, 긴 변 OCR_MAX_SIDE로 축소, 흑백/대비 보정 (휴대폰 원본 12MP를 그대로 넣지 않음)
+- OCR_IDLE_SECONDS 동안 요청이 없으면 스스로 종료해 메모리 반환
+- 단독 실행: backend/ 디렉토리에서 python -m app.utils.ocr_worker
+"""
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+KEY_PATH = os.path.join(BACKEND_DIR, 'instance', 'ocr_worker.key')
+
+OCR_ENGINE = os.environ.get('OCR_ENGINE', 'easyocr')  # 'easyocr' 또는 'tesseract'
+OCR_ADDRESS = ('127.0.0.1', int(os.environ.get('OCR_WORKER_PORT', '5091')))
+OCR_TIMEOUT = float(os.environ.get('OCR_TIMEOUT', '90'))  # 첫 요청은 모델 로딩 시간 포함
+OCR_IDLE_SECONDS = int(os.environ.get('OCR_IDLE_SECONDS', '1800'))
+OCR_MAX_SIDE = int(os.environ.get('OCR_MAX_SIDE', '1600'))  # 명함 글자 인식에 충분한 해상도
+STARTUP_TIMEOUT = 15  # 워커 프로세스가 포트를 열 때까지 기다리는 시간
+
+_spawn_lock = threading.Lock()
+
+
+class OcrUnavailableError(Exception):
+    """OCR 라이브러리가 설치되지 않았거나 모델을 불러오지 못함"""
+
+
+class OcrTimeoutError(Exception):
+    """OCR 워커가 제한 시간 안에 응답하지 않음"""
+
+
+def _authkey():
+    """웹 워커와 OCR 워커가 공유하는 인증 키 (instance/ocr_worker.key, 없으면 생성)"""
+    os.makedirs(os.path.dirname(KEY_PATH), exist_ok=True)
+    try:
+        fd = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(50):
+            with open(KEY_PATH, 'rb') as f:
+                key = f.read()
+            if key:
+                return key
+            time.sleep(0.01)  # 다른 프로세스가 막 만드는 중
+        raise RuntimeError('OCR 워커 인증 키를 읽을 수 없습니다.')
+    key = secrets.token_hex(32).encode('ascii')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+# ---- 클라이언트 (웹 워커) ----
+
+def _connect():
+    return Client(OCR_ADDRESS, authkey=_authkey())
+
+
+def _spawn_worker():
+    """OCR 워커 프로세스 시작 (웹 워커가 재시작돼도 계속 살아 있도록 분리)"""
+    kwargs = {'cwd': BACKEND_DIR, 'stdin': subprocess.DEVNULL}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs['start_new_session'] = True
+    subprocess.Popen([sys.executable, '-m', 'app.utils.ocr_worker'], **kwargs)
+
+
+def _connect_or_spawn():
+    try:
+        return _connect()
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass
+
+    with _spawn_lock:
+        try:
+            return _connect()
+        except (ConnectionRefusedError, FileNotFoundError):
+            _spawn_worker()
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                return _connect()
+            except (ConnectionRefusedError, FileNotFoundError):
+                if time.monotonic() > deadline:
+                    raise OcrUnavailableError('OCR 워커를 시작할 수 없습니다.')
+                time.sleep(0.2)
+
+
+def extract_text(image_path, timeout=None):
+    """
+    이미지에서 텍스트 추출 (줄 단위로 이어 붙인 문자열)
+
+    Raises:
+        OcrUnavailableError: OCR 라이브러리 없음/워커 시작 실패
+        OcrTimeoutError: timeout(기본 OCR_TIMEOUT)초 안에 결과가 오지 않음
+    """
+    timeout = OCR_TIMEOUT if timeout is None else timeout
+    conn = _connect_or_spawn()
+    try:
+        conn.send(('readtext', os.path.abspath(image_path)))
+        if not conn.poll(timeout):
+            raise OcrTimeoutError(f'OCR 처리 시간이 {timeout:.0f}초를 초과했습니다.')
+        status, value = conn.recv()
+    except (EOFError, ConnectionResetError, BrokenPipeError):
+        raise OcrUnavailableError('OCR 워커와의 연결이 끊어졌습니다.')
+    finally:
+        conn.close()
+
+    if status == 'unavailable':
+        raise OcrUnavailableError(value)
+    if status == 'error':
+        raise RuntimeError(value)
+    return value
+
+
+# ---- 워커 프로세스 ----
+
+def preprocess_image(image_path):
+    """
+    OCR용 이미지 준비: EXIF 회전, 긴 변 OCR_MAX_SIDE 이하로 축소, 흑백 변환 후 대비 보정
+
+    Returns:
+        PIL.Image: 'L' 모드 이미지
+    """
+    from PIL import Image, ImageOps
+    try:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+    except ImportError:
+        pass
+
+    with Image.open(image_path) as image:
+        # JPEG는 디코딩 단계에서 1/2~1/8로 줄여 읽어 12MP 전체를 풀지 않음
+        image.draft('L', (OCR_MAX_SIDE, OCR_MAX_SIDE))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('L')
+    if max(image.size) > OCR_MAX_SIDE:
+        image.thumbnail((OCR_MAX_SIDE, OCR_MAX_SIDE), Image.LANCZOS)
+    return ImageOps.autocontrast(image, cutoff=1)
+
+
+def _load_engine():
+    """OCR 함수(image_path -> text) 반환, 라이브러리가 없으면 None"""
+    if OCR_ENGINE == 'tesseract':
+        try:
+            import pytesseract
+        except ImportError:
+            return None
+
+        def read(image_path):
+            image = preprocess_image(image_path)
+            return pytesseract.image_to_string(image, lang='kor+eng', config=r'--oem 3 --psm 6')
+        return read
+
+    try:
+        import easyocr
+        import numpy as np
+    except ImportError:
+        return None
+    reader = easyocr.Reader(['ko', 'en'], gpu=False)
+
+    def read(image_path):
+        image = np.asarray(preprocess_image(image_path))
+        return '\n'.join(detection[1] for detection in reader.readtext(image))
+    return read
+
+
+def _client_gone(conn):
+    """클라이언트가 이미 연결을 끊었는지 (요청 하나만 보내고 기다리므로 읽을 것이 있다면 EOF뿐)"""
+    try:
+        if conn.poll():
+            conn.recv()
+    except (OSError, EOFError):
+        return True
+    return False
+
+
+def _serve_requests(requests, state):
+    unavailable = None
+    try:
+        read = _load_engine()
+        if read is None:
+            unavailable = 'OCR 라이브러리가 설치되지 않았습니다. easyocr 또는 tesseract를 설치해주세요.'
+    except Exception as e:
+        read, unavailable = None, f'OCR 모델을 불러오지 못했습니다: {e}'
+
+    while True:
+        conn, path = requests.get()
+        try:
+            if _client_gone(conn):
+                continue  # 대기 중 시간 초과로 끊긴 요청은 OCR을 돌리지 않음 (finally에서 정리)
+            if unavailable:
+                reply = ('unavailable', unavailable)
+            elif not os.path.exists(path):
+                reply = ('error', '이미지 파일이 없습니다.')
+            else:
+                try:
+                    reply = ('ok', read(path))
+                except Exception as e:
+                    reply = ('error', str(e))
+            conn.send(reply)
+        except (OSError, EOFError):
+            pass  # 클라이언트가 시간 초과로 먼저 끊음
+        finally:
+            conn.close()
+            state['last_used'] = time.monotonic()
+            requests.task_done()
+
+
+def _watch_idle(listener, requests, state):
+    while True:
+        time.sleep(30)
+        if requests.unfinished_tasks == 0 and time.monotonic() - state['last_used'] > OCR_IDLE_SECONDS:
+            listener.close()
+            os._exit(0)
+
+
+def serve():
+    """OCR 워커 메인 루프 (포트가 이미 사용 중이면 다른 워커가 떠 있으므로 바로 종료)"""
+    try:
+        listener = Listener(OCR_ADDRESS, authkey=_authkey())
+    except OSError:
+        return
+
+    requests = queue.Queue()
+    state = {'last_used': time.monotonic()}
+    # 포트를 먼저 연 뒤 모델을 불러오므로 로딩 중 들어온 요청은 큐에서 기다린다
+    threading.Thread(target=_serve_requests, args=(requests, state), daemon=True).start()
+    threading.Thread(target=_watch_idle, args=(listener, requests, state), daemon=True).start()
+
+    while True:
+        try:
+            conn = listener.accept()
+            message = conn.recv()
+        except (OSError, EOFError, AuthenticationError):
+            continue  # 인증 실패/연결 끊김
+        if not isinstance(message, tuple) or len(message) != 2 or message[0] != 'readtext':
+            conn.close()
+            continue
+        requests.put((conn, message[1]))
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,109 @@
+"""
+Pagination utilities
+키셋(커서) 페이지네이션 및 총 개수 캐시 유틸리티
+"""
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# COUNT(*) 결과 캐시 유지 시간 (초)
+COUNT_CACHE_TTL = 30
+# 필터 조합마다 키가 생기므로 최근 사용한 항목만 남긴다 (LRU)
+COUNT_CACHE_MAX_ENTRIES = 256
+
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def encode_cursor(*values):
+    """
+    키셋 값들을 URL에 안전한 불투명 커서 문자열로 변환
+    Args:
+        *values: 정렬 키 값들 (예: created_at, id)
+    Returns:
+        str: base64url 인코딩된 커서
+    """
+    raw = json.dumps(list(values), ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """
+    커서 문자열을 키셋 값 리스트로 복원
+    Args:
+        cursor: encode_cursor로 만든 문자열
+        size: 기대하는 키 개수
+    Returns:
+        list: 키셋 값 리스트 (형식이 잘못되었으면 None)
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        return None
+
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def prefix_range(prefix):
+    """
+    접두어 검색을 인덱스 범위 조건으로 변환
+    `col >= lower AND col < upper` 형태로 사용하면 LIKE 'x%'와 달리
+    COLLATE 설정과 무관하게 인덱스를 탈 수 있다.
+    Returns:
+        tuple: (lower, upper)
+    """
+    return prefix, prefix + '\U0010ffff'
+
+
+def get_cached_count(conn, key, count_query, params, version_query=None):
+    """
+    COUNT(*) 결과를 짧은 시간 동안 캐시하여 반환
+    Args:
+        conn: 데이터베이스 연결
+        key: 캐시 키 (필터 조건을 포함해야 함)
+        count_query: 첫 번째 컬럼에 개수를 반환하는 쿼리
+        params: count_query 파라미터
+        version_query: 테이블 변경 여부를 판단할 가벼운 쿼리 (예: SELECT MAX(id) ...)
+                       결과가 달라지면 TTL과 무관하게 다시 계산한다.
+    Returns:
+        int: 총 개수
+    """
+    version = conn.execute(version_query).fetchone()[0] if version_query else None
+    now = time.monotonic()
+
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached and cached[1] == version and now - cached[2] < COUNT_CACHE_TTL:
+            _count_cache.move_to_end(key)
+            return cached[0]
+
+    total = conn.execute(count_query, params).fetchone()[0]
+
+    with _count_cache_lock:
+        _count_cache[key] = (total, version, now)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
+
+
+def invalidate_count_cache(prefix=None):
+    """
+    캐시된 개수 삭제
+    Args:
+        prefix: 키의 첫 번째 요소가 일치하는 항목만 삭제 (None이면 전체)
+    """
+    with _count_cache_lock:
+        if prefix is None:
+            _count_cache.clear()
+            return
+        for key in [k for k in _count_cache if k and k[0] == prefix]:
+            del _count_cache[key]
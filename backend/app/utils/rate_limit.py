@@ -0,0 +1,83 @@
+"""
+IP별 토큰 버킷 요청 제한 (프로세스 내 메모리)
+
+인증 없는 공개 엔드포인트에서 링크 반복 새로고침이나 토큰 무작위 대입이
+DB까지 내려가지 않도록 요청 수를 제한한다. gunicorn 워커별로 따로 동작하므로
+실제 허용량은 워커 수만큼 늘어난다.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from flask import jsonify, request
+
+# nginx(127.0.0.1)에서 넘어온 요청만 X-Real-IP를 신뢰
+TRUSTED_PROXIES = ('127.0.0.1', '::1')
+
+
+def client_ip():
+    """요청한 클라이언트 IP (nginx 프록시 뒤에서는 X-Real-IP)"""
+    remote = request.remote_addr or ''
+    if remote in TRUSTED_PROXIES:
+        real_ip = request.headers.get('X-Real-IP')
+        if real_ip:
+            return real_ip.strip()
+    return remote
+
+
+class TokenBucketLimiter:
+    """
+    토큰 버킷: 최대 capacity개까지 쌓이고 초당 refill_rate개씩 채워진다.
+    요청마다 1개를 쓰며, 토큰이 없으면 거절한다.
+    """
+
+    MAX_KEYS = 10000  # 이 수를 넘으면 가득 찬(오래 쉬었던) 버킷을 정리
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key):
+        """
+        토큰 1개 사용
+
+        Returns:
+            tuple: (허용 여부, 거절 시 다시 시도할 때까지 남은 초)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.refill_rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, math.ceil((1 - tokens) / self.refill_rate)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now)
+        return allowed, retry_after
+
+    def _prune(self, now):
+        full_after = self.capacity / self.refill_rate
+        for key in [k for k, (_, last) in self._buckets.items() if now - last >= full_after]:
+            del self._buckets[key]
+
+
+def rate_limited(limiter):
+    """IP별 요청 제한 데코레이터 (초과 시 429 + Retry-After)"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            allowed, retry_after = limiter.consume(client_ip())
+            if not allowed:
+                response = jsonify({'error': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
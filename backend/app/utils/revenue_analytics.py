@@ -0,0 +1,275 @@
+"""
+Revenue analytics
+계산서 발행된 거래명세표 항목을 한 번에 추출해 pandas group-by로 집계
+
+- yoy: 월별 매출 전년 대비
+- by_customer: 고객별 매출 (work/travel/parts)
+- by_technician: 담당 기술자별 매출
+- labor_hours: 카테고리별 월별 작업/이동 시간
+
+결과는 (연도, 필터)별로 캐시하며, 거래명세표 관련 테이블 버전(table_versions)이
+바뀌면 자동으로 다시 계산한다.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from app.database.init_db import get_db_connection
+from app.utils.etag import get_table_versions
+
+# 집계 결과에 영향을 주는 테이블 (버전이 바뀌면 캐시 무효)
+ANALYTICS_TABLES = ('invoices', 'invoice_items', 'service_reports', 'invoice_codes', 'customers', 'users')
+
+# 지원하는 필터 (쿼리 파라미터 이름 -> 추출 컬럼)
+FILTER_COLUMNS = {
+    'customer_id': 'customer_id',
+    'technician_id': 'technician_id',
+    'category': 'category',
+}
+
+ITEM_TYPES = ['work', 'travel', 'parts']
+MONTHS = list(range(1, 13))
+
+_CACHE_MAX_ENTRIES = 32
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_EXTRACT_SQL = '''
+    SELECT
+        i.id as invoice_id,
+        i.issue_date,
+        i.customer_id,
+        COALESCE(c.company_name, i.customer_name) as customer_name,
+        sr.technician_id,
+        u.name as technician_name,
+        COALESCE(ic.category, 'Unknown') as category,
+        ii.item_type,
+        ii.quantity,
+        ii.total_price
+    FROM invoice_items ii
+    INNER JOIN invoices i ON ii.invoice_id = i.id
+    LEFT JOIN customers c ON i.customer_id = c.id
+    LEFT JOIN service_reports sr ON i.service_report_id = sr.id
+    LEFT JOIN users u ON sr.technician_id = u.id
+    LEFT JOIN invoice_codes ic ON COALESCE(i.invoice_code_id, sr.invoice_code_id) = ic.id
+    WHERE i.bill_status = 'issued'
+        AND ii.is_header = 0
+        AND i.issue_date >= ? AND i.issue_date < ?
+'''
+
+
+def _extract(start_year, end_year):
+    """start_year ~ end_year 발행 항목을 DataFrame으로 추출"""
+    conn = get_db_connection()
+    try:
+        df = pd.read_sql_query(
+            _EXTRACT_SQL, conn,
+            params=(f'{start_year:04d}-01-01', f'{end_year + 1:04d}-01-01')
+        )
+    finally:
+        conn.close()
+
+    issue_date = pd.to_datetime(df['issue_date'].str[:10], format='%Y-%m-%d', errors='coerce')
+    df['year'] = issue_date.dt.year
+    df['month'] = issue_date.dt.month
+    df = df.dropna(subset=['year', 'month'])
+    df['year'] = df['year'].astype(int)
+    df['month'] = df['month'].astype(int)
+    df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').fillna(0.0)
+    df['total_price'] = pd.to_numeric(df['total_price'], errors='coerce').fillna(0.0)
+    # 시간은 네고 항목(음수 금액) 제외, 금액은 네고 포함 (YTD Summary와 동일 기준)
+    df['hours'] = df['quantity'].where(df['total_price'] >= 0, 0.0)
+    # 그룹 키에 NULL이 있으면 피벗에서 빠지므로 0(미지정)으로 채움
+    df['customer_id'] = pd.to_numeric(df['customer_id'], errors='coerce').fillna(0).astype(int)
+    df['technician_id'] = pd.to_numeric(df['technician_id'], errors='coerce').fillna(0).astype(int)
+    df['customer_name'] = df['customer_name'].fillna('')
+    df['technician_name'] = df['technician_name'].fillna('미지정')
+    return df
+
+
+def _apply_filters(df, filters):
+    for key, value in filters:
+        column = FILTER_COLUMNS[key]
+        if column == 'category':
+            df = df[df[column] == value]
+        else:
+            df = df[df[column] == int(value)]
+    return df
+
+
+def _pivot_amounts(df, index):
+    """index별 item_type 금액 피벗 (work/travel/parts/total)"""
+    table = df.pivot_table(index=index, columns='item_type', values='total_price',
+                           aggfunc='sum', fill_value=0.0)
+    table = table.reindex(columns=ITEM_TYPES, fill_value=0.0)
+    table['total'] = table[ITEM_TYPES].sum(axis=1)
+    return table
+
+
+def _yoy(df, year):
+    monthly = df.pivot_table(index='month', columns='year', values='total_price',
+                             aggfunc='sum', fill_value=0.0)
+    monthly = monthly.reindex(index=MONTHS, columns=[year - 1, year], fill_value=0.0)
+    previous, current = monthly[year - 1], monthly[year]
+    change = ((current - previous) / previous.where(previous != 0)) * 100
+
+    rows = []
+    for month in MONTHS:
+        pct = change.loc[month]
+        rows.append({
+            'month': month,
+            'previous': float(previous.loc[month]),
+            'current': float(current.loc[month]),
+            'change_pct': None if pd.isna(pct) else round(float(pct), 1),
+        })
+
+    previous_total, current_total = float(previous.sum()), float(current.sum())
+    return {
+        'months': rows,
+        'previous_total': previous_total,
+        'current_total': current_total,
+        'change_pct': round((current_total - previous_total) / previous_total * 100, 1) if previous_total else None,
+    }
+
+
+def _by_customer(df):
+    if df.empty:
+        return []
+    table = _pivot_amounts(df, ['customer_id', 'customer_name'])
+    table['invoice_count'] = df.groupby(['customer_id', 'customer_name'])['invoice_id'].nunique()
+    table = table.sort_values('total', ascending=False).reset_index()
+    return [{
+        'customer_id': int(row.customer_id) or None,
+        'customer_name': row.customer_name,
+        'work': float(row.work), 'travel': float(row.travel), 'parts': float(row.parts),
+        'total': float(row.total),
+        'invoice_count': int(row.invoice_count),
+    } for row in table.itertuples(index=False)]
+
+
+def _by_technician(df):
+    if df.empty:
+        return []
+    labor = df[df['item_type'].isin(['work', 'travel'])]
+    table = _pivot_amounts(df, ['technician_id', 'technician_name'])
+    table['labor_hours'] = labor.groupby(['technician_id', 'technician_name'])['hours'].sum()
+    table['labor_hours'] = table['labor_hours'].fillna(0.0)
+    table = table.sort_values('total', ascending=False).reset_index()
+    return [{
+        'technician_id': int(row.technician_id) or None,
+        'technician_name': row.technician_name,
+        'work': float(row.work), 'travel': float(row.travel), 'parts': float(row.parts),
+        'total': float(row.total),
+        'labor_hours': float(row.labor_hours),
+    } for row in table.itertuples(index=False)]
+
+
+def _labor_hours(df):
+    labor = df[df['item_type'].isin(['work', 'travel'])]
+    if labor.empty:
+        return []
+    table = labor.pivot_table(index=['category', 'item_type'], columns='month', values='hours',
+                              aggfunc='sum', fill_value=0.0)
+    table = table.reindex(columns=MONTHS, fill_value=0.0)
+    result = []
+    for (category, item_type), values in table.iterrows():
+        result.append({
+            'category': category,
+            'item_type': item_type,
+            'monthly': {str(m): float(values[m]) for m in MONTHS},
+            'total': float(values.sum()),
+        })
+    return result
+
+
+def _compute(year, filters):
+    df = _apply_filters(_extract(year - 1, year), filters)
+    current = df[df['year'] == year]
+    return {
+        'year': year,
+        'filters': dict(filters),
+        'yoy': _yoy(df, year),
+        'by_customer': _by_customer(current),
+        'by_technician': _by_technician(current),
+        'labor_hours': _labor_hours(current),
+    }
+
+
+def normalize_filters(args):
+    """요청 파라미터에서 지원하는 필터만 골라 캐시 키로 쓸 수 있는 튜플로 변환"""
+    filters = []
+    for key in FILTER_COLUMNS:
+        value = args.get(key)
+        if value in (None, ''):
+            continue
+        if key != 'category':
+            value = str(int(value))  # 숫자가 아니면 ValueError
+        filters.append((key, value))
+    return tuple(filters)
+
+
+def get_revenue_analytics(year, filters=()):
+    """
+    연도별 매출/작업시간 분석 결과 조회 (캐시 사용)
+
+    Args:
+        year: 조회 연도 (전년도와 비교)
+        filters: normalize_filters()로 만든 필터 튜플
+
+    Returns:
+        dict: yoy, by_customer, by_technician, labor_hours
+    """
+    version_key, _ = get_table_versions(ANALYTICS_TABLES)
+    key = (year, filters)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == version_key:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    result = _compute(year, filters)
+
+    with _cache_lock:
+        _cache[key] = (version_key, result)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+
+def export_revenue_analytics_xlsx(year, filters=()):
+    """분석 결과를 시트별 XLSX(BytesIO)로 반환"""
+    data = get_revenue_analytics(year, filters)
+
+    yoy = pd.DataFrame(data['yoy']['months']).rename(columns={
+        'month': '월', 'previous': f'{year - 1}년', 'current': f'{year}년', 'change_pct': '증감률(%)'
+    })
+    customers = pd.DataFrame(data['by_customer'], columns=[
+        'customer_name', 'work', 'travel', 'parts', 'total', 'invoice_count'
+    ]).rename(columns={
+        'customer_name': '고객사', 'work': '작업비', 'travel': '이동비', 'parts': '부품비',
+        'total': '합계', 'invoice_count': '거래명세표 수'
+    })
+    technicians = pd.DataFrame(data['by_technician'], columns=[
+        'technician_name', 'work', 'travel', 'parts', 'total', 'labor_hours'
+    ]).rename(columns={
+        'technician_name': '담당자', 'work': '작업비', 'travel': '이동비', 'parts': '부품비',
+        'total': '합계', 'labor_hours': '작업/이동 시간'
+    })
+    hours = pd.DataFrame([
+        {'카테고리': row['category'], '구분': row['item_type'],
+         **{f'{m}월': row['monthly'][str(m)] for m in MONTHS}, '합계': row['total']}
+        for row in data['labor_hours']
+    ], columns=['카테고리', '구분', *[f'{m}월' for m in MONTHS], '합계'])
+
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        yoy.to_excel(writer, index=False, sheet_name='전년대비')
+        customers.to_excel(writer, index=False, sheet_name='고객별')
+        technicians.to_excel(writer, index=False, sheet_name='담당자별')
+        hours.to_excel(writer, index=False, sheet_name='카테고리별 시간')
+    output.seek(0)
+    return output
@@ -0,0 +1,710 @@
+"""
+서비스 리포트 PDF (WeasyPrint)
+
+- build_pdf_html: 단건 다운로드 / 일괄 내보내기 공용 HTML
+- save_to_configured_folder: 시스템 설정 저장 경로의 {YYYY}년{MM}월 폴더에 저장 (UNC는 업로드 스풀)
+- 일괄 내보내기: 기간 내 리포트를 WeasyPrint 프로세스 풀로 렌더링
+  워커는 시작할 때 폰트 설정과 공통 CSS를 한 번만 로드하고, HTML 생성/DB 조회는 부모 프로세스가 담당
+  진행 상황은 instance/service_report_exports/<job_id>/status.json에 기록 (gunicorn 워커 간 공유)
+  동시에 하나만 실행: 작업 등록은 O_EXCL 잠금 파일 안에서 확인 후 생성 (워커 간 경쟁 방지)
+  결과는 ZIP({YYYY}년{MM}월/파일명) 또는 리포트별 책갈피가 있는 병합 PDF
+"""
+import base64
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+
+from app.database.init_db import get_db_connection
+
+EXPORT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'instance', 'service_report_exports'
+)
+EXPORT_FORMATS = ('zip', 'pdf')
+EXPORT_WORKERS = int(os.getenv('SERVICE_REPORT_PDF_WORKERS', '0')) or min(4, os.cpu_count() or 1)
+JOB_RETENTION_SECONDS = 24 * 3600
+STALE_JOB_SECONDS = 3600  # running 상태로 이 시간 넘게 갱신이 없으면 중단된 작업으로 간주
+CREATE_LOCK_PATH = os.path.join(EXPORT_DIR, 'create.lock')
+CREATE_LOCK_STALE_SECONDS = 30  # 작업 등록 중 프로세스가 죽어 남은 잠금 파일은 이 시간 뒤 제거
+CREATE_LOCK_WAIT_SECONDS = 5
+
+
+class ExportAlreadyRunning(Exception):
+    """이미 진행 중인 일괄 내보내기가 있을 때 (job_id: 진행 중인 작업)"""
+
+    def __init__(self, job_id):
+        super().__init__(f'이미 진행 중인 일괄 생성 작업이 있습니다: {job_id}')
+        self.job_id = job_id
+
+PDF_CSS = '''
+  @font-face {
+    font-family: 'NanumGothic';
+    src: local('NanumGothic'), local('나눔고딕'),
+         url('/usr/share/fonts/truetype/nanum/NanumGothic.ttf') format('truetype');
+  }
+  body {
+    font-family: 'NanumGothic', 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif;
+    font-size: 10pt;
+    color: #000;
+    margin: 0;
+    padding: 0;
+  }
+  @page {
+    size: A4;
+    margin: 10mm 15mm;
+  }
+'''
+
+
+@lru_cache(maxsize=1)
+def _logo_tag():
+    """로고 이미지 태그 (base64, 프로세스당 한 번만 읽음)"""
+    logo_path = os.path.abspath(os.path.join(
+        os.path.dirname(__file__), '..', '..', 'instance', 'LVD Logo_default.jpg'
+    ))
+    if not os.path.exists(logo_path):
+        return '<div></div>'
+    with open(logo_path, 'rb') as f:
+        logo_b64 = base64.b64encode(f.read()).decode('utf-8')
+    return f'<img src="data:image/jpeg;base64,{logo_b64}" style="height:40px; object-fit:contain;" />'
+
+
+def build_pdf_html(report_dict: dict, inline_css: bool = True) -> str:
+    """
+    서비스 리포트 데이터로 WeasyPrint용 HTML 생성
+    inline_css=False면 스타일을 넣지 않는다 (일괄 워커가 미리 파싱한 PDF_CSS 적용)
+    """
+    r = report_dict
+
+    logo_tag = _logo_tag()
+
+    # 서비스 날짜 포맷
+    service_date_str = '-'
+    if r.get('service_date'):
+        try:
+            d = datetime.fromisoformat(r['service_date'].replace('Z', ''))
+            service_date_str = f"{d.year}년 {d.month}월 {d.day}일"
+        except Exception:
+            service_date_str = r['service_date']
+
+    # 출력일
+    today_str = datetime.now().strftime('%Y년 %m월 %d일')
+
+    # 동행/지원 기술자
+    support_tech_names = r.get('support_technician_names') or '없음'
+
+    # 사용부품
+    parts = r.get('used_parts') or []
+    parts_html = ''
+    if parts:
+        rows = ''.join(
+            f'''<tr>
+              <td style="border:1px solid #aaa; padding:3px 6px;">{p.get("part_name") or "-"}</td>
+              <td style="border:1px solid #aaa; padding:3px 6px;">{p.get("part_number") or "-"}</td>
+              <td style="border:1px solid #aaa; padding:3px 6px; text-align:center;">{p.get("quantity") or "-"}</td>
+              <td style="border:1px solid #aaa; padding:3px 6px; text-align:right;">{f"{int(p.get('unit_price') or 0):,}" if isinstance(p.get("unit_price"), (int, float)) else "0"}</td>
+              <td style="border:1px solid #aaa; padding:3px 6px; text-align:right; font-weight:bold;">{f"{int(p.get('total_price') or 0):,}" if isinstance(p.get("total_price"), (int, float)) else "0"}</td>
+            </tr>'''
+            for p in parts
+        )
+        parts_html = f'''
+        <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">사용부품 내역</div>
+        <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
+          <thead>
+            <tr style="background:#f0f0f0;">
+              <th style="border:1px solid #aaa; padding:3px 6px; text-align:left;">부품명</th>
+              <th style="border:1px solid #aaa; padding:3px 6px; text-align:left;">부품번호</th>
+              <th style="border:1px solid #aaa; padding:3px 6px; text-align:center; width:60px;">수량</th>
+              <th style="border:1px solid #aaa; padding:3px 6px; text-align:right; width:90px;">단가</th>
+              <th style="border:1px solid #aaa; padding:3px 6px; text-align:right; width:90px;">총액</th>
+            </tr>
+          </thead>
+          <tbody>{rows}</tbody>
+        </table>'''
+
+    # 시간 기록부
+    time_records = r.get('time_records') or []
+    if not time_records and r.get('time_record'):
+        time_records = [r['time_record']]
+    time_html = ''
+    if time_records:
+        def fmt_date(d):
+            if not d: return '-'
+            try:
+                dt = datetime.fromisoformat(str(d).replace('Z', ''))
+                return f"{dt.year}년 {dt.month}월 {dt.day}일"
+            except Exception:
+                return str(d)
+
+        def fmt_time(t):
+            if not t: return '-'
+            s = str(t).strip()
+            # HH:MM:SS → HH:MM
+            if len(s) >= 5 and ':' in s:
+                return s[:5]
+            return s
+
+        rows = ''.join(
+            f'''<tr>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_date(tr.get("date") or tr.get("work_date"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("departure_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_start_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_end_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("travel_end_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("work_meal_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center;">{fmt_time(tr.get("travel_meal_time"))}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center; font-weight:bold; color:#1a56db;">{tr.get("calculated_work_time") or "-"}</td>
+              <td style="border:1px solid #aaa; padding:2px 4px; text-align:center; font-weight:bold; color:#1a56db;">{tr.get("calculated_travel_time") or "-"}</td>
+            </tr>'''
+            for tr in time_records
+        )
+        time_html = f'''
+        <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">작업/이동 시간 기록부</div>
+        <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:8.5pt;">
+          <thead>
+            <tr style="background:#f0f0f0;">
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">날짜</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">출발시간</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">작업시작</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">작업종료</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">이동종료</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">식사(작업)</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center;">식사(이동)</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center; color:#1a56db;">작업시간</th>
+              <th style="border:1px solid #aaa; padding:2px 4px; text-align:center; color:#1a56db;">이동시간</th>
+            </tr>
+          </thead>
+          <tbody>{rows}</tbody>
+        </table>'''
+
+    # 고객 서명
+    sig_html = ''
+    if r.get('has_signature') and r.get('customer_signature'):
+        signed_at = '-'
+        if r.get('customer_signed_at'):
+            try:
+                dt = datetime.fromisoformat(str(r['customer_signed_at']).replace('Z', ''))
+                signed_at = dt.strftime('%Y년 %m월 %d일 %H:%M')
+            except Exception:
+                signed_at = str(r['customer_signed_at'])
+        sig_html = f'''
+        <div style="margin-top:6mm;">
+          <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">고객 서명</div>
+          <table style="width:100%; border-collapse:collapse; font-size:9pt;">
+            <tr>
+              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:middle;">서명자</td>
+              <td style="border:1px solid #aaa; padding:3px 6px; vertical-align:middle;">{r.get("signer_name") or "-"}</td>
+              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:middle;">서명일시</td>
+              <td style="border:1px solid #aaa; padding:3px 6px; vertical-align:middle;">{signed_at}</td>
+            </tr>
+            <tr>
+              <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; vertical-align:top;">서명</td>
+              <td colspan="3" style="border:1px solid #aaa; padding:4px 6px;">
+                <img src="{r["customer_signature"]}" style="max-height:60px; max-width:300px;" />
+              </td>
+            </tr>
+          </table>
+        </div>'''
+
+    problem_desc = (r.get('problem_description') or r.get('symptom') or '-').replace('\n', '<br>')
+    solution_desc = (r.get('solution_description') or r.get('details') or '-').replace('\n', '<br>')
+
+    style_block = f'<style>{PDF_CSS}</style>' if inline_css else ''
+
+    html = f'''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+{style_block}
+</head>
+<body>
+  <div>
+    <!-- 헤더 -->
+    <div style="display:flex; align-items:center; justify-content:space-between; margin-bottom:8mm;">
+      {logo_tag}
+      <div style="text-align:center; flex:1;">
+        <h2 style="margin:0; font-size:16pt; letter-spacing:4px;">서비스 리포트</h2>
+        <div style="font-size:9pt; color:#555; margin-top:2mm;">No. {r.get("report_number") or r.get("id")}</div>
+      </div>
+      <div style="width:40px;"></div>
+    </div>
+
+    <!-- 기본 정보 -->
+    <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:18%">서비스 날짜</td>
+        <td style="border:1px solid #aaa; padding:3px 6px; width:22%">{service_date_str}</td>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:15%">서비스담당</td>
+        <td style="border:1px solid #aaa; padding:3px 6px; width:18%">{r.get("technician_name") or "-"}</td>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:12%">동행/지원</td>
+        <td style="border:1px solid #aaa; padding:3px 6px;">{support_tech_names}</td>
+      </tr>
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">고객명</td>
+        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="5">{r.get("customer_name") or "-"}</td>
+      </tr>
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">고객사 주소</td>
+        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="5">{r.get("customer_address") or "-"}</td>
+      </tr>
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">Model</td>
+        <td style="border:1px solid #aaa; padding:3px 6px;">{r.get("machine_model") or "-"}</td>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px;">SN</td>
+        <td style="border:1px solid #aaa; padding:3px 6px;" colspan="3">{r.get("machine_serial") or "-"}</td>
+      </tr>
+    </table>
+
+    <!-- 작업 내용 -->
+    <div style="font-weight:bold; font-size:10pt; margin-bottom:2mm;">작업 내용</div>
+    <table style="width:100%; border-collapse:collapse; margin-bottom:5mm; font-size:9pt;">
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; width:20%; vertical-align:top;">Job Description</td>
+        <td style="border:1px solid #aaa; padding:4px 6px; min-height:20mm;">{problem_desc}</td>
+      </tr>
+      <tr>
+        <td style="background:#f0f0f0; font-weight:bold; border:1px solid #aaa; padding:3px 6px; vertical-align:top;">처리 내용</td>
+        <td style="border:1px solid #aaa; padding:4px 6px; min-height:25mm;">{solution_desc}</td>
+      </tr>
+    </table>
+
+    {parts_html}
+    {time_html}
+    {sig_html}
+
+    <div style="margin-top:8mm; border-top:1px solid #ccc; padding-top:4mm; font-size:8pt; color:#777; text-align:right;">
+      출력일: {today_str}
+    </div>
+  </div>
+</body>
+</html>'''
+    return html
+
+
+def get_save_info():
+    """시스템 설정에서 서비스리포트 PDF 저장 경로 및 접속 정보 조회"""
+    try:
+        import sqlite3
+        db_path = os.path.join('app', 'database', 'webtranet.db')
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT key, value FROM system_settings "
+            "WHERE key IN ('service_report_save_path','service_report_save_user','service_report_save_password')"
+        ).fetchall()
+        conn.close()
+        s = {r['key']: r['value'] for r in rows}
+        return {
+            'path':     s.get('service_report_save_path') or None,
+            'username': s.get('service_report_save_user') or None,
+            'password': s.get('service_report_save_password') or None,
+        }
+    except Exception as e:
+        print(f"❌ 서비스리포트 저장 경로 설정 조회 실패: {str(e)}")
+        return {'path': None, 'username': None, 'password': None}
+
+
+def prepare_report_dict(report, signature_url=None, user_names=None):
+    """
+    PDF용 리포트 dict (서명 이미지, 동행 기술자 이름 포함)
+
+    Args:
+        report: ServiceReport
+        signature_url: 이미 조회한 서명 data URL (없으면 서명이 있을 때 조회)
+        user_names: {user_id: 이름} (일괄 처리 시 미리 조회, 없으면 DB 조회)
+    """
+    from app.models.service_report_signature import ServiceReportSignature
+
+    report_dict = report.to_dict()
+    if report.has_signature:
+        report_dict['customer_signature'] = signature_url or ServiceReportSignature.get_data_url(report.id)
+
+    if not report_dict.get('support_technician_names'):
+        support_ids = report_dict.get('support_technician_ids') or []
+        if support_ids and user_names is None:
+            conn = get_db_connection()
+            try:
+                placeholders = ','.join('?' * len(support_ids))
+                user_names = {row['id']: row['name'] for row in conn.execute(
+                    f'SELECT id, name FROM users WHERE id IN ({placeholders})', list(support_ids)
+                ).fetchall()}
+            finally:
+                conn.close()
+        names = [user_names[int(uid)] for uid in support_ids if user_names and int(uid) in user_names]
+        report_dict['support_technician_names'] = ', '.join(names) if names else '없음'
+    return report_dict
+
+
+def report_filename(report_dict):
+    customer_name = report_dict.get('customer_name') or '고객'
+    report_number = report_dict.get('report_number') or str(report_dict.get('id'))
+    filename = f"서비스리포트-{customer_name}-{report_number}.pdf"
+    return ''.join(c for c in filename if c not in r'\/:*?"<>|')
+
+
+def month_folder_name(report_dict):
+    """서비스 날짜 기준 월 폴더 이름: {year}년{month:02d}월"""
+    service_date_str = report_dict.get('service_date') or datetime.now().strftime('%Y-%m-%d')
+    try:
+        sdate = datetime.strptime(service_date_str[:10], '%Y-%m-%d')
+    except Exception:
+        sdate = datetime.now()
+    return f"{sdate.year}년{sdate.month:02d}월"
+
+
+def save_to_configured_folder(pdf_bytes, report_dict, save_info, filename=None):
+    """
+    설정된 저장 경로의 월 폴더에 PDF 저장 (UNC 경로는 업로드 스풀에 등록)
+
+    Returns:
+        str: 저장(예약)한 대상 경로
+    """
+    from app.utils.smb_utils import is_unc_path
+    from app.utils import upload_spool
+
+    filename = filename or report_filename(report_dict)
+    month_folder = month_folder_name(report_dict)
+    base_path = save_info['path']
+
+    if is_unc_path(base_path):
+        # UNC 경로: 임시 파일에 저장 후 업로드 스풀에 등록 (백그라운드 업로드)
+        tmp_fd, tmp_path = tempfile.mkstemp(suffix='.pdf', prefix='sr_')
+        try:
+            with os.fdopen(tmp_fd, 'wb') as f:
+                f.write(pdf_bytes)
+            target_unc = base_path.rstrip('/\\') + '/' + month_folder + '/' + filename
+            upload_spool.enqueue(tmp_path, target_unc, credentials='service_report')
+            return target_unc
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    # 로컬/마운트 경로
+    save_dir = os.path.join(base_path, month_folder)
+    os.makedirs(save_dir, exist_ok=True)
+    save_file_path = os.path.join(save_dir, filename)
+    with open(save_file_path, 'wb') as f:
+        f.write(pdf_bytes)
+    return save_file_path
+
+
+# ---- 일괄 내보내기: WeasyPrint 프로세스 풀 워커 ----
+
+_worker_fonts = None
+_worker_css = None
+
+
+def _init_worker():
+    """워커 초기화: 폰트 설정과 공통 CSS를 한 번 로드하고 작은 문서로 폰트 캐시를 데움"""
+    global _worker_fonts, _worker_css
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _worker_fonts = FontConfiguration()
+    _worker_css = CSS(string=PDF_CSS, font_config=_worker_fonts)
+    HTML(string='<p>서비스 리포트 No. 0123456789</p>').write_pdf(
+        stylesheets=[_worker_css], font_config=_worker_fonts
+    )
+
+
+def _render_pdf(html):
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf(stylesheets=[_worker_css], font_config=_worker_fonts)
+
+
+def _job_dir(job_id):
+    return os.path.join(EXPORT_DIR, job_id)
+
+
+def _write_status(job_id, status):
+    status['updated_at'] = time.time()
+    fd, tmp_path = tempfile.mkstemp(dir=_job_dir(job_id), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(status, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(_job_dir(job_id), 'status.json'))
+
+
+def _owner_alive(status):
+    """작업을 실행하는 프로세스가 살아 있는지 (같은 서버의 pid 기준)"""
+    pid = status.get('pid')
+    if not pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def get_export_status(job_id):
+    """
+    일괄 내보내기 진행 상황 (없는 작업이면 None)
+
+    실행 스레드는 요청을 처리한 gunicorn 워커 안의 daemon 스레드라서 워커가 재시작(max_requests,
+    타임아웃, 배포)되면 함께 사라진다. 실행 프로세스가 없거나 STALE_JOB_SECONDS 동안 갱신이 없으면
+    failed로 보고해 화면이 멈춘 진행률을 계속 보여주지 않고 다시 시작할 수 있게 한다.
+    """
+    if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+        return None
+    try:
+        with open(os.path.join(_job_dir(job_id), 'status.json'), 'r', encoding='utf-8') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if status.get('state') in ('queued', 'running') and (
+            not _owner_alive(status) or time.time() - status.get('updated_at', 0) >= STALE_JOB_SECONDS):
+        status['state'] = 'failed'
+        status['error'] = '작업 프로세스가 종료되어 중단되었습니다. 다시 시작해 주세요.'
+    return status
+
+
+def get_export_result_path(job_id):
+    """완료된 작업의 결과 파일 경로 (없으면 None)"""
+    status = get_export_status(job_id)
+    if not status or status.get('state') != 'done' or not status.get('result_file'):
+        return None
+    path = os.path.join(_job_dir(job_id), status['result_file'])
+    return path if os.path.exists(path) else None
+
+
+def _cleanup_old_jobs():
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    now = time.time()
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        if not os.path.isdir(path):
+            continue
+        try:
+            if now - os.path.getmtime(path) > JOB_RETENTION_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def find_running_export():
+    """실행 중인 일괄 내보내기 작업 ID (없으면 None)"""
+    if not os.path.isdir(EXPORT_DIR):
+        return None
+    for name in os.listdir(EXPORT_DIR):
+        status = get_export_status(name)
+        if status and status.get('state') in ('queued', 'running'):
+            return name
+    return None
+
+
+def _acquire_create_lock():
+    """작업 등록 잠금 (O_CREAT|O_EXCL로 한 프로세스만 잠금 파일을 만든다)"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    deadline = time.time() + CREATE_LOCK_WAIT_SECONDS
+    while True:
+        try:
+            fd = os.open(CREATE_LOCK_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return
+        except FileExistsError:
+            pass
+        try:
+            if time.time() - os.path.getmtime(CREATE_LOCK_PATH) > CREATE_LOCK_STALE_SECONDS:
+                os.remove(CREATE_LOCK_PATH)
+                continue
+        except OSError:
+            continue  # 그 사이 해제됨
+        if time.time() > deadline:
+            raise TimeoutError('일괄 내보내기 작업 등록 잠금을 얻지 못했습니다.')
+        time.sleep(0.05)
+
+
+def _release_create_lock():
+    try:
+        os.remove(CREATE_LOCK_PATH)
+    except OSError:
+        pass
+
+
+def create_export_job(start_date, end_date, output_format='zip', save_to_folders=True):
+    """
+    일괄 내보내기 작업 등록 (status.json 생성). run_export로 실행한다.
+
+    진행 중 작업 확인과 status.json 생성을 잠금 안에서 하므로 여러 gunicorn 워커가 동시에 요청해도
+    하나만 등록된다.
+
+    Raises:
+        ExportAlreadyRunning: 이미 진행 중인 작업이 있을 때
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f'format은 {", ".join(EXPORT_FORMATS)} 중 하나여야 합니다.')
+    _acquire_create_lock()
+    try:
+        running = find_running_export()
+        if running:
+            raise ExportAlreadyRunning(running)
+        _cleanup_old_jobs()
+        job_id = uuid.uuid4().hex[:16]
+        os.makedirs(os.path.join(_job_dir(job_id), 'pdf'), exist_ok=True)
+        _write_status(job_id, _new_status(job_id, start_date, end_date, output_format, save_to_folders))
+    finally:
+        _release_create_lock()
+    return job_id
+
+
+def _new_status(job_id, start_date, end_date, output_format, save_to_folders):
+    return {
+        'job_id': job_id,
+        'pid': os.getpid(),
+        'state': 'queued',
+        'start_date': start_date,
+        'end_date': end_date,
+        'format': output_format,
+        'save_to_folders': bool(save_to_folders),
+        'total': 0,
+        'done': 0,
+        'failed': [],
+        'save_errors': [],
+        'result_file': None,
+        'error': None,
+        'created_at': time.time(),
+    }
+
+
+def _load_reports(start_date, end_date):
+    """기간 내 리포트와 PDF용 dict 목록 (서명/동행 기술자 이름은 한 번에 조회)"""
+    from app.models.service_report import ServiceReport
+    from app.models.service_report_signature import ServiceReportSignature
+
+    reports = ServiceReport.get_by_service_date(start_date, end_date)
+    conn = get_db_connection()
+    try:
+        signatures = ServiceReportSignature.get_data_urls(conn, [r.id for r in reports if r.has_signature])
+        user_names = {row['id']: row['name'] for row in conn.execute('SELECT id, name FROM users').fetchall()}
+    finally:
+        conn.close()
+    return [prepare_report_dict(r, signatures.get(r.id), user_names) for r in reports]
+
+
+def _assemble(job_id, entries, output_format):
+    """렌더링된 PDF들을 ZIP 또는 병합 PDF로 묶기 (entries: 리포트 순서대로 (dict, pdf 경로))"""
+    job_dir = _job_dir(job_id)
+    if output_format == 'zip':
+        result_file = 'service_reports.zip'
+        with zipfile.ZipFile(os.path.join(job_dir, result_file), 'w', zipfile.ZIP_STORED) as zf:
+            for report_dict, pdf_path in entries:
+                zf.write(pdf_path, f'{month_folder_name(report_dict)}/{report_filename(report_dict)}')
+        return result_file
+
+    from pypdf import PdfWriter
+
+    result_file = 'service_reports.pdf'
+    writer = PdfWriter()
+    try:
+        for report_dict, pdf_path in entries:
+            start_page = len(writer.pages)
+            writer.append(pdf_path, import_outline=False)
+            title = f"{report_dict.get('report_number') or report_dict.get('id')} {report_dict.get('customer_name') or ''}"
+            writer.add_outline_item(title.strip(), start_page)
+        with open(os.path.join(job_dir, result_file), 'wb') as f:
+            writer.write(f)
+    finally:
+        writer.close()
+    return result_file
+
+
+def run_export(job_id, workers=None, progress=None):
+    """
+    일괄 내보내기 실행 (호출한 스레드에서 끝날 때까지 실행)
+
+    Args:
+        job_id: create_export_job으로 만든 작업
+        workers: 프로세스 수 (기본 SERVICE_REPORT_PDF_WORKERS 또는 CPU 수, 최대 4)
+        progress: 리포트 하나 끝날 때마다 호출 progress(status)
+
+    Returns:
+        dict: 최종 상태
+    """
+    status = get_export_status(job_id)
+    job_pdf_dir = os.path.join(_job_dir(job_id), 'pdf')
+    status['pid'] = os.getpid()
+    status['state'] = 'running'
+    _write_status(job_id, status)
+
+    try:
+        report_dicts = _load_reports(status['start_date'], status['end_date'])
+        status['total'] = len(report_dicts)
+        _write_status(job_id, status)
+
+        save_info = get_save_info() if status['save_to_folders'] else {'path': None}
+        rendered = {}
+        if report_dicts:
+            # fork 시 부모의 스레드/DB 연결 상태가 복제되지 않도록 spawn 사용
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(workers or EXPORT_WORKERS, len(report_dicts)),
+                                     mp_context=context, initializer=_init_worker) as pool:
+                futures = {
+                    pool.submit(_render_pdf, build_pdf_html(report_dict, inline_css=False)): index
+                    for index, report_dict in enumerate(report_dicts)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    report_dict = report_dicts[index]
+                    label = report_dict.get('report_number') or str(report_dict.get('id'))
+                    try:
+                        pdf_bytes = future.result()
+                    except Exception as e:
+                        status['failed'].append({'report_number': label, 'error': str(e)[:300]})
+                    else:
+                        pdf_path = os.path.join(job_pdf_dir, f'{index:05d}.pdf')
+                        with open(pdf_path, 'wb') as f:
+                            f.write(pdf_bytes)
+                        rendered[index] = pdf_path
+                        if save_info['path']:
+                            try:
+                                save_to_configured_folder(pdf_bytes, report_dict, save_info)
+                            except Exception as e:
+                                status['save_errors'].append({'report_number': label, 'error': str(e)[:300]})
+                        status['done'] += 1
+                    _write_status(job_id, status)
+                    if progress:
+                        progress(status)
+
+        if rendered:
+            entries = [(report_dicts[i], rendered[i]) for i in sorted(rendered)]
+            status['result_file'] = _assemble(job_id, entries, status['format'])
+        shutil.rmtree(job_pdf_dir, ignore_errors=True)
+        status['state'] = 'done'
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        status['state'] = 'failed'
+        status['error'] = str(e)
+    _write_status(job_id, status)
+    return status
+
+
+def start_export(start_date, end_date, output_format='zip', save_to_folders=True):
+    """
+    일괄 내보내기를 백그라운드 스레드로 시작하고 작업 ID 반환
+
+    daemon 스레드라서 이 워커 프로세스가 끝나면 작업도 중단된다 (get_export_status가 failed로 보고).
+    워커 재시작과 무관하게 끝까지 돌려야 하면 export_service_report_pdfs.py를 사용한다.
+
+    Raises:
+        ExportAlreadyRunning: 이미 진행 중인 작업이 있을 때
+    """
+    job_id = create_export_job(start_date, end_date, output_format, save_to_folders)
+    threading.Thread(target=run_export, args=(job_id,), name=f'sr-export-{job_id}', daemon=True).start()
+    return job_id
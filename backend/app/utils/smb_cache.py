@@ -0,0 +1,185 @@
+"""
+SMB 파일 로컬 디스크 캐시 (read-through LRU)
+
+네트워크 공유의 거래명세서/서비스 리포트 파일을 instance/smb_cache에 보관한다.
+- 키: UNC 경로 (대소문자/구분자 정규화)
+- 유효성: 원격 파일의 크기/수정시각(smbclient ls)이 저장 시점과 같을 때만 캐시 사용
+  마지막 확인 후 SMB_CACHE_VALIDATE_SECONDS(기본 300초) 안에는 NAS에 묻지 않고 바로 제공
+- NAS에 접속할 수 없으면 이미 캐시된 파일을 그대로 제공 (파일이 없다는 응답일 때만 캐시 삭제)
+- 용량: SMB_CACHE_MAX_MB(기본 1024MB)를 넘으면 마지막 접근이 오래된 파일부터 삭제
+- 생성 시점에 로컬 원본이 있으면 put()으로 미리 채워 첫 조회도 NAS 다운로드 없이 제공
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+
+from app.utils.smb_utils import parse_unc, smb_get, smb_stat, unc_key
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'instance', 'smb_cache'
+)
+MAX_CACHE_BYTES = int(os.getenv('SMB_CACHE_MAX_MB', '1024')) * 1024 * 1024
+VALIDATE_SECONDS = int(os.getenv('SMB_CACHE_VALIDATE_SECONDS', '300'))
+
+_evict_lock = threading.Lock()
+
+
+def _entry_paths(unc_path):
+    """(데이터 파일 경로, 메타 파일 경로)"""
+    normalized = unc_key(unc_path)
+    key = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    ext = os.path.splitext(normalized)[1]
+    return os.path.join(CACHE_DIR, key + ext), os.path.join(CACHE_DIR, key + '.json')
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_entry(data_path, meta_path):
+    for path in (meta_path, data_path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _touch(data_path):
+    """LRU용 접근 시각 갱신 (수정시각은 유지하여 send_file ETag가 바뀌지 않도록)"""
+    try:
+        st = os.stat(data_path)
+        os.utime(data_path, (time.time(), st.st_mtime))
+    except OSError:
+        pass
+
+
+def _store(unc_path, source_path, remote_stat, move=False):
+    """파일을 캐시에 원자적으로 저장하고 메타 정보 기록"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    data_path, meta_path = _entry_paths(unc_path)
+
+    fd, tmp_data = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        if move:
+            shutil.move(source_path, tmp_data)
+        else:
+            shutil.copyfile(source_path, tmp_data)
+        os.replace(tmp_data, data_path)
+    except Exception:
+        try:
+            os.unlink(tmp_data)
+        except OSError:
+            pass
+        raise
+
+    _write_meta(unc_path, meta_path, remote_stat)
+    _evict()
+    return data_path
+
+
+def _write_meta(unc_path, meta_path, remote_stat):
+    """메타 정보 기록 (validated_at: 원격 파일과 마지막으로 비교한 시각)"""
+    size, mtime = remote_stat
+    fd, tmp_meta = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'path': unc_path, 'size': size, 'mtime': mtime, 'validated_at': time.time()},
+                  f, ensure_ascii=False)
+    os.replace(tmp_meta, meta_path)
+
+
+def _evict():
+    """전체 용량이 MAX_CACHE_BYTES를 넘으면 오래된 항목부터 삭제"""
+    with _evict_lock:
+        entries = []
+        total = 0
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith('.json') or name.endswith('.tmp'):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, path))
+            total += st.st_size
+
+        if total <= MAX_CACHE_BYTES:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= MAX_CACHE_BYTES:
+                break
+            _remove_entry(path, os.path.splitext(path)[0] + '.json')
+            total -= size
+
+
+def get_cached(unc_path: str, username: str, password: str) -> str:
+    """
+    UNC 파일의 로컬 캐시 경로 반환 (없거나 원격 파일이 바뀌었으면 다운로드 후 저장)
+    반환된 파일은 캐시 소유이므로 호출자가 삭제하지 않는다.
+    """
+    server, share, sub = parse_unc(unc_path)
+    data_path, meta_path = _entry_paths(unc_path)
+
+    meta = _read_meta(meta_path)
+    cached = (meta is not None and os.path.exists(data_path)
+              and os.path.getsize(data_path) == meta.get('size'))
+    if cached and time.time() - meta.get('validated_at', 0) < VALIDATE_SECONDS:
+        _touch(data_path)
+        return data_path
+
+    try:
+        remote_stat = smb_stat(server, share, sub, username, password, raise_on_error=True)
+    except Exception as e:
+        if cached:
+            # NAS 장애: 마지막으로 받은 사본 제공
+            print(f'SMB 확인 실패, 캐시 사본 제공({unc_path}): {e}')
+            _touch(data_path)
+            return data_path
+        raise
+    if remote_stat is None:
+        _remove_entry(data_path, meta_path)
+        raise RuntimeError(f'SMB 다운로드 실패: 파일을 찾을 수 없습니다 ({sub})')
+
+    if cached and (meta.get('size'), meta.get('mtime')) == remote_stat:
+        _write_meta(unc_path, meta_path, remote_stat)
+        _touch(data_path)
+        return data_path
+
+    tmp = smb_get(server, share, sub, username, password)
+    try:
+        return _store(unc_path, tmp, remote_stat, move=True)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def put(local_path: str, unc_path: str, username: str, password: str, remote_stat=None):
+    """
+    업로드 직후 로컬 원본으로 캐시 채우기 (copy_to_target / 업로드 스풀 완료 후 호출)
+    remote_stat: 이미 조회한 원격 (크기, 수정시각)이 있으면 전달
+    실패해도 예외를 올리지 않는다 (다음 조회 시 다운로드).
+    """
+    if platform.system() == 'Windows':
+        return  # Windows는 UNC 경로를 직접 제공하므로 캐시 불필요
+    try:
+        server, share, sub = parse_unc(unc_path)
+        if remote_stat is None:
+            remote_stat = smb_stat(server, share, sub, username, password or '')
+        if remote_stat is None or remote_stat[0] != os.path.getsize(local_path):
+            return
+        _store(unc_path, local_path, remote_stat)
+    except Exception as e:
+        print(f'SMB 캐시 저장 실패({unc_path}): {e}')
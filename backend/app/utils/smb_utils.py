@@ -5,6 +5,7 @@ Windows: net use 명령 사용
 """
 import os
 import platform
+import re
 import shutil
 import subprocess
 import tempfile
@@ -40,6 +41,11 @@ def parse_unc(path: str):
     return server, share, sub
 
 
+def unc_key(path: str) -> str:
+    """UNC 경로 비교용 키 (구분자 '/' 통일, 대소문자 무시 - SMB는 대소문자 구분 안 함)"""
+    return path.replace('\\', '/').lstrip('/').lower()
+
+
 def unc_join(base: str, *parts) -> str:
     """UNC 경로 결합"""
     result = base.rstrip('/\\')
@@ -67,7 +73,7 @@ def _write_creds_file(username: str, password: str) -> str:
 
 
 def _run_smbclient(server: str, share: str, commands: list,
-                    username: str, password: str) -> subprocess.CompletedProcess:
+                    username: str, password: str, timeout: float = 30) -> subprocess.CompletedProcess:
     """smbclient 명령 실행 (Linux 전용)"""
     creds = None
     try:
@@ -75,7 +81,7 @@ def _run_smbclient(server: str, share: str, commands: list,
         result = subprocess.run(
             [_SMBCLIENT, f'//{server}/{share}', '-A', creds,
              '-c', '; '.join(commands)],
-            capture_output=True, text=True, timeout=30
+            capture_output=True, text=True, timeout=timeout
         )
         return result
     finally:
@@ -118,6 +124,40 @@ def smb_put(local_path: str, server: str, share: str, remote_sub: str,
             raise RuntimeError(f'SMB 업로드 실패: {stderr}')
 
 
+def upload_temp_name(remote_sub: str) -> str:
+    """smb_put_many가 업로드 중에 쓰는 임시 파일 경로 (완료 후 원래 이름으로 변경)"""
+    remote_sub = remote_sub.replace('\\', '/')
+    head, _, name = remote_sub.rpartition('/')
+    return f'{head}/.{name}.uploading' if head else f'.{name}.uploading'
+
+
+def smb_put_many(server: str, share: str, files: list,
+                  username: str, password: str, timeout: float = 30):
+    """
+    여러 로컬 파일을 한 번의 smbclient 세션으로 업로드
+    files: [(local_path, remote_sub), ...]
+    각 파일은 임시 이름(upload_temp_name)으로 올린 뒤 기존 파일을 지우고 이름을 바꾼다.
+    smbclient는 실패한 명령 이후에도 계속 진행하므로, 파일별 결과는 smb_list로 확인한다
+    (대상 파일이 있고 임시 파일이 남아 있지 않아야 성공).
+    """
+    mkdir_cmds = []
+    put_cmds = []
+    seen_dirs = set()
+    for local_path, remote_sub in files:
+        remote_sub = remote_sub.replace('\\', '/')
+        parts = [p for p in remote_sub.split('/')[:-1] if p]
+        for i in range(len(parts)):
+            partial = '/'.join(parts[:i + 1])
+            if partial not in seen_dirs:
+                seen_dirs.add(partial)
+                mkdir_cmds.append(f'mkdir "{partial}"')
+        temp_sub = upload_temp_name(remote_sub)
+        put_cmds.append(f'put "{local_path}" "{temp_sub}"')
+        put_cmds.append(f'del "{remote_sub}"')
+        put_cmds.append(f'rename "{temp_sub}" "{remote_sub}"')
+    return _run_smbclient(server, share, mkdir_cmds + put_cmds, username, password, timeout=timeout)
+
+
 def smb_get(server: str, share: str, remote_sub: str,
              username: str, password: str) -> str:
     """SMB 공유에서 파일 다운로드 → 임시 파일 경로 반환 (호출자가 삭제 필요)"""
@@ -155,6 +195,62 @@ def smb_exists(server: str, share: str, remote_sub: str,
         return False
 
 
+# smbclient ls 출력 행: "  파일명   A   12345  Mon Oct 27 10:11:12 2025"
+_SMB_LS_LINE = re.compile(
+    r'^\s+(?P<name>.+?)\s+(?P<attr>[A-Za-z]*)\s+(?P<size>\d+)\s+'
+    r'(?P<mtime>\w{3}\s+\w{3}\s+\d+\s+\d{2}:\d{2}:\d{2}\s+\d{4})\s*$'
+)
+
+
+# 파일/경로가 없을 때의 smbclient 오류 (그 외 오류는 NAS 접속 실패로 본다)
+_SMB_NOT_FOUND = ('NT_STATUS_NO_SUCH_FILE', 'NT_STATUS_OBJECT_NAME_NOT_FOUND', 'NT_STATUS_OBJECT_PATH_NOT_FOUND')
+
+
+def smb_stat(server: str, share: str, remote_sub: str,
+              username: str, password: str, raise_on_error: bool = False):
+    """
+    SMB 공유 파일의 (크기, 수정시각 문자열) 조회. 파일이 없으면 None.
+    파일 내용을 내려받지 않으므로 캐시 유효성 확인에 사용.
+    raise_on_error=True이면 파일 없음이 아닌 오류(NAS 접속 실패 등)는 RuntimeError
+    """
+    remote_sub = remote_sub.replace('\\', '/')
+    result = _run_smbclient(
+        server, share,
+        [f'ls "{remote_sub}"'],
+        username, password
+    )
+    if result.returncode != 0:
+        output = f'{result.stdout}\n{result.stderr}'
+        if raise_on_error and not any(status in output for status in _SMB_NOT_FOUND):
+            raise RuntimeError(f'SMB 접속 실패: {result.stderr.strip() or result.stdout.strip()}')
+        return None
+    filename = os.path.basename(remote_sub)
+    for line in result.stdout.splitlines():
+        m = _SMB_LS_LINE.match(line)
+        if m and m.group('name') == filename:
+            return int(m.group('size')), ' '.join(m.group('mtime').split())
+    return None
+
+
+def smb_list(server: str, share: str, remote_dir: str,
+             username: str, password: str) -> dict:
+    """
+    SMB 공유 폴더의 파일 목록 {파일명: (크기, 수정시각 문자열)}
+    폴더가 없으면 빈 dict. 여러 파일 확인을 smbclient 한 번으로 처리할 때 사용.
+    """
+    remote_dir = remote_dir.replace('\\', '/').strip('/')
+    pattern = f'{remote_dir}/*' if remote_dir else '*'
+    result = _run_smbclient(server, share, [f'ls "{pattern}"'], username, password)
+    if result.returncode != 0:
+        return {}
+    entries = {}
+    for line in result.stdout.splitlines():
+        m = _SMB_LS_LINE.match(line)
+        if m and m.group('name') not in ('.', '..'):
+            entries[m.group('name')] = (int(m.group('size')), ' '.join(m.group('mtime').split()))
+    return entries
+
+
 # ─── 고수준 API ────────────────────────────────────────────────────────────────
 
 def copy_to_target(local_path: str, target_path: str,
@@ -189,15 +285,20 @@ def copy_to_target(local_path: str, target_path: str,
 
 def get_for_serve(file_path: str, username: str = None, password: str = None):
     """
-    파일을 서빙용으로 준비. UNC(Linux)이면 임시 다운로드.
+    파일을 서빙용으로 준비. UNC(Linux)이면 로컬 디스크 캐시 경로 반환 (smb_cache 참고).
     반환: (serve_path, is_temp) — is_temp == True 이면 사용 후 삭제 필요
     """
     if is_unc_path(file_path):
         if platform.system() == 'Windows':
             return file_path, False
-        server, share, sub = parse_unc(file_path)
-        tmp = smb_get(server, share, sub, username, password or '')
-        return tmp, True
+        # 아직 업로드 대기 중인 파일이면 스풀 사본을 제공
+        from app.utils.upload_spool import find_pending
+        pending = find_pending(file_path)
+        if pending:
+            return pending, False
+        # 로컬 디스크 캐시에서 제공 (원격 크기/수정시각이 같으면 다운로드 생략)
+        from app.utils.smb_cache import get_cached
+        return get_cached(file_path, username, password or ''), False
     return file_path, False
 
 
@@ -206,6 +307,9 @@ def path_exists(file_path: str, username: str = None, password: str = None) -> b
     if is_unc_path(file_path):
         if platform.system() == 'Windows':
             return os.path.exists(file_path)
+        from app.utils.upload_spool import find_pending
+        if find_pending(file_path):
+            return True
         if username:
             server, share, sub = parse_unc(file_path)
             return smb_exists(server, share, sub, username, password or '')
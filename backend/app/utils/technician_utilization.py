@@ -0,0 +1,150 @@
+"""
+Technician utilization
+서비스 리포트 시간기록(work_minutes/travel_minutes)으로 기술자별 주간/월간 가동률과 초과근무 계산
+
+- 기술자/일자별 합계는 SQL GROUP BY로 구하고, 기간 구분/가동률/초과근무는 pandas로 일괄 계산
+- 담당 기술자와 동행(support_technician_ids) 기술자 모두 해당 리포트의 시간을 근무한 것으로 본다
+- 가용 시간: 조회 기간 안의 평일 수 x STANDARD_DAILY_MINUTES (공휴일은 구분하지 않음)
+- 초과근무: max(일별 기준 초과분 합계, 기간 합계 - 가용 시간)
+"""
+import numpy as np
+import pandas as pd
+
+from app.database.init_db import get_db_connection
+
+STANDARD_DAILY_MINUTES = 8 * 60
+PERIODS = {'week': 'W-SUN', 'month': 'M'}
+
+_DAILY_SQL = '''
+    WITH assignments AS (
+        SELECT id AS service_report_id, technician_id FROM service_reports
+        WHERE technician_id IS NOT NULL
+        {support_sql}
+    )
+    SELECT a.technician_id, u.name AS technician_name, tr.work_date,
+           SUM(COALESCE(tr.work_minutes, 0)) AS work_minutes,
+           SUM(COALESCE(tr.travel_minutes, 0)) AS travel_minutes
+    FROM service_report_time_records tr
+    JOIN assignments a ON a.service_report_id = tr.service_report_id
+    LEFT JOIN users u ON u.id = a.technician_id
+    WHERE tr.work_date >= ? AND tr.work_date <= ?
+        {technician_sql}
+    GROUP BY a.technician_id, tr.work_date
+'''
+
+# 동행 기술자 (JSON 배열) - 컬럼이 있는 DB에서만 사용, 담당자와 겹치면 UNION으로 제거
+_SUPPORT_SQL = '''
+        UNION
+        SELECT sr.id, CAST(je.value AS INTEGER)
+        FROM service_reports sr,
+             json_each(CASE WHEN json_valid(sr.support_technician_ids) THEN sr.support_technician_ids ELSE '[]' END) je
+'''
+
+_ROW_COLUMNS = ['technician_id', 'technician_name', 'period_start', 'period_end',
+                'work_minutes', 'travel_minutes', 'total_minutes', 'available_minutes',
+                'overtime_minutes', 'utilization_pct', 'days_worked']
+
+
+def _daily_minutes(start_date, end_date, technician_id=None):
+    conn = get_db_connection()
+    try:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(service_reports)').fetchall()]
+        sql = _DAILY_SQL.format(
+            support_sql=_SUPPORT_SQL if 'support_technician_ids' in columns else '',
+            technician_sql='AND a.technician_id = ?' if technician_id else '',
+        )
+        params = [start_date, end_date] + ([technician_id] if technician_id else [])
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _summarize(df, start, end):
+    """기간(행)별 합계에 가용 시간/초과근무/가동률 열 추가"""
+    # 조회 범위로 잘린 기간의 평일 수 (busday_count의 끝 날짜는 포함하지 않으므로 +1일)
+    first = np.maximum(df['period_start'].values.astype('datetime64[D]'), np.datetime64(start, 'D'))
+    last = np.minimum(df['period_end'].values.astype('datetime64[D]'), np.datetime64(end, 'D'))
+    df['available_minutes'] = np.busday_count(first, last + np.timedelta64(1, 'D')) * STANDARD_DAILY_MINUTES
+    df['overtime_minutes'] = np.maximum(
+        df['daily_overtime'], (df['total_minutes'] - df['available_minutes']).clip(lower=0)
+    )
+    available = df['available_minutes'].where(df['available_minutes'] > 0)
+    df['utilization_pct'] = (df['total_minutes'] / available * 100).round(1)
+    return df
+
+
+def _to_records(df):
+    records = []
+    for row in df[_ROW_COLUMNS].itertuples(index=False):
+        records.append({
+            'technician_id': int(row.technician_id),
+            'technician_name': row.technician_name,
+            'period_start': row.period_start.strftime('%Y-%m-%d'),
+            'period_end': row.period_end.strftime('%Y-%m-%d'),
+            'work_minutes': int(row.work_minutes),
+            'travel_minutes': int(row.travel_minutes),
+            'total_minutes': int(row.total_minutes),
+            'available_minutes': int(row.available_minutes),
+            'overtime_minutes': int(row.overtime_minutes),
+            'utilization_pct': None if pd.isna(row.utilization_pct) else float(row.utilization_pct),
+            'days_worked': int(row.days_worked),
+        })
+    return records
+
+
+def get_utilization(start_date, end_date, period='week', technician_id=None):
+    """
+    기술자별 가동률/초과근무 리포트
+
+    Args:
+        start_date, end_date: 조회 기간 (YYYY-MM-DD, 양 끝 포함)
+        period: 'week' (월~일) 또는 'month'
+        technician_id: 지정하면 해당 기술자만
+
+    Returns:
+        dict: periods(기술자/기간별 행), technicians(기술자별 전체 기간 합계)
+    """
+    if period not in PERIODS:
+        raise ValueError(f'period는 {", ".join(PERIODS)} 중 하나여야 합니다.')
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    if end < start:
+        raise ValueError('종료일이 시작일보다 이릅니다.')
+
+    result = {
+        'start_date': start.strftime('%Y-%m-%d'),
+        'end_date': end.strftime('%Y-%m-%d'),
+        'period': period,
+        'standard_daily_minutes': STANDARD_DAILY_MINUTES,
+        'periods': [],
+        'technicians': [],
+    }
+
+    df = _daily_minutes(result['start_date'], result['end_date'], technician_id)
+    df['work_date'] = pd.to_datetime(df['work_date'].astype(str).str[:10], format='%Y-%m-%d', errors='coerce')
+    df = df.dropna(subset=['work_date'])
+    if df.empty:
+        return result
+
+    df['technician_name'] = df['technician_name'].fillna('')
+    df['total_minutes'] = df['work_minutes'] + df['travel_minutes']
+    df['daily_overtime'] = (df['total_minutes'] - STANDARD_DAILY_MINUTES).clip(lower=0)
+    df['days_worked'] = (df['total_minutes'] > 0).astype(int)
+
+    sums = ['work_minutes', 'travel_minutes', 'total_minutes', 'daily_overtime', 'days_worked']
+    keys = ['technician_id', 'technician_name']
+
+    periods = df['work_date'].dt.to_period(PERIODS[period])
+    df['period_start'] = periods.dt.start_time
+    df['period_end'] = periods.dt.end_time.dt.normalize()
+    by_period = df.groupby(keys + ['period_start', 'period_end'], as_index=False)[sums].sum()
+    by_period = _summarize(by_period, start, end).sort_values(keys[1:] + keys[:1] + ['period_start'])
+    result['periods'] = _to_records(by_period)
+
+    # 전체 기간 합계 (초과근무는 기간별 초과근무의 합)
+    totals = by_period.groupby(keys, as_index=False)[sums + ['overtime_minutes']].sum()
+    totals['period_start'], totals['period_end'] = start, end
+    totals['daily_overtime'] = totals['overtime_minutes']
+    totals = _summarize(totals, start, end).sort_values('total_minutes', ascending=False)
+    result['technicians'] = _to_records(totals)
+    return result
@@ -0,0 +1,423 @@
+"""
+네트워크 공유 업로드 스풀 (write-behind)
+
+생성한 문서를 instance/upload_spool에 먼저 복사하고 upload_queue 테이블에 등록한 뒤
+바로 응답한다. 백그라운드 업로더 스레드가 대기 항목을 묶어서 공유 폴더로 올리고,
+실패하면 지수 백오프로 재시도한다. NAS가 내려가 있어도 요청은 실패하지 않는다.
+
+- 항목 선점은 UPDATE ... RETURNING 한 번으로 처리하므로 gunicorn 워커가 여러 개여도 중복 업로드 없음
+- 같은 대상 경로는 순서 보장: 새로 예약하면 이전 대기/실패 항목은 superseded,
+  선점은 대상 경로별 가장 최근 항목 하나만 (업로드 중인 항목이 있으면 끝날 때까지 대기)
+- 업로드 중 프로세스가 죽은 항목은 STALE_CLAIM_SECONDS 이후 다시 선점
+- 업로드 완료 전에는 get_for_serve / path_exists가 스풀 사본을 사용 (find_pending)
+- 업로드 완료 시 smb_cache에 채워 첫 조회도 NAS 다운로드 없이 제공
+- 접속 정보는 큐에 저장하지 않고 업로드할 때 시스템 설정에서 조회 (비밀번호 변경 후 재시도도 새 정보 사용)
+"""
+import os
+import platform
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from itertools import groupby
+
+from app.database.init_db import get_db_connection
+from app.utils.smb_utils import (
+    copy_to_target, is_unc_path, parse_unc, smb_list, smb_put_many, unc_key, upload_temp_name
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SPOOL_DIR = os.path.join(BACKEND_DIR, 'instance', 'upload_spool')
+SETTINGS_DB_PATH = os.path.join(BACKEND_DIR, 'app', 'database', 'webtranet.db')  # system_settings
+
+# credentials_key -> 시스템 설정 (저장 경로, 사용자, 비밀번호) 키
+CREDENTIAL_SETTINGS = {
+    'invoice': ('invoice_save_path', 'invoice_save_user', 'invoice_save_password'),
+    'service_report': ('service_report_save_path', 'service_report_save_user', 'service_report_save_password'),
+}
+
+BATCH_SIZE = 20             # 한 번에 선점하는 최대 항목 수
+SMB_CALL_MAX_BYTES = 32 * 1024 * 1024  # smbclient 한 번에 올리는 최대 용량 (넘으면 나눠서 실행)
+SMB_BASE_TIMEOUT = 30       # smbclient 1회 기본 제한 시간 (초)
+SMB_MIN_BYTES_PER_SEC = 256 * 1024  # 느린 NAS 기준 최소 전송 속도 (용량에 비례해 제한 시간 연장)
+POLL_INTERVAL = 30          # 대기 항목 확인 주기 (초)
+RETRY_BASE_DELAY = 30       # 첫 재시도 대기 (초), 실패할 때마다 2배
+RETRY_MAX_DELAY = 3600      # 최대 재시도 대기 (초)
+MAX_ATTEMPTS = 10           # 이 횟수를 넘으면 failed (관리자 재시도 필요)
+STALE_CLAIM_SECONDS = 600   # 업로드 중 상태로 이 시간이 지나면 다시 선점
+DONE_RETENTION = '-7 days'  # 완료 항목 보관 기간
+
+_wake = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def enqueue(local_path: str, target_path: str, credentials: str = None) -> int:
+    """
+    업로드 예약 (파일은 스풀 폴더에 복사되므로 호출자는 원본을 바로 삭제해도 된다)
+
+    Args:
+        credentials: 접속 정보를 가져올 시스템 설정 (CREDENTIAL_SETTINGS 키, 예: 'invoice')
+
+    Returns:
+        int: upload_queue ID
+    """
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    fd, spool_path = tempfile.mkstemp(dir=SPOOL_DIR, suffix=os.path.splitext(target_path)[1])
+    os.close(fd)
+    shutil.copyfile(local_path, spool_path)
+
+    target_key = unc_key(target_path)
+    conn = get_db_connection()
+    try:
+        # 같은 대상의 이전 예약은 올릴 필요가 없으므로 대체 처리 (나중에 재시도되어 새 파일을 덮어쓰지 않도록)
+        superseded = conn.execute('''
+            UPDATE upload_queue SET status = 'superseded'
+            WHERE target_key = ? AND status IN ('pending', 'failed')
+            RETURNING spool_path
+        ''', (target_key,)).fetchall()
+        cursor = conn.execute('''
+            INSERT INTO upload_queue
+            (spool_path, target_path, target_key, credentials_key, file_size, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (spool_path, target_path, target_key, credentials,
+              os.path.getsize(spool_path), time.time()))
+        conn.commit()
+        queue_id = cursor.lastrowid
+    except Exception:
+        conn.rollback()
+        os.unlink(spool_path)
+        raise
+    finally:
+        conn.close()
+
+    for row in superseded:
+        try:
+            os.unlink(row['spool_path'])
+        except OSError:
+            pass
+
+    start_uploader()
+    _wake.set()
+    return queue_id
+
+
+def find_pending(target_path: str):
+    """아직 업로드되지 않은 대상 경로의 스풀 파일 경로 (없으면 None)"""
+    try:
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                SELECT spool_path FROM upload_queue
+                WHERE target_key = ? AND status IN ('pending', 'uploading', 'failed')
+                ORDER BY id DESC LIMIT 1
+            ''', (unc_key(target_path),)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return None  # upload_queue 테이블 생성 전
+    if row and os.path.exists(row['spool_path']):
+        return row['spool_path']
+    return None
+
+
+def _load_credentials():
+    """
+    시스템 설정의 저장 경로별 접속 정보
+
+    Returns:
+        dict: credentials_key -> (저장 경로, 사용자, 비밀번호)
+    """
+    keys = [key for setting in CREDENTIAL_SETTINGS.values() for key in setting]
+    conn = sqlite3.connect(f'file:{SETTINGS_DB_PATH}?mode=ro', uri=True)
+    try:
+        rows = conn.execute(
+            f"SELECT key, value FROM system_settings WHERE key IN ({','.join('?' * len(keys))})", keys
+        ).fetchall()
+    finally:
+        conn.close()
+    settings = dict(rows)
+    return {
+        name: tuple(settings.get(key) or None for key in setting)
+        for name, setting in CREDENTIAL_SETTINGS.items()
+    }
+
+
+def _credentials_for(row, credentials):
+    """
+    항목의 (사용자, 비밀번호)
+    credentials_key가 없는 이전 항목은 저장 경로가 대상 경로의 앞부분과 같은 설정을 사용
+    """
+    entry = credentials.get(row['credentials_key'])
+    if entry is None:
+        target = unc_key(row['target_path'])
+        entry = next((value for value in credentials.values()
+                      if value[0] and target.startswith(unc_key(value[0]).rstrip('/') + '/')), None)
+    if entry is None:
+        return None, None
+    return entry[1], entry[2]
+
+
+def _claim_batch(conn):
+    """
+    대기 항목 선점 (대상 경로별 최대 1건)
+    같은 대상에 더 최근 항목이 있거나 다른 워커가 업로드 중이면 건너뛴다.
+    """
+    now = time.time()
+    rows = conn.execute('''
+        UPDATE upload_queue
+        SET status = 'uploading', claimed_at = ?
+        WHERE id IN (
+            SELECT q.id FROM upload_queue q
+            WHERE ((q.status = 'pending' AND q.next_attempt_at <= ?)
+                   OR (q.status = 'uploading' AND q.claimed_at < ?))
+              AND NOT EXISTS (
+                  SELECT 1 FROM upload_queue o
+                  WHERE o.target_key = q.target_key AND o.id != q.id
+                    AND ((o.id > q.id AND o.status != 'superseded')
+                         OR (o.status = 'uploading' AND o.claimed_at >= ?))
+              )
+            ORDER BY q.id
+            LIMIT ?
+        )
+        RETURNING *
+    ''', (now, now, now - STALE_CLAIM_SECONDS, now - STALE_CLAIM_SECONDS, BATCH_SIZE)).fetchall()
+    conn.commit()
+    return rows
+
+
+def _mark_done(conn, row, remote_stat=None, username=None, password=None):
+    from app.utils import smb_cache
+
+    if remote_stat is not None:
+        smb_cache.put(row['spool_path'], row['target_path'], username, password, remote_stat)
+    conn.execute('''
+        UPDATE upload_queue
+        SET status = 'done', uploaded_at = CURRENT_TIMESTAMP, last_error = NULL
+        WHERE id = ?
+    ''', (row['id'],))
+    # 이보다 오래된 같은 대상 항목(중단된 업로드 등)은 다시 올리지 않음
+    superseded = conn.execute('''
+        UPDATE upload_queue SET status = 'superseded'
+        WHERE target_key = ? AND id < ? AND status IN ('pending', 'uploading', 'failed')
+        RETURNING spool_path
+    ''', (row['target_key'], row['id'])).fetchall()
+    conn.commit()
+    for path in [row['spool_path']] + [r['spool_path'] for r in superseded]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _mark_failed(conn, row, error):
+    attempts = row['attempts'] + 1
+    delay = min(RETRY_BASE_DELAY * (2 ** (attempts - 1)), RETRY_MAX_DELAY)
+    status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+    conn.execute('''
+        UPDATE upload_queue
+        SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+        WHERE id = ?
+    ''', (status, attempts, time.time() + delay, str(error)[:500], row['id']))
+    conn.commit()
+    print(f'업로드 실패 ({attempts}/{MAX_ATTEMPTS}) {row["target_path"]}: {error}')
+
+
+def _smb_chunks(rows):
+    """업로드 항목을 smbclient 1회 용량(SMB_CALL_MAX_BYTES) 단위로 나눔"""
+    chunk, total = [], 0
+    for row in rows:
+        size = row['file_size'] or 0
+        if chunk and total + size > SMB_CALL_MAX_BYTES:
+            yield chunk, total
+            chunk, total = [], 0
+        chunk.append(row)
+        total += size
+    if chunk:
+        yield chunk, total
+
+
+def _upload_smb_group(conn, rows, username, password):
+    """같은 공유/계정의 항목을 용량 단위로 나눠 smbclient로 업로드 후 폴더 목록으로 파일별 확인"""
+    server, share, _ = parse_unc(rows[0]['target_path'])
+    password = password or ''
+
+    for chunk, total_bytes in _smb_chunks(rows):
+        files = [(row['spool_path'], parse_unc(row['target_path'])[2].replace('\\', '/')) for row in chunk]
+        timeout = SMB_BASE_TIMEOUT + total_bytes / SMB_MIN_BYTES_PER_SEC
+        try:
+            smb_put_many(server, share, files, username, password, timeout=timeout)
+        except Exception as e:
+            for row in chunk:
+                _mark_failed(conn, row, e)
+            continue
+
+        listings = {}
+        for row, (_, sub) in zip(chunk, files):
+            remote_dir, _, name = sub.rpartition('/')
+            try:
+                if remote_dir not in listings:
+                    listings[remote_dir] = smb_list(server, share, remote_dir, username, password)
+            except Exception as e:
+                _mark_failed(conn, row, e)
+                continue
+            entries = listings[remote_dir]
+            remote_stat = entries.get(name)
+            # 임시 파일이 남아 있으면 이름 변경 실패 (기존 파일이 그대로일 수 있음)
+            if upload_temp_name(name) in entries:
+                _mark_failed(conn, row, 'SMB 업로드 확인 실패 (임시 파일 이름 변경 실패)')
+            elif remote_stat is None or remote_stat[0] != row['file_size']:
+                _mark_failed(conn, row, 'SMB 업로드 확인 실패 (파일 없음 또는 크기 불일치)')
+            else:
+                _mark_done(conn, row, remote_stat, username, password)
+
+
+def process_batch() -> int:
+    """
+    대기 항목 한 묶음 업로드
+
+    Returns:
+        int: 처리한 항목 수 (0이면 대기 항목 없음)
+    """
+    conn = get_db_connection()
+    try:
+        rows = _claim_batch(conn)
+        if not rows:
+            conn.execute(
+                "DELETE FROM upload_queue WHERE status IN ('done', 'superseded') "
+                "AND COALESCE(uploaded_at, created_at) < datetime('now', ?)",
+                (DONE_RETENTION,)
+            )
+            conn.commit()
+            return 0
+
+        credentials = _load_credentials()
+        smb_rows = []
+        for row in rows:
+            username, password = _credentials_for(row, credentials)
+            if not os.path.exists(row['spool_path']):
+                _mark_failed(conn, row, '스풀 파일이 없습니다.')
+            elif is_unc_path(row['target_path']) and platform.system() != 'Windows':
+                smb_rows.append((row, username, password))
+            else:
+                # Windows(net use) / 로컬 경로는 파일별 복사
+                try:
+                    copy_to_target(row['spool_path'], row['target_path'], username, password)
+                    _mark_done(conn, row)
+                except Exception as e:
+                    _mark_failed(conn, row, e)
+
+        def group_key(item):
+            row, username, password = item
+            server, share, _ = parse_unc(row['target_path'])
+            return server.lower(), share.lower(), username or '', password or ''
+
+        for (_, _, username, password), group in groupby(sorted(smb_rows, key=group_key), key=group_key):
+            if not username:
+                for row, _, _ in group:
+                    _mark_failed(conn, row, 'UNC 경로 접속 정보(사용자 이름)가 시스템 설정에 없습니다.')
+                continue
+            _upload_smb_group(conn, [row for row, _, _ in group], username, password)
+
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def _run():
+    while True:
+        try:
+            while process_batch():
+                pass
+        except sqlite3.OperationalError as e:
+            print(f'업로드 스풀 대기 (DB 준비 안 됨): {e}')
+        except Exception as e:
+            import traceback
+            print(f'업로드 스풀 오류: {e}')
+            traceback.print_exc()
+        _wake.wait(POLL_INTERVAL)
+        _wake.clear()
+
+
+def start_uploader():
+    """백그라운드 업로더 스레드 시작 (프로세스당 하나, 이미 실행 중이면 무시)"""
+    global _worker
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _worker = threading.Thread(target=_run, name='upload-spool', daemon=True)
+        _worker.start()
+
+
+def _format_ts(value):
+    return datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+
+def get_status(limit=100):
+    """
+    업로드 대기 현황 (비밀번호 제외)
+
+    Returns:
+        dict: 상태별 건수와 완료되지 않은 항목 목록
+    """
+    conn = get_db_connection()
+    try:
+        counts = {row['status']: row['cnt'] for row in conn.execute(
+            'SELECT status, COUNT(*) AS cnt FROM upload_queue GROUP BY status'
+        ).fetchall()}
+        rows = conn.execute('''
+            SELECT id, target_path, file_size, status, attempts, last_error,
+                   created_at, next_attempt_at, claimed_at
+            FROM upload_queue
+            WHERE status NOT IN ('done', 'superseded')
+            ORDER BY id
+            LIMIT ?
+        ''', (limit,)).fetchall()
+    finally:
+        conn.close()
+
+    return {
+        'counts': {status: counts.get(status, 0) for status in ('pending', 'uploading', 'failed', 'done', 'superseded')},
+        'items': [{
+            'id': row['id'],
+            'target_path': row['target_path'],
+            'file_size': row['file_size'],
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'last_error': row['last_error'],
+            'created_at': row['created_at'],
+            'next_attempt_at': _format_ts(row['next_attempt_at']) if row['status'] == 'pending' else None,
+            'claimed_at': _format_ts(row['claimed_at']) if row['status'] == 'uploading' else None,
+        } for row in rows],
+    }
+
+
+def retry_failed(queue_id=None) -> int:
+    """failed 항목을 다시 대기 상태로 (queue_id가 없으면 전체)"""
+    conn = get_db_connection()
+    try:
+        sql = '''
+            UPDATE upload_queue
+            SET status = 'pending', attempts = 0, next_attempt_at = ?
+            WHERE status = 'failed'
+              AND NOT EXISTS (
+                  SELECT 1 FROM upload_queue o
+                  WHERE o.target_key = upload_queue.target_key AND o.id > upload_queue.id
+                    AND o.status != 'superseded'
+              )
+        '''
+        params = [time.time()]
+        if queue_id is not None:
+            sql += ' AND id = ?'
+            params.append(queue_id)
+        count = conn.execute(sql, params).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+
+    if count:
+        start_uploader()
+        _wake.set()
+    return count
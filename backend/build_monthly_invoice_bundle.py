@@ -0,0 +1,42 @@
+"""
+월별 거래명세서 PDF 묶음 생성 스크립트
+- 해당 월 계산서 발행된 거래명세서 PDF를 하나로 합쳐 instance/invoice_bundles에 저장
+- 고객사 / 거래명세서 번호별 책갈피 포함
+- backend/ 디렉토리에서 실행: python build_monthly_invoice_bundle.py 2025 10 [--force]
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.blueprints.invoice import _get_invoice_save_info
+from app.utils.invoice_bundle import build_monthly_bundle
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) != 2:
+        print('사용법: python build_monthly_invoice_bundle.py <연도> <월> [--force]')
+        sys.exit(1)
+
+    year, month = int(args[0]), int(args[1])
+    force = '--force' in sys.argv
+
+    save_info = _get_invoice_save_info()
+    bundle_path, info = build_monthly_bundle(
+        year, month, save_info['path'], save_info['username'], save_info['password'], force=force
+    )
+
+    print(f"발행 거래명세서: {info['invoice_count']}건 / 포함: {info['included']}건")
+    if info['missing']:
+        print(f"PDF 누락: {', '.join(info['missing'])}")
+    if bundle_path:
+        print(f"{'캐시 사용' if info['cached'] else '생성 완료'}: {bundle_path}")
+    else:
+        print('묶을 수 있는 PDF가 없습니다.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+서비스 리포트 PDF 일괄 생성 스크립트 (월말 보관용)
+- 기간 내 서비스 리포트를 WeasyPrint 프로세스 풀로 렌더링
+- 시스템 설정의 서비스리포트 저장 경로({YYYY}년{MM}월 폴더)에 저장하고 ZIP 또는 병합 PDF 생성
+- backend/ 디렉토리에서 실행:
+    python export_service_report_pdfs.py 2025 10 [--format=pdf] [--no-save] [--workers=4]
+    python export_service_report_pdfs.py 2025-10-01 2025-10-15
+"""
+
+import calendar
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils import upload_spool
+from app.utils.service_report_pdf import (
+    ExportAlreadyRunning, create_export_job, get_export_result_path, run_export
+)
+
+
+def _option(name, default=None):
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return arg.split('=', 1)[1]
+    return default
+
+
+def _date_range(args):
+    if '-' in args[0]:
+        return args[0], args[1]
+    year, month = int(args[0]), int(args[1])
+    last_day = calendar.monthrange(year, month)[1]
+    return f'{year:04d}-{month:02d}-01', f'{year:04d}-{month:02d}-{last_day:02d}'
+
+
+def _print_progress(status):
+    print(f"\r렌더링 {status['done'] + len(status['failed'])}/{status['total']}", end='', flush=True)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) != 2:
+        print('사용법: python export_service_report_pdfs.py <연도> <월> | <시작일> <종료일> '
+              '[--format=zip|pdf] [--no-save] [--workers=N]')
+        sys.exit(1)
+
+    start_date, end_date = _date_range(args)
+    workers = _option('workers')
+    try:
+        job_id = create_export_job(start_date, end_date, _option('format', 'zip'),
+                                   save_to_folders='--no-save' not in sys.argv)
+    except ExportAlreadyRunning as e:
+        print(f'이미 진행 중인 일괄 생성 작업이 있습니다: {e.job_id}')
+        sys.exit(1)
+    status = run_export(job_id, workers=int(workers) if workers else None, progress=_print_progress)
+    print()
+
+    if status['state'] != 'done':
+        print(f"실패: {status['error']}")
+        sys.exit(1)
+
+    print(f"{start_date} ~ {end_date} 서비스 리포트: {status['total']}건 / 생성: {status['done']}건")
+    for item in status['failed']:
+        print(f"렌더링 실패 {item['report_number']}: {item['error']}")
+    for item in status['save_errors']:
+        print(f"저장 실패 {item['report_number']}: {item['error']}")
+
+    # UNC 저장 경로는 업로드 스풀에 등록되므로 종료 전에 바로 업로드
+    while upload_spool.process_batch():
+        pass
+
+    result_path = get_export_result_path(job_id)
+    if result_path:
+        print(f"생성 완료: {result_path}")
+    else:
+        print('생성된 PDF가 없습니다.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
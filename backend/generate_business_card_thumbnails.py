@@ -0,0 +1,43 @@
+"""
+명함 이미지 썸네일 일괄 생성 스크립트 (기존 업로드 파일 백필)
+- static/business_cards의 원본 중 썸네일이 없거나 원본보다 오래된 파일만 프로세스 풀로 생성
+- backend/ 디렉토리에서 실행:
+    python generate_business_card_thumbnails.py [--workers=4]
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.business_card_thumbnails import SOURCE_FOLDER, backfill
+
+
+def _option(name, default=None):
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return arg.split('=', 1)[1]
+    return default
+
+
+def _print_progress(status):
+    print(f"\r썸네일 생성 {status['done'] + len(status['failed'])}/{status['total']}", end='', flush=True)
+
+
+def main():
+    if not os.path.isdir(SOURCE_FOLDER):
+        print(f'명함 이미지 폴더가 없습니다: {SOURCE_FOLDER}')
+        sys.exit(1)
+
+    workers = _option('workers')
+    status = backfill(workers=int(workers) if workers else None, progress=_print_progress)
+    if status['total']:
+        print()
+
+    print(f"대상: {status['total']}건 / 생성: {status['done']}건 / 실패: {len(status['failed'])}건")
+    for item in status['failed']:
+        print(f"실패 {item['path']}: {item['error']}")
+
+
+if __name__ == '__main__':
+    main()
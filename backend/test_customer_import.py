@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고객 엑셀 일괄 등록/수정 테스트
+- 회사명 컬럼만 있는 시트로 기존 고객을 다시 올려도 오류 없이 updated로 처리되는지
+- 빈 셀은 기존 값을 지우지 않는지, 신규 고객의 빈 담당자는 기본값이 들어가는지
+
+새로 초기화한 임시 DB에서 실행하므로 운영 DB에는 영향이 없다.
+실행: python test_customer_import.py
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.database.init_db as init_db
+
+
+def _customer(conn, company_name):
+    return conn.execute('SELECT * FROM customers WHERE company_name = ?', (company_name,)).fetchone()
+
+
+def test_customer_import():
+    print("=== 고객 엑셀 임포트 테스트 ===")
+    from app.utils.customer_import import DEFAULT_CONTACT_PERSON, import_customers
+
+    fd, db_path = tempfile.mkstemp(suffix='.db', prefix='customer_import_')
+    os.close(fd)
+    try:
+        init_db.DATABASE_PATH = db_path
+        init_db.init_database()
+
+        result = import_customers(pd.DataFrame({
+            'company_name': ['A사'],
+            'contact_person': ['김담당'],
+            'phone': ['02-111-2222'],
+        }))
+        assert result['created_count'] == 1, result
+        print("1. 신규 고객 등록")
+
+        result = import_customers(pd.DataFrame({'company_name': ['A사', 'C사']}))
+        assert result['updated_count'] == 1 and result['created_count'] == 1, result
+        assert result['error_count'] == 0, result
+        conn = init_db.get_db_connection()
+        try:
+            a = _customer(conn, 'A사')
+            assert a['contact_person'] == '김담당' and a['phone'] == '02-111-2222', dict(a)
+            assert _customer(conn, 'C사')['contact_person'] == DEFAULT_CONTACT_PERSON
+        finally:
+            conn.close()
+        print("2. 회사명만 있는 시트: 기존 고객은 값 유지, 신규 고객은 기본 담당자")
+
+        result = import_customers(pd.DataFrame({
+            'company_name': ['A사'],
+            'contact_person': [''],
+            'phone': ['02-333-4444'],
+        }))
+        assert result['updated_count'] == 1, result
+        conn = init_db.get_db_connection()
+        try:
+            a = _customer(conn, 'A사')
+            assert a['contact_person'] == '김담당', '빈 셀이 기존 담당자를 덮어씀'
+            assert a['phone'] == '02-333-4444', '값이 있는 셀이 반영되지 않음'
+        finally:
+            conn.close()
+        print("3. 빈 셀은 기존 값 유지, 값이 있는 셀만 수정")
+
+        print("=== 테스트 완료! ===")
+    finally:
+        for suffix in ('', '-journal', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    test_customer_import()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+문서 번호 동시 발급 부하 테스트
+여러 프로세스(gunicorn 워커 가정)가 동시에 거래명세표/서비스 리포트를 생성해도
+번호가 중복되지 않고 빈 번호 없이 연속으로 발급되는지 확인한다.
+
+운영 DB(app/database/user.db)가 있으면 그 복사본에서, 없으면 새로 초기화한 임시 DB에서
+실행하므로 운영 DB에는 영향이 없다.
+실행: python test_document_number_concurrency.py [프로세스 수] [프로세스당 생성 수]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.database.init_db as init_db
+
+# 기존 데이터와 겹치지 않는 발행일자
+ISSUE_DATE = '2099-12-31'
+
+
+def _use_db(db_path):
+    init_db.DATABASE_PATH = db_path
+
+
+def _create_documents(args):
+    """워커: 거래명세표와 서비스 리포트를 번갈아 생성"""
+    db_path, count = args
+    _use_db(db_path)
+
+    from app.models.invoice import Invoice
+    from app.models.service_report import ServiceReport
+
+    invoice_numbers = []
+    report_numbers = []
+    for i in range(count):
+        invoice = Invoice(customer_id=1, customer_name='부하테스트', issue_date=ISSUE_DATE)
+        invoice.save()
+        invoice_numbers.append(invoice.invoice_number)
+
+        report = ServiceReport(customer_id=1, technician_id=1, service_date=ISSUE_DATE,
+                               problem_description=f'부하테스트 {os.getpid()}-{i}')
+        report.save()
+        report_numbers.append(report.report_number)
+
+    return invoice_numbers, report_numbers
+
+
+def test_document_number_concurrency(workers=8, per_worker=25):
+    print("=== 문서 번호 동시 발급 부하 테스트 ===")
+
+    fd, db_path = tempfile.mkstemp(suffix='.db', prefix='docseq_')
+    os.close(fd)
+    try:
+        source_db = init_db.DATABASE_PATH
+        if os.path.exists(source_db):
+            shutil.copyfile(source_db, db_path)
+        _use_db(db_path)
+        init_db.init_database()
+
+        started = time.time()
+        with Pool(workers) as pool:
+            results = pool.map(_create_documents, [(db_path, per_worker)] * workers)
+        elapsed = time.time() - started
+
+        invoice_numbers = [n for inv, _ in results for n in inv]
+        report_numbers = [n for _, rep in results for n in rep]
+        expected = workers * per_worker
+
+        print(f"1. {workers}개 프로세스 x {per_worker}건 생성 완료 ({elapsed:.2f}초)")
+
+        assert len(set(invoice_numbers)) == expected, '거래명세표 번호 중복 발생'
+        assert len(set(report_numbers)) == expected, '서비스 리포트 번호 중복 발생'
+        print("2. 중복 번호 없음")
+
+        # 오늘 이미 발급된 서비스 리포트가 있을 수 있으므로 시작 번호가 아닌 연속성만 확인
+        invoice_seq = sorted(int(n[6:]) for n in invoice_numbers)
+        report_seq = sorted(int(n.split('-')[-1]) for n in report_numbers)
+        assert invoice_seq == list(range(invoice_seq[0], invoice_seq[0] + expected)), '거래명세표 번호에 빈 번호 발생'
+        assert report_seq == list(range(report_seq[0], report_seq[0] + expected)), '서비스 리포트 번호에 빈 번호 발생'
+        print("3. 번호가 빈 번호 없이 연속으로 발급됨")
+
+        print("=== 테스트 완료! ===")
+    finally:
+        for suffix in ('', '-journal', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_worker = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    test_document_number_concurrency(workers, per_worker)
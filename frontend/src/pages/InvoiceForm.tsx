@@ -24,8 +24,7 @@ interface Customer {
   id: number;
   company_name: string;
   address: string;
-  contact_person: string;
-  phone: string;
+  past_company_names?: string[];
 }
 
 interface InvoiceRates {
@@ -94,19 +93,27 @@ const InvoiceForm: React.FC = () => {
   const [negoHeaderId, setNegoHeaderId] = useState<string>('');
   const [negoType, setNegoType] = useState<'work' | 'travel' | 'parts'>('work');
 
-  // 고객 목록 로드
+  // 고객 검색 (드롭다운이 열려 있을 때 입력이 멈추면 서버에서 검색)
   useEffect(() => {
-    const fetchCustomers = async () => {
+    if (!showCustomerDropdown) return;
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
       try {
-        const response = await customerAPI.getCustomers();
-        setCustomers(response.data.customers || []);
+        const response = await customerAPI.getCustomerPicker(customerSearchTerm.trim());
+        if (!cancelled) {
+          setCustomers(response.data.customers || []);
+        }
       } catch (error) {
-        console.error('고객 목록 로드 실패:', error);
+        console.error('고객 검색 실패:', error);
       }
-    };
+    }, 200);
 
-    fetchCustomers();
-  }, []);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [customerSearchTerm, showCustomerDropdown]);
 
   // 요율 정보 로드
   useEffect(() => {
@@ -313,13 +320,8 @@ const InvoiceForm: React.FC = () => {
     }
   };
 
-  // 고객 검색 필터링
-  const filteredCustomers = customerSearchTerm
-    ? customers.filter(c =>
-        c.company_name?.toLowerCase().includes(customerSearchTerm.toLowerCase()) ||
-        c.contact_person?.toLowerCase().includes(customerSearchTerm.toLowerCase())
-      )
-    : customers;
+  // 고객 검색 결과 (서버에서 현재/과거 상호, 담당자 등으로 검색)
+  const filteredCustomers = customers;
 
   // +서비스비용추가 버튼 클릭
   const addServiceCost = () => {
@@ -868,11 +870,22 @@ const InvoiceForm: React.FC = () => {
       isBlank: false
     }));
 
+    // 고객 전화번호 (고객 선택 목록에는 연락처가 없으므로 필요할 때 조회)
+    let customerPhone = '';
+    if (customerId) {
+      try {
+        const customerResponse = await customerAPI.getCustomerById(customerId);
+        customerPhone = customerResponse.data?.phone || '';
+      } catch (error) {
+        console.error('고객 정보 조회 실패:', error);
+      }
+    }
+
     // 고객 정보 구성
     const customerInfo = {
       company_name: customerName,
       address: customerAddress,
-      phone: customers.find(c => c.id === customerId)?.phone || '',
+      phone: customerPhone,
       fax: ''
     };
 
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import api, { customerAPI, serviceReportAPI, resourceAPI, authAPI, userAPI, sparePartsAPI, invoiceAPI, systemAPI } from '../services/api';
 import Pagination from '../components/Pagination';
 import { useAuth } from '../contexts/AuthContext';
@@ -9,8 +9,8 @@ import { QRCodeSVG } from 'qrcode.react';
 interface Customer {
   id: number;
   company_name: string;
-  contact_person: string;
-  president: string;
+  contact_person?: string;  // 고객 선택 목록(picker)에는 없음
+  president?: string;
   address: string;
   past_company_names?: string[];
 }
@@ -88,7 +88,8 @@ interface ServiceReport {
   time_record?: TimeRecord;
   public_token?: string;
   has_signature?: boolean;
-  customer_signature?: string;
+  signature_url?: string | null;
+  customer_signature?: string;  // 보기 화면에서 getSignature로 채우는 data URL
   customer_signed_at?: string;
   signer_name?: string;
 }
@@ -337,6 +338,8 @@ const ServiceReports: React.FC = () => {
   // 리소스 관련 상태
   const [customerResources, setCustomerResources] = useState<Resource[]>([]);
   const [customerSearchResults, setCustomerSearchResults] = useState<Customer[]>([]);
+  const customerPickerRequestId = useRef(0);
+  const customerPickerTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
   const [showCustomerSearch, setShowCustomerSearch] = useState(false);
   
   // 서비스 동행/지원 FSE 선택 관련 상태
@@ -632,49 +635,43 @@ const ServiceReports: React.FC = () => {
     }
   };
 
-  // 전체 고객 리스트 표시 함수
-  const showAllCustomers = async () => {
+  // 고객 선택 목록 조회 (서버에서 현재/과거 상호, 담당자 등으로 검색, 최신 요청 결과만 반영)
+  const loadCustomerPicker = async (searchTerm: string) => {
+    const requestId = ++customerPickerRequestId.current;
     try {
-      console.log('ServiceReports showAllCustomers: API 호출 시작');
-      const response = await customerAPI.getCustomers();
-      console.log('ServiceReports showAllCustomers: API 응답:', response.data);
-      
-      const allCustomers = response.data?.customers || response.data || [];
-      console.log('ServiceReports showAllCustomers: 추출된 고객 수:', allCustomers.length);
-      
-      setCustomerSearchResults(allCustomers); // 제한 없이 모든 고객 표시
-      setShowCustomerSearch(true); // 항상 드롭다운을 표시 (새 고객사 추가 옵션 때문에)
+      const response = await customerAPI.getCustomerPicker(searchTerm.trim());
+      if (requestId !== customerPickerRequestId.current) return;
+      setCustomerSearchResults(response.data?.customers || []);
     } catch (error) {
-      console.error('고객 리스트 로딩 실패:', error);
-      // API 실패 시 로컬 customers 배열 사용
-      console.log('ServiceReports showAllCustomers: 로컬 customers 배열 사용, 수:', customers.length);
-      setCustomerSearchResults(customers);
-      setShowCustomerSearch(true); // 항상 드롭다운을 표시 (새 고객사 추가 옵션 때문에)
+      console.error('고객 검색 실패:', error);
+      if (requestId !== customerPickerRequestId.current) return;
+      setCustomerSearchResults([]);
     }
+    setShowCustomerSearch(true); // 검색 결과가 없어도 드롭다운을 표시 (새 고객사 추가 옵션 때문에)
   };
 
-  // 고객 검색 함수 - 로컬 customers 배열에서 즉시 필터링 (거래명세표와 동일한 방식)
+  // 빈 필드 클릭 시 회사명순 첫 페이지 표시
+  const showAllCustomers = () => {
+    loadCustomerPicker('');
+  };
+
+  // 고객 검색 함수 - 입력이 잠시 멈추면 서버 검색
   const searchCustomers = (searchTerm: string) => {
+    if (customerPickerTimer.current) {
+      clearTimeout(customerPickerTimer.current);
+    }
     if (searchTerm.length < 1) {
+      customerPickerRequestId.current++;
       setCustomerSearchResults([]);
       setShowCustomerSearch(false);
       return;
     }
-
-    // 로컬 customers 배열에서 즉시 필터링 (API 호출 없음)
-    const term = searchTerm.toLowerCase();
-    const filteredCustomers = customers.filter(customer =>
-      customer.company_name?.toLowerCase().includes(term) ||
-      customer.contact_person?.toLowerCase().includes(term) ||
-      customer.past_company_names?.some(n => n.toLowerCase().includes(term))
-    );
-
-    setCustomerSearchResults(filteredCustomers);
-    setShowCustomerSearch(true); // 검색 결과가 없어도 드롭다운을 표시 (새 고객사 추가 옵션 때문에)
+    customerPickerTimer.current = setTimeout(() => loadCustomerPicker(searchTerm), 200);
   };
 
   // 고객 선택 시 리소스 통합 (핵심 기능)
   const handleSelectCustomer = async (customer: Customer) => {
+    customerPickerRequestId.current++; // 선택 후 늦게 도착한 검색 결과로 드롭다운이 다시 열리지 않도록
     try {
       setFormData(prev => ({
         ...prev,
@@ -1952,6 +1949,20 @@ const ServiceReports: React.FC = () => {
   const handleView = (report: ServiceReport) => {
     setViewingReport(report);
     setShowViewModal(true);
+    // 목록에는 서명 이미지가 없으므로 별도 조회 (인쇄/JPEG용 data URL로 변환)
+    if (report.has_signature && !report.customer_signature) {
+      serviceReportAPI.getSignature(report.id)
+        .then(response => new Promise<string>((resolve, reject) => {
+          const reader = new FileReader();
+          reader.onload = () => resolve(reader.result as string);
+          reader.onerror = reject;
+          reader.readAsDataURL(response.data);
+        }))
+        .then(dataUrl => {
+          setViewingReport(prev => prev && prev.id === report.id ? { ...prev, customer_signature: dataUrl } : prev);
+        })
+        .catch(error => console.error('서명 이미지 조회 실패:', error));
+    }
   };
 
   // PDF 저장 핸들러
@@ -181,6 +181,16 @@ export const customerAPI = {
     const queryString = searchParams.toString();
     return api.get(`/api/customers/${queryString ? `?${queryString}` : ''}`);
   },
+  // 고객 선택(자동완성)용 간단 목록 (id, company_name, address, past_company_names)
+  getCustomerPicker: (q: string = '', params?: { cursor?: string; limit?: number }) => {
+    const searchParams = new URLSearchParams();
+    if (q) searchParams.append('q', q);
+    if (params?.cursor) searchParams.append('cursor', params.cursor);
+    if (params?.limit) searchParams.append('limit', params.limit.toString());
+
+    const queryString = searchParams.toString();
+    return api.get(`/api/customers/picker${queryString ? `?${queryString}` : ''}`);
+  },
   getCustomerById: (id: number) => api.get(`/api/customers/${id}`),
   createCustomer: (customerData: any) => api.post('/api/customers/', customerData),
   updateCustomer: (id: number, customerData: any) => api.put(`/api/customers/${id}`, customerData),
@@ -250,6 +260,8 @@ export const serviceReportAPI = {
     console.log(`API: 서비스 리포트 잠금 해제, ID: ${id}`);
     return api.post(`/api/service-reports/${id}/unlock`);
   },
+  getSignature: (id: number) =>
+    api.get(`/api/service-reports/${id}/signature`, { responseType: 'blob' }),
   deleteSignature: (id: number) =>
     api.delete(`/api/service-reports/${id}/signature`),
   generatePDF: (id: number) =>